@@ -1,8 +1,11 @@
 """SQLite Audit-Logger fuer den MCP Server."""
 
+import atexit
+import queue
 import sqlite3
 import json
 import logging
+import threading
 from datetime import datetime
 from typing import Optional
 
@@ -10,7 +13,21 @@ logger = logging.getLogger(__name__)
 
 DB_PATH = "audit_log.db"
 
+# Schreib-Queue: log_action blockiert nicht, ein Hintergrund-Thread schreibt gebuendelt
+QUEUE_SIZE = 10_000
+BATCH_SIZE = 100
+
+_INSERT_SQL = """
+    INSERT INTO audit_log (timestamp, client_id, user_name, action, params, result_summary, success)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+
 _connection: Optional[sqlite3.Connection] = None
+_db_lock = threading.Lock()
+_queue: "queue.Queue[tuple]" = queue.Queue(maxsize=QUEUE_SIZE)
+_writer: Optional[threading.Thread] = None
+_writer_lock = threading.Lock()
+dropped_count = 0  # Eintraege, die wegen voller Queue verworfen wurden
 
 
 def _get_connection() -> sqlite3.Connection:
@@ -25,6 +42,9 @@ def _get_connection() -> sqlite3.Connection:
 def init_db():
     """Erstellt Audit-Tabelle falls nciht vorhanden."""
     conn = _get_connection()
+    # WAL + synchronous=NORMAL: kein fsync pro Commit, Lesen blockiert Schreiben nicht
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
     conn.execute("""
         CREATE TABLE IF NOT EXISTS audit_log (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -47,6 +67,48 @@ def init_db():
     logger.info("Audit-Log DB initialisiert")
 
 
+def _write_loop():
+    """Hintergrund-Thread: schreibt wartende Eintraege in einer Transaktion."""
+    while True:
+        rows = [_queue.get()]
+        while len(rows) < BATCH_SIZE:
+            try:
+                rows.append(_queue.get_nowait())
+            except queue.Empty:
+                break
+
+        try:
+            with _db_lock:
+                conn = _get_connection()
+                conn.executemany(_INSERT_SQL, rows)
+                conn.commit()
+        except Exception as e:
+            logger.error(f"Audit-Log Fehler: {e}")
+        finally:
+            for _ in rows:
+                _queue.task_done()
+
+
+def _ensure_writer():
+    """Startet den Schreib-Thread beim ersten Eintrag."""
+    global _writer
+    if _writer is not None:
+        return
+    with _writer_lock:
+        if _writer is None:
+            _writer = threading.Thread(target=_write_loop, name="audit-log-writer", daemon=True)
+            _writer.start()
+
+
+def flush():
+    """Wartet bis alle Eintraege der Queue geschrieben sind."""
+    if _writer is not None:
+        _queue.join()
+
+
+atexit.register(flush)
+
+
 def log_action(
     client_id: str,
     user_name: str,
@@ -55,34 +117,38 @@ def log_action(
     result_summary: Optional[str] = None,
     success: bool = True,
 ):
-    """Schreibt eine Aktion ins Audit-Log (params werden als JSON gespeichert)."""
+    """Schreibt eine Aktion ins Audit-Log (params werden als JSON gespeichert).
+
+    Nicht blockierend: der Eintrag wird in die Queue gelegt und vom
+    Hintergrund-Thread geschrieben. Bei voller Queue wird er verworfen.
+    """
+    global dropped_count
     try:
-        conn = _get_connection()
-        conn.execute(
-            """
-            INSERT INTO audit_log (timestamp, client_id, user_name, action, params, result_summary, success)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                datetime.utcnow().isoformat(),
-                client_id,
-                user_name,
-                action,
-                json.dumps(params, ensure_ascii=False) if params else None,
-                (result_summary[:200] if result_summary else None),
-                1 if success else 0,
-            ),
+        row = (
+            datetime.utcnow().isoformat(),
+            client_id,
+            user_name,
+            action,
+            json.dumps(params, ensure_ascii=False) if params else None,
+            (result_summary[:200] if result_summary else None),
+            1 if success else 0,
         )
-        conn.commit()
+        _ensure_writer()
+        _queue.put_nowait(row)
+    except queue.Full:
+        dropped_count += 1
+        logger.warning(f"Audit-Log Queue voll - Eintrag verworfen ({dropped_count} bisher)")
     except Exception as e:
         logger.error(f"Audit-Log Fehler: {e}")
 
 
 def get_recent_actions(limit: int = 50) -> list:
     """Letzte Audit-Eintraege als Liste von Dicts."""
-    conn = _get_connection()
-    cursor = conn.execute(
-        "SELECT * FROM audit_log ORDER BY id DESC LIMIT ?",
-        (limit,),
-    )
-    return [dict(row) for row in cursor.fetchall()]
+    flush()
+    with _db_lock:
+        conn = _get_connection()
+        cursor = conn.execute(
+            "SELECT * FROM audit_log ORDER BY id DESC LIMIT ?",
+            (limit,),
+        )
+        return [dict(row) for row in cursor.fetchall()]
@@ -71,6 +71,16 @@ class Config:
 
         # Speech-to-Text Provider
         self.speech_provider = self._get_env("SPEECH_PROVIDER", default="groq-fallback")
+        # Faster Whisper Gerät: auto (GPU wenn vorhanden), cpu oder cuda
+        self.whisper_device = self._get_env("WHISPER_DEVICE", default="auto").lower()
+        # groq-fallback: Groq und Faster Whisper parallel starten, schnellstes Ergebnis gewinnt
+        self.speculative_stt = self._get_env("SPECULATIVE_STT", default="false").lower() == "true"
+
+        # LLM beim Wechsel vorwärmen; bei Ollama zusätzlich per Heartbeat im Speicher halten
+        self.llm_keep_warm = self._get_env("LLM_KEEP_WARM", default="false").lower() == "true"
+
+        # Rechtschreibprüfung: optionale Wortliste (ein Wort pro Zeile) für die lokale Vorprüfung
+        self.spellcheck_wordlist = self._get_env("SPELLCHECK_WORDLIST")
 
         # Validierung
         self._validate()
@@ -187,6 +197,14 @@ class Config:
                 f"Muss einer sein von: {', '.join(valid_speech_providers)}"
             )
 
+        # Whisper Gerät prüfen
+        valid_whisper_devices = ["auto", "cpu", "cuda"]
+        if self.whisper_device not in valid_whisper_devices:
+            raise ValueError(
+                f"Ungültiges WHISPER_DEVICE: {self.whisper_device}\n"
+                f"Muss einer sein von: {', '.join(valid_whisper_devices)}"
+            )
+
         # Groq API Key prüfen wenn Groq verwendet wird
         if self.speech_provider in ["groq", "groq-fallback"] and not self.groq_api_key:
             raise ValueError(
@@ -235,4 +253,7 @@ class Config:
         print(f"\nVoice Language:     {self.voice_language}")
         print(f"TTS Enabled:        {self.enable_tts}")
         print(f"Speech Provider:    {self.speech_provider}")
+        print(f"Whisper Device:     {self.whisper_device}")
+        print(f"Speculative STT:    {self.speculative_stt}")
+        print(f"LLM Keep Warm:      {self.llm_keep_warm}")
         print("="*60 + "\n")
@@ -9,19 +9,35 @@ import logging
 import os
 import sys
 import calendar
+import hashlib
 import json
 import re
+import time
+from collections import OrderedDict, defaultdict, deque
+from dataclasses import dataclass
+from functools import partial
 from datetime import datetime, timedelta
+from operator import attrgetter
 from threading import Thread
-import pytz
+from zoneinfo import ZoneInfo
 import dateparser
 
+# Optional: orjson für schnelleres JSON-Parsing (Fallback auf stdlib json)
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
 # Projekt-Imports
 from config import Config
 from mcp_client import DiscordMCPClient
 from llm_voice import LLMVoiceInterface
 from discord_helpers import DiscordEventHelper
 from tool_schemas import get_tool_definitions
+from gradio_helpers import (
+    ProviderState, RenderCache, extract_model_name, llm_switch_key, startup_llm_key
+)
 
 # Logging konfigurieren
 logging.basicConfig(
@@ -34,6 +50,16 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Zeitzone für alle Datums-/Kalenderberechnungen (einmal auflösen statt pro Aufruf)
+BERLIN_TZ = ZoneInfo('Europe/Berlin')
+
+# Ab Python 3.11 versteht fromisoformat das 'Z'-Suffix direkt
+if sys.version_info >= (3, 11):
+    _parse_iso = datetime.fromisoformat
+else:
+    def _parse_iso(value: str) -> datetime:
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
 # Import _safe_log von llm_voice (keine Duplikation)
 from llm_voice import _safe_log
 
@@ -72,6 +98,14 @@ class DiscordBotGradio:
         except TimeoutError:
             return "[FEHLER] Zeitueberschreitung --- bitte erneut versuchen"
 
+    async def _arun(self, coro, timeout=120):
+        """Wie _run_async, aber awaitbar: blockiert keinen Thread, bis der Bot-Loop fertig ist"""
+        future = asyncio.run_coroutine_threadsafe(coro, self.loop)
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+        except asyncio.TimeoutError:
+            return "[FEHLER] Zeitueberschreitung --- bitte erneut versuchen"
+
     async def initialize(self):
         """Bot initialisieren"""
         try:
@@ -117,7 +151,7 @@ class DiscordBotGradio:
         """Smart-Preprocessing: Wandelt 'vom X bis Y' in 'in den nächsten X Tagen' um"""
         logger.info(f"[Parser] Start: '{user_input}'")
 
-        timezone = pytz.timezone('Europe/Berlin')
+        timezone = BERLIN_TZ
         now = datetime.now(timezone)
 
         # Verschiedene Patterns für "vom X bis Y"
@@ -221,7 +255,7 @@ class DiscordBotGradio:
                 if month_start:
                     # Timezone-Aware sicherstellen
                     if month_start.tzinfo is None:
-                        month_start = timezone.localize(month_start)
+                        month_start = month_start.replace(tzinfo=timezone)
 
                     # Ende des Monats berechnen
                     next_month = month_start.replace(day=28) + timedelta(days=4)
@@ -279,8 +313,10 @@ class DiscordBotGradio:
             for round_num in range(max_rounds):
                 logger.info(f"[Tool-Call] Runde {round_num + 1}/{max_rounds}")
 
-                # LLM aufrufen
-                response = self.gemini.llm_client.chat_completion_with_tools(
+                # LLM aufrufen (synchroner SDK-Call im Thread-Pool, damit der
+                # gemeinsame Event Loop für andere Sessions frei bleibt)
+                response = await asyncio.to_thread(
+                    self.gemini.llm_client.chat_completion_with_tools,
                     messages=messages,
                     tools=tools,
                     tool_choice="auto"
@@ -474,6 +510,7 @@ class DiscordBotGradio:
         try:
             if self.mcp_client:
                 await self.mcp_client.disconnect()
+            await _close_session()
             logger.info("[OK] Cleanup abgeschlossen")
         except Exception as e:
             logger.error(f"Fehler beim Cleanup: {e}", exc_info=True)
@@ -511,6 +548,7 @@ LLM_MODELS = {
 MODEL_PRICES = {}
 _prices_loaded = False
 _prices_last_update = None
+_prices_version = 0  # Wird bei jeder Änderung von MODEL_PRICES erhöht (Cache-Key)
 
 # Fallback wenn LiteLLM nicht erreichbar
 FALLBACK_PRICES = {
@@ -541,37 +579,125 @@ FALLBACK_PRICES = {
 }
 
 
+# Gemeinsame HTTP-Session auf dem Bot-Loop (Keep-Alive spart TCP/TLS-Handshake pro Abruf)
+_aiohttp_session = None
+
+
+async def _get_session():
+    """Gibt die persistente aiohttp-Session zurück (wird lazy im Bot-Loop erzeugt)"""
+    global _aiohttp_session
+    import aiohttp
+
+    if _aiohttp_session is None or _aiohttp_session.closed:
+        _aiohttp_session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=10, ttl_dns_cache=300)
+        )
+    return _aiohttp_session
+
+
+async def _close_session():
+    """Schließt die persistente aiohttp-Session"""
+    global _aiohttp_session
+    if _aiohttp_session is not None and not _aiohttp_session.closed:
+        await _aiohttp_session.close()
+    _aiohttp_session = None
+
+
+# Lokaler Cache der LiteLLM-Preisdatei (Rohdaten + ETag für bedingte Requests)
+_PRICES_CACHE_FILE = os.path.join(os.path.expanduser("~"), ".cache", "discord_voicebot", "litellm_prices.json")
+_PRICES_ETAG_FILE = _PRICES_CACHE_FILE + ".etag"
+_prices_etag = None  # ETag der aktuell in MODEL_PRICES geladenen Preisdatei
+
+
+def _read_prices_cache() -> tuple[bytes | None, str | None]:
+    """Liest die zuletzt geladene Preisdatei und ihren ETag von der Platte"""
+    try:
+        with open(_PRICES_CACHE_FILE, 'rb') as f:
+            body = f.read()
+    except OSError:
+        return None, None
+    try:
+        with open(_PRICES_ETAG_FILE, encoding='utf-8') as f:
+            etag = f.read().strip() or None
+    except OSError:
+        etag = None
+    return body, etag
+
+
+def _write_file_atomic(path: str, data: bytes):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def _write_prices_cache(body: bytes, etag: str | None):
+    """Speichert Preisdatei und ETag atomar (os.replace) im Cache-Verzeichnis"""
+    try:
+        os.makedirs(os.path.dirname(_PRICES_CACHE_FILE), exist_ok=True)
+        _write_file_atomic(_PRICES_CACHE_FILE, body)
+        if etag:
+            _write_file_atomic(_PRICES_ETAG_FILE, etag.encode('utf-8'))
+        elif os.path.exists(_PRICES_ETAG_FILE):
+            os.remove(_PRICES_ETAG_FILE)
+    except OSError as e:
+        logger.debug(f"Preis-Cache konnte nicht geschrieben werden: {e}")
+
+
 def fetch_litellm_prices() -> dict:
-    """Aktuelle Preise von LiteLLM GitHub laden."""
-    global MODEL_PRICES, _prices_loaded, _prices_last_update
+    """Aktuelle Preise von LiteLLM GitHub laden.
+
+    Mit ETag/If-None-Match: Bei 304 werden die bereits geladenen Preise bzw. die
+    Preisdatei aus dem Platten-Cache weiterverwendet. Ohne Netz dient der
+    Platten-Cache als Fallback vor den hardcodierten Preisen.
+    """
+    global MODEL_PRICES, _prices_loaded, _prices_last_update, _prices_version, _prices_etag
 
     LITELLM_PRICES_URL = "https://raw.githubusercontent.com/BerriAI/litellm/main/model_prices_and_context_window.json"
 
     try:
         import aiohttp
-        import asyncio
 
-        async def _fetch():
-            async with aiohttp.ClientSession() as session:
-                async with session.get(LITELLM_PRICES_URL, timeout=aiohttp.ClientTimeout(total=10)) as response:
-                    if response.status == 200:
-                        return await response.json()
-                    return None
+        cached_body, cached_etag = _read_prices_cache()
+        # Sind genau diese Preise schon geladen, muss bei 304 nichts geparst werden
+        etag = _prices_etag if _prices_loaded and _prices_etag else cached_etag
 
-        # Führe async aus
+        async def _fetch():
+            session = await _get_session()
+            headers = {"If-None-Match": etag} if etag else {}
+            async with session.get(LITELLM_PRICES_URL, headers=headers,
+                                   timeout=aiohttp.ClientTimeout(total=10)) as response:
+                if response.status == 200:
+                    return 200, await response.read(), response.headers.get("ETag")
+                return response.status, None, None
+
+        # Auf dem Bot-Loop ausführen, dort lebt die gemeinsame Session
         try:
-            loop = asyncio.get_event_loop()
-            if loop.is_running():
-                future = asyncio.run_coroutine_threadsafe(_fetch(), bot.loop)
-                data = future.result(timeout=15)
-            else:
-                data = asyncio.run(_fetch())
+            future = asyncio.run_coroutine_threadsafe(_fetch(), bot.loop)
+            status, body, new_etag = future.result(timeout=15)
         except Exception:
-            # Fallback: synchroner Request
+            # Fallback: synchroner Request (ohne ETag), ohne Netz der Platten-Cache
             import urllib.request
-            import json
-            with urllib.request.urlopen(LITELLM_PRICES_URL, timeout=10) as response:
-                data = json.loads(response.read().decode())
+            try:
+                with urllib.request.urlopen(LITELLM_PRICES_URL, timeout=10) as response:
+                    status, body, new_etag = 200, response.read(), response.headers.get("ETag")
+            except Exception as e:
+                if cached_body is None:
+                    raise
+                logger.warning(f"LiteLLM nicht erreichbar ({e}), nutze Preis-Cache")
+                status, body, new_etag = 304, None, cached_etag
+                etag = cached_etag
+
+        if status == 304:
+            if _prices_loaded and etag == _prices_etag:
+                logger.info("LiteLLM Preise unverändert (304)")
+                _prices_last_update = datetime.now()
+                return MODEL_PRICES
+            body, new_etag = cached_body, etag
+        elif status == 200:
+            _write_prices_cache(body, new_etag)
+
+        data = _json_loads(body) if body else None
 
         if not data:
             logger.warning("LiteLLM Preise: Keine Daten erhalten")
@@ -606,6 +732,8 @@ def fetch_litellm_prices() -> dict:
         logger.info(f"LiteLLM Preise geladen: {len(prices)} Modelle")
 
         MODEL_PRICES = prices
+        _prices_version += 1
+        _prices_etag = new_etag
         _prices_loaded = True
         _prices_last_update = datetime.now()
 
@@ -614,18 +742,33 @@ def fetch_litellm_prices() -> dict:
     except Exception as e:
         logger.warning(f"Fehler beim Laden der LiteLLM Preise: {e}")
         MODEL_PRICES = FALLBACK_PRICES.copy()
+        _prices_version += 1
         return FALLBACK_PRICES
 
 
+# Letzter Preis-Status: (Preisstand, Alter in Minuten, Text)
+_prices_status_cache: tuple[int, int | None, str] | None = None
+
+
 def get_prices_status() -> str:
     """Status-String fuer die Preisdaten."""
+    global _prices_status_cache
+
+    age = None
     if _prices_loaded and _prices_last_update:
         age = (datetime.now() - _prices_last_update).seconds // 60
-        return f"LiteLLM ({len(MODEL_PRICES)} Modelle, vor {age} Min.)"
+    if _prices_status_cache is not None and _prices_status_cache[:2] == (_prices_version, age):
+        return _prices_status_cache[2]
+
+    if age is not None:
+        status = f"LiteLLM ({len(MODEL_PRICES)} Modelle, vor {age} Min.)"
     elif MODEL_PRICES:
-        return f"Fallback ({len(MODEL_PRICES)} Modelle)"
+        status = f"Fallback ({len(MODEL_PRICES)} Modelle)"
     else:
-        return "Nicht geladen"
+        status = "Nicht geladen"
+
+    _prices_status_cache = (_prices_version, age, status)
+    return status
 
 
 def get_model_price(model_name: str, provider: str = None) -> str:
@@ -654,21 +797,28 @@ def get_model_price(model_name: str, provider: str = None) -> str:
         price_value = MODEL_PRICES[model_lower]
 
     # 3. Substring-Match (laengster gewinnt)
+    # Suche per Laengenvergleich begrenzen: ein Key kann nur in model_name enthalten
+    # sein, wenn er nicht laenger ist (und umgekehrt), und muss den bisherigen
+    # Treffer uebertreffen. Laenger als len(model_name) kann kein Treffer werden.
     if not price_value:
         best_match = None
         best_match_len = 0
+        model_len = len(model_lower)
 
         for price_key, pv in MODEL_PRICES.items():
-            # Prüfe ob price_key im model_name enthalten ist
-            if price_key in model_lower:
-                if len(price_key) > best_match_len:
+            key_len = len(price_key)
+            if key_len <= model_len:
+                # Prüfe ob price_key im model_name enthalten ist
+                if key_len > best_match_len and price_key in model_lower:
                     best_match = pv
-                    best_match_len = len(price_key)
+                    best_match_len = key_len
             # Oder umgekehrt (model_name im price_key)
-            elif model_lower in price_key:
-                if len(model_lower) > best_match_len:
-                    best_match = pv
-                    best_match_len = len(model_lower)
+            elif model_len > best_match_len and model_lower in price_key:
+                best_match = pv
+                best_match_len = model_len
+
+            if best_match_len == model_len:
+                break
 
         price_value = best_match
 
@@ -690,6 +840,38 @@ def get_model_price(model_name: str, provider: str = None) -> str:
     return "?"  # Preis unbekannt
 
 
+def _make_prefix_ranker(priority_order: list[str]):
+    """Erzeugt eine Rang-Funktion fuer Modell-Sortierung.
+
+    Laengster passender Prefix gewinnt; Lookup per Dict statt linearer Suche
+    ueber alle Prefixe (nur ein Slice + Hash pro vorkommender Prefix-Laenge).
+    """
+    ranks = {prefix: i for i, prefix in enumerate(priority_order)}
+    lengths = sorted({len(prefix) for prefix in ranks}, reverse=True)
+    fallback = len(ranks)
+
+    def rank(model: str) -> int:
+        for n in lengths:
+            i = ranks.get(model[:n])
+            if i is not None:
+                return i
+        return fallback
+
+    return rank
+
+
+# Sortierung: neueste/beste zuerst (GPT-5.2 > 5.1 > 5 > 4o)
+_openai_rank = _make_prefix_ranker([
+    'gpt-5.2', 'gpt-5.1', 'gpt-5-mini', 'gpt-5-nano', 'gpt-5',
+    'gpt-4o', 'gpt-4o-mini', 'gpt-4-turbo', 'gpt-4', 'gpt-3.5-turbo'
+])
+
+# Sortierung: Gemini zuerst, dann nach Version (neueste zuerst)
+_gemini_rank = _make_prefix_ranker([
+    'gemini-3', 'gemini-2.5', 'gemini-2.0', 'gemini-1.5-pro', 'gemini-1.5-flash', 'gemini-1.0', 'gemini'
+])
+
+
 def fetch_openai_models(api_key: str) -> list[str]:
     """OpenAI-Modelle von der API holen (nur gpt-* Chat Modelle)."""
     try:
@@ -708,18 +890,7 @@ def fetch_openai_models(api_key: str) -> list[str]:
         logger.info(f"OpenAI API: {len(chat_models)} Chat-Modelle gefunden")
 
         # Sortiere: neueste/beste zuerst (GPT-5.2 > 5.1 > 5 > 4o)
-        priority_order = [
-            'gpt-5.2', 'gpt-5.1', 'gpt-5-mini', 'gpt-5-nano', 'gpt-5',
-            'gpt-4o', 'gpt-4o-mini', 'gpt-4-turbo', 'gpt-4', 'gpt-3.5-turbo'
-        ]
-
-        def sort_key(model):
-            for i, prefix in enumerate(priority_order):
-                if model.startswith(prefix):
-                    return (i, model)
-            return (len(priority_order), model)
-
-        chat_models.sort(key=sort_key)
+        chat_models.sort(key=lambda model: (_openai_rank(model), model))
 
         # Dedupliziere (z.B. gpt-4o und gpt-4o-2024-... -> behalte nur Hauptversion)
         seen_prefixes = set()
@@ -755,8 +926,6 @@ def fetch_openai_models(api_key: str) -> list[str]:
 
 def fetch_gemini_models(api_key: str) -> list[str]:
     """Gemini-Modelle per API abfragen."""
-    import asyncio
-
     async def _fetch():
         try:
             import aiohttp
@@ -764,76 +933,60 @@ def fetch_gemini_models(api_key: str) -> list[str]:
             # Google AI API Endpoint für Modell-Liste
             url = f"https://generativelanguage.googleapis.com/v1beta/models?key={api_key}"
 
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, timeout=aiohttp.ClientTimeout(total=10)) as response:
-                    if response.status != 200:
-                        logger.warning(f"Gemini API Fehler: {response.status}")
-                        return LLM_MODELS["gemini"]
+            session = await _get_session()
+            async with session.get(url, timeout=aiohttp.ClientTimeout(total=10)) as response:
+                if response.status != 200:
+                    logger.warning(f"Gemini API Fehler: {response.status}")
+                    return LLM_MODELS["gemini"]
 
-                    data = await response.json()
-                    models = data.get('models', [])
+                data = await response.json()
+                models = data.get('models', [])
 
-                    logger.info(f"Gemini API: {len(models)} Modelle insgesamt von der API")
+                logger.info(f"Gemini API: {len(models)} Modelle insgesamt von der API")
 
-                    # Sammle alle Chat-fähigen Modelle
-                    chat_models = []
-                    skipped_models = []
+                # Sammle alle Chat-fähigen Modelle
+                chat_models = []
+                skipped_models = []
 
-                    for model in models:
-                        model_name = model.get('name', '')
-                        short_name = model_name.replace('models/', '')
-                        supported_methods = model.get('supportedGenerationMethods', [])
+                for model in models:
+                    model_name = model.get('name', '')
+                    short_name = model_name.replace('models/', '')
+                    supported_methods = model.get('supportedGenerationMethods', [])
 
-                        # Nur Modelle die generateContent unterstützen (Chat-fähig)
-                        if 'generateContent' in supported_methods:
-                            # Gemini-Modelle priorisieren, aber auch andere zeigen
-                            if 'gemini' in short_name.lower():
-                                chat_models.append(short_name)
-                            else:
-                                # Andere Modelle (z.B. learnlm, text-bison) auch aufnehmen
-                                chat_models.append(short_name)
+                    # Nur Modelle die generateContent unterstützen (Chat-fähig)
+                    if 'generateContent' in supported_methods:
+                        # Gemini-Modelle priorisieren, aber auch andere zeigen
+                        if 'gemini' in short_name.lower():
+                            chat_models.append(short_name)
                         else:
-                            skipped_models.append(f"{short_name} (no generateContent)")
-
-                    logger.info(f"Gemini: {len(chat_models)} Chat-Modelle, übersprungen: {len(skipped_models)}")
-                    if skipped_models:
-                        logger.debug(f"Übersprungene Modelle: {skipped_models[:5]}...")
-
-                    # Sortiere: Gemini zuerst, dann nach Version (neueste zuerst)
-                    priority_order = ['gemini-3', 'gemini-2.5', 'gemini-2.0', 'gemini-1.5-pro', 'gemini-1.5-flash', 'gemini-1.0', 'gemini']
+                            # Andere Modelle (z.B. learnlm, text-bison) auch aufnehmen
+                            chat_models.append(short_name)
+                    else:
+                        skipped_models.append(f"{short_name} (no generateContent)")
 
-                    def sort_key(model):
-                        model_lower = model.lower()
-                        # Gemini-Modelle nach Version sortieren
-                        for i, prefix in enumerate(priority_order):
-                            if model_lower.startswith(prefix):
-                                return (i, model)
-                        # Nicht-Gemini-Modelle ans Ende
-                        return (len(priority_order), model)
+                logger.info(f"Gemini: {len(chat_models)} Chat-Modelle, übersprungen: {len(skipped_models)}")
+                if skipped_models:
+                    logger.debug(f"Übersprungene Modelle: {skipped_models[:5]}...")
 
-                    chat_models.sort(key=sort_key)
+                # Sortiere: Gemini zuerst, dann nach Version (neueste zuerst),
+                # Nicht-Gemini-Modelle ans Ende
+                chat_models.sort(key=lambda model: (_gemini_rank(model.lower()), model))
 
-                    # Hinweis: Preview-Modelle wie gemini-3-pro werden NICHT automatisch hinzugefügt,
-                    # da sie regional/account-beschränkt sein können.
-                    # Nur Modelle aus der API werden angezeigt.
+                # Hinweis: Preview-Modelle wie gemini-3-pro werden NICHT automatisch hinzugefügt,
+                # da sie regional/account-beschränkt sein können.
+                # Nur Modelle aus der API werden angezeigt.
 
-                    logger.info(f"Gemini: {len(chat_models)} Modelle verfügbar: {chat_models}")
-                    return chat_models if chat_models else LLM_MODELS["gemini"]
+                logger.info(f"Gemini: {len(chat_models)} Modelle verfügbar: {chat_models}")
+                return chat_models if chat_models else LLM_MODELS["gemini"]
 
         except Exception as e:
             logger.warning(f"Fehler beim Abrufen der Gemini-Modelle: {e}")
             return LLM_MODELS["gemini"]
 
-    # Führe async Funktion aus
+    # Auf dem Bot-Loop ausführen, dort lebt die gemeinsame Session
     try:
-        # Prüfe ob ein Event Loop läuft
-        loop = asyncio.get_event_loop()
-        if loop.is_running():
-            # Nutze den Bot's Event Loop
-            future = asyncio.run_coroutine_threadsafe(_fetch(), bot.loop)
-            return future.result(timeout=15)
-        else:
-            return asyncio.run(_fetch())
+        future = asyncio.run_coroutine_threadsafe(_fetch(), bot.loop)
+        return future.result(timeout=15)
     except Exception as e:
         logger.warning(f"Fehler beim Abrufen der Gemini-Modelle (async): {e}")
         return LLM_MODELS["gemini"]
@@ -870,20 +1023,45 @@ def fetch_groq_models(api_key: str) -> list[str]:
         logger.warning(f"Fehler beim Abrufen der Groq-Modelle: {e}")
         return LLM_MODELS["groq"]  # Fallback auf hardcodierte Liste
 
-# Validierte Provider und Keys
-_validated_providers = {
-    "openai": {"valid": False, "api_key": None},
-    "groq": {"valid": False, "api_key": None},
-    "gemini": {"valid": False, "api_key": None},
-    "ollama": {"valid": False, "api_key": None},  # Ollama braucht keinen Key, aber valid=True wenn läuft
-}
+async def fetch_openai_models_async(api_key: str) -> list[str]:
+    """Async-Variante von fetch_openai_models (SDK-Call im Thread-Pool)."""
+    return await asyncio.to_thread(fetch_openai_models, api_key)
+
+
+async def fetch_groq_models_async(api_key: str) -> list[str]:
+    """Async-Variante von fetch_groq_models (SDK-Call im Thread-Pool)."""
+    return await asyncio.to_thread(fetch_groq_models, api_key)
 
-# Ausgewaehlte Modelle pro Provider
-_selected_models = {
-    "openai": [],  # Liste der ausgewählten Modellnamen
-    "groq": [],
-    "gemini": [],
-    "ollama": [],
+
+def _start_model_fetch(fetch_async, api_key: str):
+    """Startet den Modell-Abruf auf dem Bot-Loop, parallel zur Key-Validierung.
+
+    Returns:
+        concurrent.futures.Future oder None, falls der Loop nicht laeuft
+    """
+    if bot.loop is None or not bot.loop.is_running():
+        return None
+    return asyncio.run_coroutine_threadsafe(fetch_async(api_key), bot.loop)
+
+
+def _collect_models(future, fetch_sync, provider: str, api_key: str) -> list[str]:
+    """Wartet auf einen mit _start_model_fetch gestarteten Abruf (oder holt synchron)."""
+    if future is None:
+        return fetch_sync(api_key)
+    try:
+        return future.result(timeout=15)
+    except Exception as e:
+        logger.warning(f"Modell-Abruf für {provider} fehlgeschlagen: {e}")
+        return LLM_MODELS[provider]
+
+
+# Validierte Provider, Keys und ausgewaehlte Modelle
+# (Ollama braucht keinen Key, aber valid=True wenn läuft)
+_providers: dict[str, ProviderState] = {
+    "openai": ProviderState(),
+    "groq": ProviderState(),
+    "gemini": ProviderState(),
+    "ollama": ProviderState(),
 }
 
 # Ollama Status
@@ -891,12 +1069,23 @@ _ollama_available = False
 _ollama_models = []
 
 
+# Wiederverwendeter Ollama-Client (httpx-Verbindungspool, kurzer Timeout statt Hängen)
+_ollama_client = None
+
+
+def _get_ollama_client():
+    global _ollama_client
+    if _ollama_client is None:
+        import ollama
+        _ollama_client = ollama.Client(timeout=5.0)
+    return _ollama_client
+
+
 def check_ollama_available() -> tuple[bool, list[str]]:
     """Preuft ob Ollama laeuft und welche Modelle installiert sind."""
     try:
-        import ollama
         # Versuche Modelle zu listen - wenn das klappt, läuft Ollama
-        models_response = ollama.list()
+        models_response = _get_ollama_client().list()
         models = []
 
         # Ollama gibt ein ListResponse Objekt zurück mit 'models' Attribut
@@ -909,20 +1098,18 @@ def check_ollama_available() -> tuple[bool, list[str]]:
             model_list = models_response['models']
 
         if model_list:
-            for model in model_list:
-                # Model kann ein Objekt oder Dict sein
-                if hasattr(model, 'model'):
-                    model_name = model.model
-                elif isinstance(model, dict):
-                    model_name = model.get('name', '') or model.get('model', '')
-                else:
-                    model_name = str(model)
+            # Format einmal am ersten Eintrag bestimmen (alle Eintraege sind gleich aufgebaut):
+            # Model kann ein Objekt oder Dict sein
+            first = model_list[0]
+            if hasattr(first, 'model'):
+                get_name = attrgetter('model')
+            elif isinstance(first, dict):
+                get_name = lambda m: m.get('name', '') or m.get('model', '')
+            else:
+                get_name = str
 
-                if model_name:
-                    # Entferne ":latest" Suffix wenn vorhanden
-                    if model_name.endswith(':latest'):
-                        model_name = model_name.replace(':latest', '')
-                    models.append(model_name)
+            # ":latest" Suffix entfernen
+            models = [name.removesuffix(':latest') for m in model_list if (name := get_name(m))]
 
         if models:
             logger.info(f"Ollama verfügbar mit {len(models)} Modellen: {', '.join(models)}")
@@ -946,9 +1133,9 @@ _ollama_available, _ollama_models = check_ollama_available()
 
 if _ollama_available:
     LLM_MODELS["ollama"] = _ollama_models
-    _validated_providers["ollama"] = {"valid": True, "api_key": None}
+    _providers["ollama"].mark_valid(None)
     # Erste 3 Modelle vorauswählen
-    _selected_models["ollama"] = _ollama_models[:3] if _ollama_models else []
+    _providers["ollama"].selected = _ollama_models[:3] if _ollama_models else []
     logger.info(f"Ollama als LLM-Provider verfügbar: {len(_ollama_models)} lokale Modelle")
 else:
     logger.info("Ollama nicht verfügbar - nur Cloud-Provider nutzbar")
@@ -961,6 +1148,7 @@ try:
 except Exception as e:
     logger.warning(f"Preise konnten nicht geladen werden: {e}")
     MODEL_PRICES = FALLBACK_PRICES.copy()
+    _prices_version += 1
 
 # Aktuell ausgewählter Provider und Modell
 _current_llm_config = {
@@ -994,7 +1182,7 @@ elif _current_llm_config["provider"] and bot.config.llm_available:
         api_key = bot.config.gemini_api_key
 
     if api_key or provider == "ollama":
-        _validated_providers[provider] = {"valid": True, "api_key": api_key}
+        _providers[provider].mark_valid(api_key)
         logger.info(f"LLM Provider aus .env als validiert markiert: {provider}")
 
 
@@ -1071,46 +1259,113 @@ def _validate_api_key(provider: str, api_key: str) -> tuple[bool, str]:
             return False, f"Validierung fehlgeschlagen: {error_msg[:100]}"
 
 
-def validate_openai_key(api_key: str) -> str:
-    """Validiert OpenAI API Key und lädt verfügbare Modelle"""
-    success, message = _validate_api_key("openai", api_key)
+# Cache erfolgreicher Key-Validierungen: sha256(provider:key) -> (Zeitpunkt, Status, Modelle)
+# Spart die Test-Requests bei jedem Seiten-Reload mit gespeicherten Keys
+_VALIDATION_TTL = 300  # Sekunden
+_validation_cache: dict[str, tuple[float, str, list[str]]] = {}
+
+_PROVIDER_LABELS = {"openai": "OpenAI", "groq": "Groq", "gemini": "Gemini"}
+
+# Provider -> (synchroner Modell-Abruf, async Variante für parallelen Start oder None)
+_MODEL_FETCHERS = {
+    "openai": (fetch_openai_models, fetch_openai_models_async),
+    "groq": (fetch_groq_models, fetch_groq_models_async),
+    "gemini": (fetch_gemini_models, None),
+}
+
+
+def _validation_cache_key(provider: str, api_key: str) -> str:
+    return hashlib.sha256(f"{provider}:{api_key}".encode()).hexdigest()
+
+
+def evict_validation(provider: str, api_key: str | None):
+    """Entfernt die gecachte Validierung eines Keys (z.B. ersetzter oder gelöschter Key)"""
+    if api_key:
+        _validation_cache.pop(_validation_cache_key(provider, api_key.strip()), None)
+
+
+def _validate_provider_key(provider: str, api_key: str) -> str:
+    """Validiert einen API Key, lädt die Modelle und cached erfolgreiche Ergebnisse"""
+    label = _PROVIDER_LABELS[provider]
+    api_key = (api_key or "").strip()
+    cache_key = _validation_cache_key(provider, api_key)
+
+    cached = _validation_cache.get(cache_key)
+    if cached and time.monotonic() - cached[0] < _VALIDATION_TTL:
+        _, status, models = cached
+        _providers[provider].mark_valid(api_key)
+        LLM_MODELS[provider] = models
+        logger.info(f"{label}: Key-Validierung aus Cache")
+        return status
+
+    fetch_sync, fetch_async = _MODEL_FETCHERS[provider]
+    # Modell-Liste schon waehrend der Validierung laden (ueberlappt beide Requests)
+    models_future = _start_model_fetch(fetch_async, api_key) if api_key and fetch_async else None
+    success, message = _validate_api_key(provider, api_key)
     if success:
-        _validated_providers["openai"] = {"valid": True, "api_key": api_key.strip()}
+        _providers[provider].mark_valid(api_key)
         # Modelle dynamisch laden
-        models = fetch_openai_models(api_key.strip())
-        LLM_MODELS["openai"] = models
-        return f"✅ OpenAI: {message}\n📋 {len(models)} Modelle geladen"
+        models = _collect_models(models_future, fetch_sync, provider, api_key)
+        LLM_MODELS[provider] = models
+        status = f"✅ {label}: {message}\n📋 {len(models)} Modelle geladen"
+        _validation_cache[cache_key] = (time.monotonic(), status, models)
+        return status
     else:
-        _validated_providers["openai"] = {"valid": False, "api_key": None}
-        return f"❌ OpenAI: {message}"
+        if models_future is not None:
+            models_future.cancel()
+        evict_validation(provider, api_key)
+        _providers[provider].invalidate()
+        return f"❌ {label}: {message}"
+
+
+def validate_openai_key(api_key: str) -> str:
+    """Validiert OpenAI API Key und lädt verfügbare Modelle"""
+    return _validate_provider_key("openai", api_key)
 
 
 def validate_groq_key(api_key: str) -> str:
     """Validiert Groq API Key und lädt verfügbare Modelle"""
-    success, message = _validate_api_key("groq", api_key)
-    if success:
-        _validated_providers["groq"] = {"valid": True, "api_key": api_key.strip()}
-        # Modelle dynamisch laden
-        models = fetch_groq_models(api_key.strip())
-        LLM_MODELS["groq"] = models
-        return f"✅ Groq: {message}\n📋 {len(models)} Modelle geladen"
-    else:
-        _validated_providers["groq"] = {"valid": False, "api_key": None}
-        return f"❌ Groq: {message}"
+    return _validate_provider_key("groq", api_key)
 
 
 def validate_gemini_key(api_key: str) -> str:
     """Validiert Gemini API Key und lädt verfügbare Modelle"""
-    success, message = _validate_api_key("gemini", api_key)
-    if success:
-        _validated_providers["gemini"] = {"valid": True, "api_key": api_key.strip()}
-        # Modelle dynamisch laden
-        models = fetch_gemini_models(api_key.strip())
-        LLM_MODELS["gemini"] = models
-        return f"✅ Gemini: {message}\n📋 {len(models)} Modelle geladen"
-    else:
-        _validated_providers["gemini"] = {"valid": False, "api_key": None}
-        return f"❌ Gemini: {message}"
+    return _validate_provider_key("gemini", api_key)
+
+
+_KEY_VALIDATORS = {
+    "openai": validate_openai_key,
+    "groq": validate_groq_key,
+    "gemini": validate_gemini_key,
+}
+
+
+async def validate_all_keys(keys: dict[str, str]) -> dict[str, str]:
+    """
+    Validiert mehrere API Keys nebenläufig (Wartezeit = langsamster Request statt Summe)
+
+    Args:
+        keys: Provider -> API Key (leere Keys werden übersprungen)
+
+    Returns:
+        Provider -> Status-Text der jeweiligen validate_*_key Funktion
+    """
+    jobs = {provider: key for provider, key in keys.items() if key and provider in _KEY_VALIDATORS}
+    if not jobs:
+        return {}
+
+    results = await asyncio.gather(
+        *(asyncio.to_thread(_KEY_VALIDATORS[provider], key) for provider, key in jobs.items()),
+        return_exceptions=True
+    )
+    statuses = {}
+    for provider, result in zip(jobs, results):
+        if isinstance(result, BaseException):
+            logger.error(f"Validierung von {provider} fehlgeschlagen: {result}")
+            _providers[provider].invalidate()
+            result = f"❌ {_PROVIDER_LABELS[provider]}: Validierung fehlgeschlagen: {str(result)[:100]}"
+        statuses[provider] = result
+    return statuses
 
 
 def refresh_ollama_models() -> str:
@@ -1121,14 +1376,14 @@ def refresh_ollama_models() -> str:
 
     if _ollama_available:
         LLM_MODELS["ollama"] = _ollama_models
-        _validated_providers["ollama"] = {"valid": True, "api_key": None}
+        _providers["ollama"].mark_valid(None)
         if _ollama_models:
             return f"✅ Ollama: {len(_ollama_models)} Modelle gefunden ({', '.join(_ollama_models[:3])}{'...' if len(_ollama_models) > 3 else ''})"
         else:
             return "⚠️ Ollama läuft, aber keine Modelle installiert. Nutze 'ollama pull <model>' um Modelle zu installieren."
     else:
         LLM_MODELS["ollama"] = []
-        _validated_providers["ollama"] = {"valid": False, "api_key": None}
+        _providers["ollama"].invalidate()
         return "❌ Ollama nicht erreichbar. Stelle sicher dass Ollama läuft (ollama serve)."
 
 
@@ -1143,10 +1398,23 @@ def get_ollama_status() -> str:
         return "❌ Nicht verfügbar"
 
 
+# Memo für Dropdown- und CheckboxGroup-Choices. Die Keys enthalten alle Eingaben
+# (Preisstand, Modell-Listen, Auswahl), dadurch veralten Einträge nie, sie werden
+# nur beim Überschreiten der Größe verworfen.
+_CHOICES_CACHE_SIZE = 64
+_dropdown_cache: dict[tuple, list[str]] = {}
+_choices_cache: dict[tuple, list[tuple[str, str]]] = {}
+
+
+def _memo_store(cache: dict, key: tuple, value: list) -> list:
+    if len(cache) >= _CHOICES_CACHE_SIZE:
+        cache.clear()
+    cache[key] = value
+    return value
+
+
 def get_validated_models() -> list[str]:
     """Gibt Liste aller validierten Modelle zurück (für Dropdown) mit Preisen"""
-    models = []
-
     # Aktueller Provider aus Config (kann None sein)
     current_provider = _current_llm_config.get("provider")
     current_model = _current_llm_config.get("model")
@@ -1154,15 +1422,31 @@ def get_validated_models() -> list[str]:
     # Prüfe ob LLM verfügbar
     llm_available = bot.gemini and bot.gemini.llm_available if bot.gemini else False
 
+    cache_key = (
+        current_provider, current_model, bool(llm_available), _prices_version,
+        tuple(
+            (provider, tuple(state.selected), tuple(LLM_MODELS.get(provider, [])))
+            for provider, state in _providers.items() if state.valid
+        ),
+    )
+    cached = _dropdown_cache.get(cache_key)
+    if cached is not None:
+        return list(cached)
+
+    models = []
+    # "provider: modell" aller bereits eingetragenen Modelle (Duplikat-Prüfung per Set)
+    listed = set()
+
     # Füge aktuelles Modell hinzu (falls verfügbar)
     if current_model and current_provider and llm_available:
         price = get_model_price(current_model, current_provider)
         models.append(f"{current_provider}: {current_model} [{price}] (aktiv)")
+        listed.add(f"{current_provider}: {current_model}")
 
     # Füge validierte Provider hinzu - NUR ausgewählte Modelle
-    for provider, info in _validated_providers.items():
-        if info["valid"]:
-            selected = _selected_models.get(provider, [])
+    for provider, state in _providers.items():
+        if state.valid:
+            selected = state.selected
             available = LLM_MODELS.get(provider, [])
 
             # Wenn keine Auswahl getroffen wurde, zeige alle (max 5 Standard-Modelle)
@@ -1170,6 +1454,7 @@ def get_validated_models() -> list[str]:
                 models_to_show = available[:5] if len(available) > 5 else available
             else:
                 # Nur ausgewählte Modelle anzeigen
+                selected = set(selected)
                 models_to_show = [m for m in available if m in selected]
 
             # Trenne empfohlene und andere Modelle
@@ -1177,12 +1462,13 @@ def get_validated_models() -> list[str]:
             other_models = []
 
             for model in models_to_show:
-                price = get_model_price(model, provider)
                 base_check = f"{provider}: {model}"
 
                 # Prüfe ob Modell bereits in Liste
-                if any(base_check in m for m in models):
+                if base_check in listed:
                     continue
+                listed.add(base_check)
+                price = get_model_price(model, provider)
 
                 if is_recommended_model(model):
                     recommended_models.append(f"{provider}: {model} [{price}] (empfohlen)")
@@ -1197,12 +1483,12 @@ def get_validated_models() -> list[str]:
     if not models:
         models = ["Kein LLM konfiguriert - bitte API Key in Einstellungen eingeben"]
 
-    return models
+    return list(_memo_store(_dropdown_cache, cache_key, models))
 
 
 def update_selected_models(provider: str, selected: list[str]):
     """Aktualisiert die Modellauswahl für einen Provider"""
-    _selected_models[provider] = selected
+    _providers[provider].selected = selected
     logger.info(f"{provider}: {len(selected)} Modelle ausgewählt")
 
 
@@ -1213,15 +1499,23 @@ RECOMMENDED_MODELS = [
 ]
 
 
+_RECOMMENDED_LOWER = frozenset(r.lower() for r in RECOMMENDED_MODELS)
+
+
 def is_recommended_model(model_name: str) -> bool:
     """Prüft ob ein Modell empfohlen ist (exakter Match)"""
-    return model_name.lower() in [r.lower() for r in RECOMMENDED_MODELS]
+    return model_name.lower() in _RECOMMENDED_LOWER
 
 
-def get_model_choices_with_prices(provider: str) -> list[str]:
-    """Gibt Modelle mit Preisen als Choices für CheckboxGroup zurück.
-    Empfohlene Modelle stehen an erster Stelle."""
+def get_model_choices_with_prices(provider: str) -> list[tuple[str, str]]:
+    """Gibt Modelle mit Preisen als (Label, Modellname)-Choices für CheckboxGroup zurück.
+    Empfohlene Modelle stehen an erster Stelle. Die CheckboxGroup liefert damit
+    direkt die Modellnamen als Wert, ohne die Labels wieder parsen zu müssen."""
     models = LLM_MODELS.get(provider, [])
+    cache_key = (provider, _prices_version, tuple(models))
+    cached = _choices_cache.get(cache_key)
+    if cached is not None:
+        return list(cached)
 
     # Trenne empfohlene und andere Modelle
     recommended = []
@@ -1230,44 +1524,92 @@ def get_model_choices_with_prices(provider: str) -> list[str]:
     for model in models:
         price = get_model_price(model, provider)
         if is_recommended_model(model):
-            recommended.append(f"{model} [{price}] (empfohlen)")
+            recommended.append((f"{model} [{price}] (empfohlen)", model))
         else:
-            others.append(f"{model} [{price}]")
+            others.append((f"{model} [{price}]", model))
 
     # Empfohlene zuerst, dann der Rest
-    return recommended + others
-
-
-def extract_model_name(choice: str) -> str:
-    """Extrahiert den Modellnamen aus einer Choice mit Preis und Tags"""
-    # "gpt-4o [$2.50/$10] (empfohlen)" -> "gpt-4o"
-    import re
-    # Entferne (empfohlen), (aktiv) und [preis] Tags
-    result = choice
-    result = re.sub(r'\s*\(empfohlen\)', '', result)
-    result = re.sub(r'\s*\(aktiv\)', '', result)
-    result = re.sub(r'\s*\[.*?\]', '', result)
-    return result.strip()
+    return list(_memo_store(_choices_cache, cache_key, recommended + others))
 
 
+# (empfohlen), (aktiv) und [preis] Tags in Modell-Labels
 def update_model_dropdown():
     """Aktualisiert das Modell-Dropdown mit validierten Modellen"""
     models = get_validated_models()
     return gr.update(choices=models, value=models[0] if models else None)
 
 
+# Anzahl vorausgewählter Modelle nach erfolgreicher Key-Validierung
+DEFAULT_SELECTED_MODELS = 5
+
+
+def _provider_checkbox_update(provider: str):
+    """CheckboxGroup-Update eines Providers; setzt bei gültigem Key die Standardauswahl"""
+    state = _providers[provider]
+    if not state.valid:
+        return gr.update(visible=False)
+    choices = get_model_choices_with_prices(provider)
+    default_selected = [model for _, model in choices[:DEFAULT_SELECTED_MODELS]]
+    state.selected = list(default_selected)
+    return gr.update(choices=choices, value=default_selected, visible=True)
+
+
+async def _validate_and_build(provider: str, api_key: str, saved_keys: dict) -> tuple:
+    """Gemeinsamer Handler der Validieren-Buttons (Status, Checkboxen, Dropdown, LLM-Info, Browser-Keys)"""
+    # Ersetzter (oder geleerter) Key: alte Validierung verwerfen, damit ein
+    # rotierter/widerrufener Key nicht bis zum TTL-Ende als gültig gilt
+    api_key = (api_key or "").strip()
+    old_key = saved_keys.get(provider) or ""
+    if old_key and old_key != api_key:
+        evict_validation(provider, old_key)
+    # Validierung im Worker-Thread, damit der Event-Loop von Gradio frei bleibt
+    result = await asyncio.to_thread(_KEY_VALIDATORS[provider], api_key)
+    checkbox_update = _provider_checkbox_update(provider)
+    # API-Key im Browser speichern, bei Fehler entfernen; unverändert -> kein erneutes Senden
+    new_key = api_key if _providers[provider].valid else ""
+    if new_key == old_key:
+        saved_update = gr.skip()
+    else:
+        saved_keys[provider] = new_key
+        saved_update = saved_keys
+    return result, checkbox_update, update_model_dropdown(), get_current_llm_info(), saved_update
+
+
+async def _on_models_change(provider: str, selected: list[str]):
+    """Gemeinsamer Handler der Modellauswahl-Checkboxen"""
+    # Gleiche Modellmenge (z.B. ab- und wieder angehakt): Dropdown nicht neu senden
+    if set(selected) == set(_providers[provider].selected):
+        return gr.skip()
+    update_selected_models(provider, list(selected))
+    return update_model_dropdown()
+
+
+def _llm_switch_key(model_selection: str) -> tuple[str, str | None]:
+    """Auswahl ohne Tags plus validierter API Key des Providers"""
+    return llm_switch_key(model_selection, _providers)
+
+
+def is_active_llm_selection(model_selection: str) -> bool:
+    """True wenn die Auswahl dem aktiven LLM mit unverändertem API Key entspricht"""
+    if not model_selection or not (bot.gemini and bot.gemini.llm_available):
+        return False
+    return _llm_switch_key(model_selection) == _active_llm_key
+
+
+# ("provider: modell", validierter API Key) des aktiven LLM (.env oder Ollama-Fallback)
+_active_llm_key = startup_llm_key(_current_llm_config, _providers)
+
+
 def switch_llm_model(model_selection: str) -> str:
     """Wechselt das LLM Modell"""
-    global _current_llm_config
+    global _current_llm_config, _active_llm_key
 
     if not model_selection:
         return "[WARN] Kein Modell ausgewählt"
 
     try:
-        # Tags entfehrnen
-        model_selection = model_selection.replace(" (aktiv)", "")
-        model_selection = model_selection.replace(" (empfohlen)", "")
-        model_selection = re.sub(r'\s*\[.*?\]', '', model_selection)  # Entferne [preis]
+        # Tags entfehrnen ([preis], (aktiv), (empfohlen))
+        model_selection = extract_model_name(model_selection)
 
         parts = model_selection.split(": ", 1)
         if len(parts) != 2:
@@ -1279,13 +1621,15 @@ def switch_llm_model(model_selection: str) -> str:
 
         # Prüfe ob Provider validiert ist oder der aktuelle ist
         current_provider = _current_llm_config.get("provider")
+        state = _providers.get(provider)
+        is_valid = state is not None and state.valid
         if provider != current_provider:
-            if not _validated_providers.get(provider, {}).get("valid"):
+            if not is_valid:
                 return f"[FEHLER] {provider} ist nicht validiert. Bitte erst API Key eingeben."
 
         # API Key setzen falls validiert
-        if _validated_providers.get(provider, {}).get("valid"):
-            api_key = _validated_providers[provider]["api_key"]
+        if is_valid:
+            api_key = state.api_key
             if api_key:  # Nur setzen wenn nicht None
                 os.environ[f"{provider.upper()}_API_KEY"] = api_key
 
@@ -1297,6 +1641,7 @@ def switch_llm_model(model_selection: str) -> str:
 
         _current_llm_config["provider"] = provider
         _current_llm_config["model"] = model
+        _active_llm_key = _llm_switch_key(model_selection)
 
         logger.info(f"LLM gewechselt zu: {provider} - {model}")
         return f"[OK] LLM gewechselt zu: {provider} - {model}"
@@ -1306,23 +1651,37 @@ def switch_llm_model(model_selection: str) -> str:
         return f"[FEHLER] LLM-Wechsel fehlgeschlagen: {str(e)}"
 
 
+# Letzte LLM-Info: (Eingaben, Text) - fast jeder Handler fragt sie unverändert ab
+_llm_info_cache: tuple[tuple, str] | None = None
+
+
 def get_current_llm_info() -> str:
     """Gibt Info über aktuelles LLM zurück"""
+    global _llm_info_cache
+
     provider = _current_llm_config.get("provider")
     model = _current_llm_config.get("model")
 
-    validated_list = [p for p, info in _validated_providers.items() if info["valid"]]
-    validated_str = ", ".join(validated_list) if validated_list else "keine"
+    validated_list = tuple(p for p, state in _providers.items() if state.valid)
 
     # Prüfe ob LLM verfügbar
     llm_available = bot.gemini and bot.gemini.llm_available if bot.gemini else False
 
+    cache_key = (provider, model, bool(llm_available), validated_list)
+    if _llm_info_cache is not None and _llm_info_cache[0] == cache_key:
+        return _llm_info_cache[1]
+
+    validated_str = ", ".join(validated_list) if validated_list else "keine"
+
     if not provider or not model:
-        return f"**Aktuell:** Kein LLM konfiguriert ⚠️\n**Validierte Provider:** {validated_str}"
+        info = f"**Aktuell:** Kein LLM konfiguriert ⚠️\n**Validierte Provider:** {validated_str}"
     elif not llm_available:
-        return f"**Aktuell:** {provider} - {model} (nicht aktiv) ⚠️\n**Validierte Provider:** {validated_str}"
+        info = f"**Aktuell:** {provider} - {model} (nicht aktiv) ⚠️\n**Validierte Provider:** {validated_str}"
     else:
-        return f"**Aktuell:** {provider} - {model} ✅\n**Validierte Provider:** {validated_str}"
+        info = f"**Aktuell:** {provider} - {model} ✅\n**Validierte Provider:** {validated_str}"
+
+    _llm_info_cache = (cache_key, info)
+    return info
 
 
 # Wrapper-Funktionen für Gradio
@@ -1332,29 +1691,79 @@ def init_bot():
     return bot._run_async(bot.initialize())
 
 
-# Cache für letzte Transkription (verhindert Duplikate)
-_last_transcribed_audio = {"path": None, "text": None}
+# Maximale Anzahl Chat-Nachrichten pro Session (ältere fallen automatisch heraus)
+CHAT_HISTORY_LIMIT = 200
+
+# Transkriptions-Cache: Inhalts-Hash der Audiodatei -> Text (LRU).
+# Gradio legt jede Aufnahme unter neuem Temp-Pfad ab, daher Hash statt Pfad.
+_TRANSCRIPTION_CACHE_SIZE = 32
+_transcription_cache: OrderedDict[bytes, str] = OrderedDict()
+
+# Hash der zuletzt in den Chat übernommenen Aufnahme (verhindert Duplikate)
+_last_transcribed_digest = None
+
+
+def _audio_digest(path: str) -> bytes:
+    """blake2b-Hash über den Inhalt der Audiodatei"""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 16), b''):
+            digest.update(chunk)
+    return digest.digest()
+
+
+def _transcribe_cached(audio: str, digest: bytes) -> str:
+    """Speech-to-Text mit LRU-Cache auf den Audio-Inhalt"""
+    text = _transcription_cache.get(digest)
+    if text is not None:
+        _transcription_cache.move_to_end(digest)
+        logger.info("Transkription aus Cache (gleicher Audio-Inhalt)")
+        return text
+
+    text = bot._run_async(bot.gemini.speech_to_text(audio))
+    _transcription_cache[digest] = text
+    if len(_transcription_cache) > _TRANSCRIPTION_CACHE_SIZE:
+        _transcription_cache.popitem(last=False)
+    return text
+
+
+def _prewarm_llm():
+    """Startet LLMClient.warm_up im Hintergrund (fire-and-forget)"""
+    if not bot.gemini or not bot.gemini.llm_available or bot.gemini.llm_client is None:
+        return
+    bot.gemini.llm_client.warm_up_in_background()
 
 
+# Hinweis zu den Rückgaben der Chat-Handler: chat_history ist eine begrenzte deque
+# (siehe CHAT_HISTORY_LIMIT) und wird in-place ergänzt (gr.State liefert das
+# Session-Objekt selbst), daher bekommt nur der Chatbot den Verlauf als Liste;
+# der chat_state-Ausgang wird mit gr.skip() übersprungen, statt denselben
+# Verlauf ein zweites Mal zu verarbeiten.
 def transcribe_audio_sync(audio, chat_history):
     """Transkribiert Audio und zeigt es im Chat (sync wrapper)"""
-    global _last_transcribed_audio
+    global _last_transcribed_digest
 
     if audio is None:
-        return chat_history, chat_history, "[INFO] Keine Audio-Datei"
-
-    # Prüfe ob diese Audio-Datei bereits transkribiert wurde
-    if _last_transcribed_audio["path"] == audio:
-        logger.info(f"Audio bereits transkribiert, überspringe: {audio}")
-        return chat_history, chat_history, f"[INFO] Bereits transkribiert"
+        return list(chat_history), gr.skip(), "[INFO] Keine Audio-Datei"
 
     try:
+        digest = _audio_digest(audio)
+
+        # Prüfe ob diese Aufnahme bereits transkribiert wurde
+        if digest == _last_transcribed_digest:
+            logger.info(f"Audio bereits transkribiert, überspringe: {audio}")
+            return list(chat_history), gr.skip(), f"[INFO] Bereits transkribiert"
+
+        # LLM-Verbindung parallel zur Transkription vorwärmen (TCP/TLS bzw. Modell laden),
+        # die Anfrage folgt meist direkt nach dem Klick auf 'Audio verarbeiten'
+        if digest not in _transcription_cache:
+            _prewarm_llm()
+
         # Nur Transkription, keine weitere Verarbeitung
-        text = bot._run_async(bot.gemini.speech_to_text(audio))
+        text = _transcribe_cached(audio, digest)
         logger.info(f"Transkription angezeigt: {text}")
 
-        # Cache aktualisieren
-        _last_transcribed_audio = {"path": audio, "text": text}
+        _last_transcribed_digest = digest
 
         # Transkription zum Chat hinzufuegen
         chat_history.append({
@@ -1362,185 +1771,153 @@ def transcribe_audio_sync(audio, chat_history):
             "content": f"🎤 **Transkribierte Audiodatei:**\n{text}"
         })
 
-        return chat_history, chat_history, f"[INFO] Transkribiert: {text[:50]}... (Klicke 'Audio verarbeiten' zum Absenden)"
+        return list(chat_history), gr.skip(), f"[INFO] Transkribiert: {text[:50]}... (Klicke 'Audio verarbeiten' zum Absenden)"
     except Exception as e:
         logger.error(f"Fehler bei Transkription: {e}")
-        return chat_history, chat_history, f"[FEHLER] Transkription fehlgeschlagen: {str(e)}"
+        return list(chat_history), gr.skip(), f"[FEHLER] Transkription fehlgeschlagen: {str(e)}"
+
+
+# Platzhalter der Bot-Antwort, solange der Befehl läuft
+_PENDING_REPLY = "⏳ *Verarbeite...*"
+
 
+async def process_audio(audio, chat_history):
+    """Verarbeitet die bereits transkribierte Audio-Nachricht.
 
-def process_audio_sync(audio, chat_history):
-    """Verarbeitet die bereits transkribierte Audio-Nachricht"""
-    global _last_transcribed_audio
+    Async-Generator: zeigt sofort einen Platzhalter im Chat und ersetzt ihn
+    durch die Antwort, sobald der Befehl ausgeführt ist.
+    """
+    global _last_transcribed_digest
 
     # Prüfe ob LLM verfügbar ist
     if not bot.gemini or not bot.gemini.llm_available:
         error_msg = "Kein LLM konfiguriert. Bitte gehe zu 'Einstellungen' und gib einen API Key ein."
         chat_history.append({"role": "assistant", "content": f"⚠️ {error_msg}"})
-        return chat_history, chat_history, f"[WARN] {error_msg}", None
+        yield list(chat_history), gr.skip(), f"[WARN] {error_msg}", None
+        return
 
     # Die Transkription ist bereits im Chat (durch transcribe_audio_sync)
     # Hole die letzte User-Message (die Transkription)
     if not chat_history or len(chat_history) == 0:
-        return chat_history, chat_history, "[FEHLER] Keine Transkription gefunden", None
+        yield list(chat_history), gr.skip(), "[FEHLER] Keine Transkription gefunden", None
+        return
 
     last_message = chat_history[-1]
     if last_message.get('role') != 'user':
-        return chat_history, chat_history, "[FEHLER] Letzte Nachricht ist keine User-Message", None
+        yield list(chat_history), gr.skip(), "[FEHLER] Letzte Nachricht ist keine User-Message", None
+        return
 
     # Extrahiere Text aus der Transkription
     content = last_message.get('content', '')
     # Entferne das Präfix "🎤 **Transkribierte Audiodatei:**\n"
     user_text = content.replace('🎤 **Transkribierte Audiodatei:**\n', '').strip()
 
+    chat_history.append({"role": "assistant", "content": _PENDING_REPLY})
+    yield list(chat_history), gr.skip(), "[INFO] Verarbeite...", None
+
     try:
         # Befehl ausführen (ohne nochmal zu transkribieren)
-        response = bot._run_async(bot._execute_command(user_text))
+        response = await bot._arun(bot._execute_command(user_text))
 
-        # Bot-Antwort hinzufügen
-        chat_history.append({"role": "assistant", "content": response})
+        # Platzhalter durch Bot-Antwort ersetzen
+        chat_history[-1] = {"role": "assistant", "content": response}
 
         # Cache zurücksetzen damit nächste Aufnahme transkribiert wird
-        _last_transcribed_audio = {"path": None, "text": None}
+        _last_transcribed_digest = None
 
-        return chat_history, chat_history, f"[OK] Verarbeitet: {user_text[:50]}...", None
+        yield list(chat_history), gr.skip(), f"[OK] Verarbeitet: {user_text[:50]}...", None
     except Exception as e:
         logger.error(f"Fehler bei Audio-Verarbeitung: {e}")
-        return chat_history, chat_history, f"[FEHLER] {str(e)}", None
+        chat_history[-1] = {"role": "assistant", "content": f"⚠️ {str(e)}"}
+        yield list(chat_history), gr.skip(), f"[FEHLER] {str(e)}", None
 
 
-def process_text_sync(text, chat_history):
-    """Verarbeitet Text (sync wrapper)"""
+async def process_text(text, chat_history):
+    """Verarbeitet Text (läuft direkt auf Gradios Event-Loop, wartet auf den Bot-Loop).
+
+    Async-Generator: die Eingabe erscheint sofort mit Platzhalter im Chat,
+    die Antwort ersetzt den Platzhalter sobald der Befehl ausgeführt ist.
+    """
     if not text or text.strip() == "":
-        return chat_history, chat_history, "[WARN] Keine Eingabe", ""
+        yield list(chat_history), gr.skip(), "[WARN] Keine Eingabe", ""
+        return
 
     # Prüfe ob LLM verfügbar ist
     if not bot.gemini or not bot.gemini.llm_available:
         error_msg = "Kein LLM konfiguriert. Bitte gehe zu 'Einstellungen' und gib einen API Key ein."
         chat_history.append({"role": "user", "content": text})
         chat_history.append({"role": "assistant", "content": f"⚠️ {error_msg}"})
-        return chat_history, chat_history, f"[WARN] {error_msg}", ""
+        yield list(chat_history), gr.skip(), f"[WARN] {error_msg}", ""
+        return
+
+    # Eingabe sofort anzeigen
+    chat_history.append({"role": "user", "content": text})
+    chat_history.append({"role": "assistant", "content": _PENDING_REPLY})
+    yield list(chat_history), gr.skip(), "[INFO] Verarbeite...", ""
 
     try:
         # Befehl ausführen
-        response = bot._run_async(bot._execute_command(text))
+        response = await bot._arun(bot._execute_command(text))
 
-        # Chat-History aktualisieren
-        chat_history.append({"role": "user", "content": text})
-        chat_history.append({"role": "assistant", "content": response})
+        # Platzhalter durch Bot-Antwort ersetzen
+        chat_history[-1] = {"role": "assistant", "content": response}
 
-        return chat_history, chat_history, "[OK] Verarbeitet", ""
+        yield list(chat_history), gr.skip(), "[OK] Verarbeitet", ""
     except Exception as e:
         logger.error(f"Fehler bei Text-Verarbeitung: {e}")
-        return chat_history, chat_history, f"[FEHLER] {str(e)}", ""
+        chat_history[-1] = {"role": "assistant", "content": f"⚠️ {str(e)}"}
+        yield list(chat_history), gr.skip(), f"[FEHLER] {str(e)}", ""
 
 
 # === KALENDER-FUNKTIONEN ===
 
-def generate_calendar_html(year: int, month: int, events: list) -> str:
-    """
-    Generiert HTML für einen Monatskalender mit markierten Events
-
-    Args:
-        year: Jahr
-        month: Monat (1-12)
-        events: Liste von Events mit 'start_time' und 'name'
-
-    Returns:
-        HTML-String für den Kalender
-    """
-    berlin_tz = pytz.timezone('Europe/Berlin')
-
-    # Events nach Tag gruppieren
-    events_by_day = {}
-    for event in events:
-        start_time_str = event.get('start_time') or event.get('scheduled_start_time')
-        if start_time_str:
-            try:
-                # Parse ISO format
-                if isinstance(start_time_str, str):
-                    utc_time = datetime.fromisoformat(start_time_str.replace('Z', '+00:00'))
-                    berlin_time = utc_time.astimezone(berlin_tz)
-                else:
-                    berlin_time = start_time_str
-
-                # Nur Events im angezeigten Monat
-                if berlin_time.year == year and berlin_time.month == month:
-                    day = berlin_time.day
-                    if day not in events_by_day:
-                        events_by_day[day] = []
-                    events_by_day[day].append({
-                        'name': event.get('name', 'Event'),
-                        'time': berlin_time.strftime('%H:%M'),
-                        'location': event.get('location', ''),
-                        'description': event.get('description', ''),
-                        'duration': event.get('duration', '')
-                    })
-            except Exception as e:
-                logger.warning(f"Fehler beim Parsen von Event-Zeit: {e}")
-
-    # Deutsche Monatsnamen
-    month_names = ['', 'Januar', 'Februar', 'März', 'April', 'Mai', 'Juni',
-                   'Juli', 'August', 'September', 'Oktober', 'November', 'Dezember']
-
-    # Deutsche Wochentage (Montag = erster Tag)
-    weekdays = ['Mo', 'Di', 'Mi', 'Do', 'Fr', 'Sa', 'So']
-
-    # Kalender-Daten generieren
-    cal = calendar.Calendar(firstweekday=0)  # Montag = 0
-    month_days = cal.monthdayscalendar(year, month)
-
-    # Heute markieren
-    today = datetime.now(berlin_tz)
-    is_current_month = (today.year == year and today.month == month)
-    today_day = today.day if is_current_month else -1
-
-    # CSS Styles
-    html = f'''
+# Kalender-Styles (statisch, einmal beim Import erzeugt)
+_CALENDAR_CSS = '''
     <style>
-        .calendar-container {{
+        .calendar-container {
             font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
             max-width: 100%;
             margin: 0 auto;
-        }}
-        .calendar-header {{
+        }
+        .calendar-header {
             text-align: center;
             font-size: 1.4em;
             font-weight: 600;
             padding: 15px 0;
             color: #333;
-        }}
-        .calendar-table {{
+        }
+        .calendar-table {
             width: 100%;
             border-collapse: separate;
             border-spacing: 0;
             table-layout: fixed;
-        }}
-        .calendar-table th {{
+        }
+        .calendar-table th {
             padding: 10px 5px;
             text-align: center;
             font-weight: 600;
             color: #666;
             font-size: 0.85em;
             border-bottom: 2px solid #e0e0e0;
-        }}
-        .calendar-table td {{
+        }
+        .calendar-table td {
             padding: 8px 4px;
             text-align: center;
             vertical-align: top;
             height: 80px;
             border: 1px solid #e8e8e8;
             position: relative;
-        }}
-        .calendar-table td:hover {{
+        }
+        .calendar-table td:hover {
             background-color: #f5f5f5;
-        }}
-        .day-number {{
+        }
+        .day-number {
             font-weight: 500;
             font-size: 0.95em;
             margin-bottom: 4px;
             color: #333;
-        }}
-        .day-number.today {{
+        }
+        .day-number.today {
             background-color: #4a90d9;
             color: white;
             border-radius: 50%;
@@ -1548,18 +1925,18 @@ def generate_calendar_html(year: int, month: int, events: list) -> str:
             height: 28px;
             line-height: 28px;
             display: inline-block;
-        }}
-        .day-number.weekend {{
+        }
+        .day-number.weekend {
             color: #999;
-        }}
-        .empty-day {{
+        }
+        .empty-day {
             background-color: #fafafa;
-        }}
-        .events-container {{
+        }
+        .events-container {
             max-height: 50px;
             overflow: hidden;
-        }}
-        .event-item {{
+        }
+        .event-item {
             font-size: 0.7em;
             background-color: #5865F2;
             color: white;
@@ -1571,35 +1948,193 @@ def generate_calendar_html(year: int, month: int, events: list) -> str:
             text-overflow: ellipsis;
             cursor: help;
             display: block;
-        }}
-        .event-item:hover {{
+        }
+        .event-item:hover {
             background-color: #4752c4;
-        }}
-        .event-count {{
+        }
+        .event-count {
             font-size: 0.7em;
             color: #5865F2;
             font-weight: 600;
-        }}
+        }
     </style>
-    <div class="calendar-container">
-        <div class="calendar-header">{month_names[month]} {year}</div>
+'''
+
+# HTML-Escaping in einem Durchlauf (auch für title-Attribute: Zeilenumbruch -> &#10;)
+_ATTR_ESCAPE = str.maketrans({
+    '&': '&amp;',
+    '<': '&lt;',
+    '>': '&gt;',
+    '"': '&quot;',
+    "'": '&#x27;',
+    '\n': '&#10;',
+})
+
+# HTML-Vorlagen für Tageszellen und Event-Einträge
+_DAY_CELL_TMPL = '<td><div class="day-number {cls}">{day}</div>{events_html}</td>'
+_EVENTS_CONTAINER_TMPL = '<div class="events-container">{events_html}</div>'
+_EVENT_ITEM_TMPL = '<div class="event-item" title="{e.tooltip_html}">{e.time_str} {e.name_short_html}</div>'
+_EVENT_COUNT_TMPL = '<div class="event-count">+{count} mehr</div>'
+
+# Deutsche Monatsnamen
+_MONTH_NAMES = ('', 'Januar', 'Februar', 'März', 'April', 'Mai', 'Juni',
+                'Juli', 'August', 'September', 'Oktober', 'November', 'Dezember')
+
+# Deutsche Wochentage (Montag = erster Tag)
+_WEEKDAYS = ('Mo', 'Di', 'Mi', 'Do', 'Fr', 'Sa', 'So')
+
+# Wochentag-Header, ändert sich nie
+_WEEKDAY_HEADER_HTML = ''.join(
+    f'<th class="weekend">{day}</th>' if i >= 5 else f'<th>{day}</th>'
+    for i, day in enumerate(_WEEKDAYS)
+) + '</tr></thead><tbody>'
+
+
+def _month_window(year: int, month: int) -> tuple[str, str, str]:
+    """ISO-Prefixe ("YYYY-MM") für Vormonat, Monat und Folgemonat"""
+    prev_year, prev_month = (year - 1, 12) if month == 1 else (year, month - 1)
+    next_year, next_month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return (
+        f"{prev_year:04d}-{prev_month:02d}",
+        f"{year:04d}-{month:02d}",
+        f"{next_year:04d}-{next_month:02d}",
+    )
+
+
+@dataclass(slots=True, frozen=True)
+class CachedEvent:
+    """Aufbereitetes Event für den Kalender (einmal pro Cache-Update erzeugt)"""
+    name: str
+    start_time: str | None
+    end_time: str | None
+    berlin_time: datetime
+    description: str
+    location: str
+    duration: str
+    creator_id: str | None
+    time_str: str  # HH:MM
+    name_short_html: str  # Gekürzter, escapter Name
+    tooltip_html: str  # Escapter Text für das title-Attribut
+
+    @classmethod
+    def create(cls, name: str | None, berlin_time: datetime, start_time: str | None = None,
+               end_time: str | None = None, description: str | None = '', location: str | None = '',
+               duration: str = '', creator_id: str | None = None) -> "CachedEvent":
+        """Erzeugt das Event inkl. fertig escapter Anzeige-Texte"""
+        name = name or 'Event'
+        description = description or ''
+        location = location or ''
+        time_str = berlin_time.strftime('%H:%M')
+
+        # Tooltip-Text erstellen
+        tooltip_lines = [name, "─" * 20, f"Uhrzeit: {time_str} Uhr"]
+
+        if duration:
+            tooltip_lines.append(f"Dauer: {duration}")
+
+        if location:
+            tooltip_lines.append(f"Ort: {location}")
+
+        if description:
+            tooltip_lines.append("─" * 20)
+            desc = description[:300]
+            if len(description) > 300:
+                desc += "..."
+            tooltip_lines.append(desc)
+
+        return cls(
+            name=name,
+            start_time=start_time,
+            end_time=end_time,
+            berlin_time=berlin_time,
+            description=description,
+            location=location,
+            duration=duration,
+            creator_id=creator_id,
+            time_str=time_str,
+            name_short_html=(name[:12] + ('...' if len(name) > 12 else '')).translate(_ATTR_ESCAPE),
+            tooltip_html="\n".join(tooltip_lines).translate(_ATTR_ESCAPE),
+        )
+
+
+def generate_calendar_html(year: int, month: int, events: list, today: datetime = None) -> str:
+    """
+    Generiert HTML für einen Monatskalender mit markierten Events
+
+    Args:
+        year: Jahr
+        month: Monat (1-12)
+        events: Liste von Events mit 'start_time' und 'name'
+                (oder CachedEvent-Objekte aus dem EventCache)
+        today: Aktuelles Datum (Berliner Zeit) für die Heute-Markierung, optional
+
+    Returns:
+        HTML-String für den Kalender
+    """
+    # Events nach Tag gruppieren
+    events_by_day = defaultdict(list)
+    month_window = _month_window(year, month)
+    for event in events:
+        # Events aus dem EventCache bringen Berliner Zeit und Anzeige-Texte bereits mit
+        if isinstance(event, CachedEvent):
+            berlin_time = event.berlin_time
+            if berlin_time.year == year and berlin_time.month == month:
+                events_by_day[berlin_time.day].append(event)
+            continue
+
+        start_time_str = event.get('start_time') or event.get('scheduled_start_time')
+        if start_time_str:
+            try:
+                # Parse ISO format
+                if isinstance(start_time_str, str):
+                    # String-Vorfilter: nur Events im Monat (+/- 1 wegen UTC/Berlin
+                    # am Monatsrand) überhaupt parsen
+                    if start_time_str[:7] not in month_window:
+                        continue
+                    berlin_time = _parse_iso(start_time_str).astimezone(BERLIN_TZ)
+                else:
+                    berlin_time = start_time_str
+
+                # Nur Events im angezeigten Monat
+                if berlin_time.year == year and berlin_time.month == month:
+                    events_by_day[berlin_time.day].append(CachedEvent.create(
+                        event.get('name'),
+                        berlin_time,
+                        duration=event.get('duration', ''),
+                        location=event.get('location', ''),
+                        description=event.get('description', '')
+                    ))
+            except Exception as e:
+                logger.warning(f"Fehler beim Parsen von Event-Zeit: {e}")
+
+    # Kalender-Daten generieren
+    cal = calendar.Calendar(firstweekday=0)  # Montag = 0
+    month_days = cal.monthdayscalendar(year, month)
+
+    # Heute markieren
+    if today is None:
+        today = datetime.now(BERLIN_TZ)
+    is_current_month = (today.year == year and today.month == month)
+    today_day = today.day if is_current_month else -1
+
+    # Styles, Monats-Titel und Wochentag-Header
+    out = [
+        _CALENDAR_CSS,
+        f'''    <div class="calendar-container">
+        <div class="calendar-header">{_MONTH_NAMES[month]} {year}</div>
         <table class="calendar-table">
             <thead>
                 <tr>
-    '''
-
-    # Wochentag-Header
-    for i, day in enumerate(weekdays):
-        weekend_class = ' class="weekend"' if i >= 5 else ''
-        html += f'<th{weekend_class}>{day}</th>'
-    html += '</tr></thead><tbody>'
+    ''',
+        _WEEKDAY_HEADER_HTML,
+    ]
 
     # Wochen generieren
     for week in month_days:
-        html += '<tr>'
+        out.append('<tr>')
         for i, day in enumerate(week):
             if day == 0:
-                html += '<td class="empty-day"></td>'
+                out.append('<td class="empty-day"></td>')
             else:
                 # Klassen bestimmen
                 day_classes = []
@@ -1610,56 +2145,21 @@ def generate_calendar_html(year: int, month: int, events: list) -> str:
 
                 day_class = ' '.join(day_classes)
 
-                html += '<td>'
-                html += f'<div class="day-number {day_class}">{day}</div>'
-
                 # Events für diesen Tag
-                if day in events_by_day:
-                    day_events = events_by_day[day]
-                    html += '<div class="events-container">'
-
+                events_html = ''
+                day_events = events_by_day.get(day)
+                if day_events:
                     # Zeige max 2 Events, dann "+X mehr"
-                    for idx, evt in enumerate(day_events[:2]):
-                        # Event-Name escapen
-                        name_escaped = evt["name"].replace('<', '&lt;').replace('>', '&gt;').replace('"', '&quot;')
-                        name_short = evt["name"][:12] + ('...' if len(evt["name"]) > 12 else '')
-                        name_short = name_short.replace('<', '&lt;').replace('>', '&gt;')
-
-                        # Tooltip-Text erstellen (für title-Attribut)
-                        tooltip_lines = []
-                        tooltip_lines.append(evt["name"])
-                        tooltip_lines.append("─" * 20)
-                        tooltip_lines.append(f"Uhrzeit: {evt['time']} Uhr")
-
-                        if evt.get('duration'):
-                            tooltip_lines.append(f"Dauer: {evt['duration']}")
-
-                        if evt.get('location'):
-                            tooltip_lines.append(f"Ort: {evt['location']}")
-
-                        if evt.get('description'):
-                            tooltip_lines.append("─" * 20)
-                            desc = evt["description"][:300]
-                            if len(evt["description"]) > 300:
-                                desc += "..."
-                            tooltip_lines.append(desc)
-
-                        # Title-Attribut escapen
-                        tooltip_text = "\n".join(tooltip_lines)
-                        tooltip_text = tooltip_text.replace('"', '&quot;')
-
-                        html += f'<div class="event-item" title="{tooltip_text}">{evt["time"]} {name_short}</div>'
-
+                    events_html = ''.join(_EVENT_ITEM_TMPL.format(e=evt) for evt in day_events[:2])
                     if len(day_events) > 2:
-                        html += f'<div class="event-count">+{len(day_events) - 2} mehr</div>'
-
-                    html += '</div>'
+                        events_html += _EVENT_COUNT_TMPL.format(count=len(day_events) - 2)
+                    events_html = _EVENTS_CONTAINER_TMPL.format(events_html=events_html)
 
-                html += '</td>'
-        html += '</tr>'
+                out.append(_DAY_CELL_TMPL.format(cls=day_class, day=day, events_html=events_html))
+        out.append('</tr>')
 
-    html += '</tbody></table></div>'
-    return html
+    out.append('</tbody></table></div>')
+    return ''.join(out)
 
 
 # === EVENT CACHE ===
@@ -1670,8 +2170,11 @@ class EventCache:
 
     def __init__(self):
         self.events = []  # Alle Events
+        self.by_month = {}  # (Jahr, Monat) -> Liste von CachedEvent (Berliner Zeit)
         self.last_fetch = None  # Zeitpunkt des letzten API-Calls
         self.cache_duration = 300  # Cache gilt 5 Minuten (in Sekunden)
+        # (Jahr, Monat, Heute) -> Kalender-HTML, ein Jahr vor und zurück
+        self._render_cache = RenderCache(maxsize=24)
 
     def is_valid(self) -> bool:
         """Prüft ob Cache noch gültig ist"""
@@ -1681,23 +2184,34 @@ class EventCache:
         return elapsed < self.cache_duration
 
     def get_events_for_month(self, year: int, month: int) -> list:
-        """Filtert gecachte Events für einen bestimmten Monat"""
-        berlin_tz = pytz.timezone('Europe/Berlin')
-        filtered = []
+        """Gecachte Events für einen bestimmten Monat (vorindiziert in update())"""
+        return self.by_month.get((year, month), [])
+
+    def get_html(self, key: tuple) -> str | None:
+        """Bereits gerendertes Kalender-HTML (gültig bis zum nächsten update())"""
+        return self._render_cache.get(key)
 
-        for event in self.events:
+    def store_html(self, key: tuple, html_str: str):
+        """Speichert gerendertes Kalender-HTML (LRU, max. 24 Einträge)"""
+        self._render_cache.store(key, html_str)
+
+    @staticmethod
+    def _index_by_month(events: list) -> dict:
+        """Parst alle Events einmal und gruppiert sie nach (Jahr, Monat) in Berliner Zeit"""
+        by_month = defaultdict(list)
+
+        for event in events:
             start_time_str = event.get('scheduled_start_time')
             end_time_str = event.get('scheduled_end_time')
             if start_time_str:
                 try:
-                    utc_time = datetime.fromisoformat(start_time_str.replace('Z', '+00:00'))
-                    berlin_time = utc_time.astimezone(berlin_tz)
+                    utc_time = _parse_iso(start_time_str)
+                    berlin_time = utc_time.astimezone(BERLIN_TZ)
 
                     # Dauer berechnen
                     duration_str = ""
                     if end_time_str:
-                        end_utc = datetime.fromisoformat(end_time_str.replace('Z', '+00:00'))
-                        end_berlin = end_utc.astimezone(berlin_tz)
+                        end_utc = _parse_iso(end_time_str)
                         duration_minutes = int((end_utc - utc_time).total_seconds() / 60)
                         if duration_minutes >= 60:
                             hours = duration_minutes // 60
@@ -1706,24 +2220,27 @@ class EventCache:
                         else:
                             duration_str = f"{duration_minutes}min"
 
-                    if berlin_time.year == year and berlin_time.month == month:
-                        filtered.append({
-                            'name': event.get('name'),
-                            'start_time': start_time_str,
-                            'end_time': end_time_str,
-                            'description': event.get('description', ''),
-                            'location': (event.get('entity_metadata') or {}).get('location', ''),
-                            'duration': duration_str,
-                            'creator_id': event.get('creator_id')
-                        })
+                    # Anzeige-Texte einmal pro Cache-Update statt pro Render escapen
+                    by_month[(berlin_time.year, berlin_time.month)].append(CachedEvent.create(
+                        event.get('name'),
+                        berlin_time,
+                        start_time=start_time_str,
+                        end_time=end_time_str,
+                        description=event.get('description', ''),
+                        location=(event.get('entity_metadata') or {}).get('location', ''),
+                        duration=duration_str,
+                        creator_id=event.get('creator_id')
+                    ))
                 except Exception:
                     pass
 
-        return filtered
+        return by_month
 
     def update(self, events: list):
         """Aktualisiert den Cache"""
         self.events = events
+        self.by_month = self._index_by_month(events)
+        self._render_cache.clear()
         self.last_fetch = datetime.now()
         logger.info(f"Event-Cache aktualisiert: {len(events)} Events")
 
@@ -1737,23 +2254,21 @@ async def fetch_all_events_direct(guild_id: str, token: str) -> list:
     Holt ALLE Events direkt von der Discord API - einmalig für Cache.
     Discord gibt alle scheduled events zurück (keine Paginierung nötig).
     """
-    import aiohttp
-
     url = f"https://discord.com/api/v10/guilds/{guild_id}/scheduled-events"
     headers = {
         'Authorization': f'Bot {token}',
         'Content-Type': 'application/json'
     }
 
-    async with aiohttp.ClientSession() as session:
-        async with session.get(url, headers=headers) as response:
-            if response.status == 200:
-                events = await response.json()
-                logger.info(f"Discord API: {len(events)} Events geladen")
-                return events
-            else:
-                logger.error(f"Discord API Fehler: {response.status}")
-                return []
+    session = await _get_session()
+    async with session.get(url, headers=headers) as response:
+        if response.status == 200:
+            events = _json_loads(await response.read())
+            logger.info(f"Discord API: {len(events)} Events geladen")
+            return events
+        else:
+            logger.error(f"Discord API Fehler: {response.status}")
+            return []
 
 
 async def _fetch_events_via_mcp() -> list:
@@ -1784,7 +2299,18 @@ async def _fetch_events_via_mcp() -> list:
         return []
 
 
-def load_calendar_sync(year: int, month: int) -> str:
+def _fetch_events():
+    """Coroutine zum Laden aller Events passend zum MCP-Modus"""
+    if bot.config.mcp_mode == "remote":
+        # Remote: Events ueber MCP holen
+        return _fetch_events_via_mcp()
+    return fetch_all_events_direct(
+        bot.config.discord_guild_id,
+        bot.config.discord_token
+    )
+
+
+def load_calendar_sync(year: int, month: int, today: datetime = None) -> str:
     """Lädt Events aus Cache und generiert Kalender-HTML"""
     if not bot.is_initialized or not bot.config:
         return "<p style='color: red;'>Bot nicht initialisiert. Bitte warten...</p>"
@@ -1793,23 +2319,25 @@ def load_calendar_sync(year: int, month: int) -> str:
         # Cache prüfen und ggf. aktualisieren
         if not event_cache.is_valid():
             logger.info("Event-Cache abgelaufen, lade neu...")
-            if bot.config.mcp_mode == "remote":
-                # Remote: Events ueber MCP holen
-                all_events = bot._run_async(_fetch_events_via_mcp())
-            else:
-                all_events = bot._run_async(fetch_all_events_direct(
-                    bot.config.discord_guild_id,
-                    bot.config.discord_token
-                ))
-            event_cache.update(all_events)
+            event_cache.update(bot._run_async(_fetch_events()))
         else:
             logger.info("Nutze Event-Cache")
 
+        # Gerendertes HTML wiederverwenden (Heute-Markierung ist Teil des Keys)
+        if today is None:
+            today = datetime.now(BERLIN_TZ)
+        render_key = (year, month, today.date())
+        calendar_html = event_cache.get_html(render_key)
+        if calendar_html is not None:
+            return calendar_html
+
         # Events für den Monat aus Cache holen
         filtered_events = event_cache.get_events_for_month(year, month)
         logger.info(f"Kalender: {len(filtered_events)} Events für {month}/{year}")
 
-        return generate_calendar_html(year, month, filtered_events)
+        calendar_html = generate_calendar_html(year, month, filtered_events, today)
+        event_cache.store_html(render_key, calendar_html)
+        return calendar_html
 
     except Exception as e:
         logger.error(f"Fehler beim Laden des Kalenders: {e}", exc_info=True)
@@ -1822,8 +2350,23 @@ def refresh_calendar_with_reload(year: int, month: int) -> str:
     return load_calendar_sync(year, month)
 
 
-def navigate_calendar(year: int, month: int, direction: str) -> tuple:
+async def load_calendar(year: int, month: int, today: datetime = None) -> str:
+    """Async-Variante von load_calendar_sync: Events werden ohne blockierten Thread nachgeladen"""
+    if bot.is_initialized and bot.config and not event_cache.is_valid():
+        try:
+            logger.info("Event-Cache abgelaufen, lade neu...")
+            event_cache.update(await bot._arun(_fetch_events()))
+        except Exception as e:
+            logger.error(f"Fehler beim Laden des Kalenders: {e}", exc_info=True)
+            return f"<p style='color: red;'>Fehler beim Laden: {str(e)}</p>"
+    # Cache ist jetzt gültig, Rendern bleibt reine CPU-Arbeit
+    return load_calendar_sync(year, month, today)
+
+
+async def navigate_calendar(year: int, month: int, direction: str) -> tuple:
     """Navigiert im Kalender (vor/zurück)"""
+    today = datetime.now(BERLIN_TZ)
+
     if direction == "prev":
         if month == 1:
             month = 12
@@ -1837,14 +2380,80 @@ def navigate_calendar(year: int, month: int, direction: str) -> tuple:
         else:
             month += 1
     elif direction == "today":
-        today = datetime.now(pytz.timezone('Europe/Berlin'))
         year = today.year
         month = today.month
 
-    calendar_html = load_calendar_sync(year, month)
+    calendar_html = await load_calendar(year, month, today)
     return year, month, calendar_html
 
 
+# Inhalt des Tutorial-Tabs (statisch, als ein Markdown-Block statt vieler Einzelkomponenten)
+TUTORIAL_MARKDOWN = """
+### Anleitung
+
+Diese App ermoeglicht die sprachbasierte Interaktion mit Discord ueber einen MCP Server.
+
+---
+
+### Verfuegbare Befehle
+
+#### Nachrichten
+
+| Funktion | Beispiel |
+|----------|----------|
+| Nachricht senden | "Sende Nachricht Hallo in allgemein" |
+| Nachrichten anzeigen | "Zeige letzte Nachrichten in general" |
+| Nachrichten anzeigen (mit Limit) | "Zeige 20 Nachrichten aus allgemein" |
+| Nachricht loeschen (nach Inhalt) | "Loesche Nachricht mit Inhalt Test in allgemein" |
+| Letzte Nachricht loeschen | "Loesche die letzte Nachricht in allgemein" |
+| Channel zusammenfassen | "Worum geht es im Channel allgemein?" oder "Fasse Channel zusammen" |
+| Channel zusammenfassen (mit Limit) | "Fasse die letzten 50 Nachrichten in general zusammen" |
+
+#### Events
+
+| Funktion | Beispiel |
+|----------|----------|
+| Event erstellen | "Erstelle Event Meeting morgen um 15 Uhr" |
+| Event erstellen (mit Dauer) | "Erstelle Event Schulung am 10.12 um 14 Uhr fuer 3 Stunden" |
+| Events anzeigen (Zeitraum) | "Welche Events sind diese Woche?" |
+| Events anzeigen (Tage) | "Zeige Events der naechsten 14 Tage" |
+| Events an bestimmtem Tag | "Welche Events sind am 15. Dezember?" |
+| Events morgen | "Welche Events sind morgen?" |
+| Event loeschen | "Loesche Event Meeting" |
+
+#### Server und Mitglieder
+
+| Funktion | Beispiel |
+|----------|----------|
+| Server-Info | "Zeige Server-Informationen" |
+| Channels auflisten | "Welche Channels gibt es?" |
+| Nur Text-Channels | "Liste alle Text-Channels auf" |
+| Nur Voice-Channels | "Welche Voice-Channels gibt es?" |
+| Online-Anzahl | "Wie viele User sind online?" |
+| Online-Mitglieder | "Wer ist aktuell online?" |
+
+---
+
+### Tabs
+
+| Tab | Beschreibung |
+|-----|--------------|
+| Chat | Sprach- oder Texteingabe fuer Discord-Befehle |
+| Kalender | Monatsuebersicht aller Discord-Events |
+| Einstellungen | LLM-Provider und API-Keys konfigurieren |
+| Tutorial | Diese Anleitung |
+
+---
+
+### Technische Hinweise
+
+- Die App nutzt das Model Context Protocol (MCP) zur Discord-Kommunikation
+- Unterstuetzte LLM-Provider: OpenAI, Groq, Google Gemini, Ollama (lokal)
+- Speech-to-Text: Groq Whisper API oder Faster Whisper (lokal)
+- Bot-Token und Guild-ID muessen in der .env Datei konfiguriert sein
+"""
+
+
 # Gradio Interface erstellen
 def create_interface():
     """Erstellt Gradio Web-Interface"""
@@ -1853,15 +2462,18 @@ def create_interface():
     theme = gr.themes.Base()
 
     # Aktuelles Datum für Kalender-Initialisierung
-    today = datetime.now(pytz.timezone('Europe/Berlin'))
+    today = datetime.now(BERLIN_TZ)
     initial_year = today.year
     initial_month = today.month
 
+    # Modell-Liste für das Dropdown einmal aufbauen
+    validated_models = get_validated_models()
+
     with gr.Blocks(title="Discord Voice Bot", theme=theme) as demo:
         gr.Markdown("# Discord Voice Bot")
 
         # Session State für geräte-spezifischen Chat-Verlauf
-        chat_state = gr.State([])
+        chat_state = gr.State(deque(maxlen=CHAT_HISTORY_LIMIT))
 
         # State für Kalender-Navigation
         calendar_year = gr.State(initial_year)
@@ -1898,8 +2510,8 @@ def create_interface():
                         # LLM-Modell Auswahl
                         gr.Markdown("### LLM Modell")
                         llm_dropdown = gr.Dropdown(
-                            choices=get_validated_models(),
-                            value=get_validated_models()[0] if get_validated_models() else None,
+                            choices=validated_models,
+                            value=validated_models[0] if validated_models else None,
                             label="Aktives Modell",
                             interactive=True
                         )
@@ -2066,9 +2678,9 @@ def create_interface():
 
                 # Ollama Modellauswahl
                 ollama_models_group = gr.CheckboxGroup(
-                    choices=[f"{m} [lokal/free]" for m in _ollama_models] if _ollama_models else [],
+                    choices=[(f"{m} [lokal/free]", m) for m in _ollama_models],
                     label="Modelle für Dropdown auswählen",
-                    value=[f"{m} [lokal/free]" for m in _ollama_models[:3]] if _ollama_models else [],  # Erste 3 vorausgewählt
+                    value=_ollama_models[:3],  # Erste 3 vorausgewählt
                     visible=_ollama_available and len(_ollama_models) > 0
                 )
 
@@ -2104,69 +2716,7 @@ def create_interface():
 
             # === TAB 4: TUTORIAL ===
             with gr.TabItem("Tutorial"):
-                gr.Markdown("### Anleitung")
-                gr.Markdown("Diese App ermoeglicht die sprachbasierte Interaktion mit Discord ueber einen MCP Server.")
-
-                gr.Markdown("---")
-                gr.Markdown("### Verfuegbare Befehle")
-
-                gr.Markdown("#### Nachrichten")
-                gr.Markdown("""
-| Funktion | Beispiel |
-|----------|----------|
-| Nachricht senden | "Sende Nachricht Hallo in allgemein" |
-| Nachrichten anzeigen | "Zeige letzte Nachrichten in general" |
-| Nachrichten anzeigen (mit Limit) | "Zeige 20 Nachrichten aus allgemein" |
-| Nachricht loeschen (nach Inhalt) | "Loesche Nachricht mit Inhalt Test in allgemein" |
-| Letzte Nachricht loeschen | "Loesche die letzte Nachricht in allgemein" |
-| Channel zusammenfassen | "Worum geht es im Channel allgemein?" oder "Fasse Channel zusammen" |
-| Channel zusammenfassen (mit Limit) | "Fasse die letzten 50 Nachrichten in general zusammen" |
-                """)
-
-                gr.Markdown("#### Events")
-                gr.Markdown("""
-| Funktion | Beispiel |
-|----------|----------|
-| Event erstellen | "Erstelle Event Meeting morgen um 15 Uhr" |
-| Event erstellen (mit Dauer) | "Erstelle Event Schulung am 10.12 um 14 Uhr fuer 3 Stunden" |
-| Events anzeigen (Zeitraum) | "Welche Events sind diese Woche?" |
-| Events anzeigen (Tage) | "Zeige Events der naechsten 14 Tage" |
-| Events an bestimmtem Tag | "Welche Events sind am 15. Dezember?" |
-| Events morgen | "Welche Events sind morgen?" |
-| Event loeschen | "Loesche Event Meeting" |
-                """)
-
-                gr.Markdown("#### Server und Mitglieder")
-                gr.Markdown("""
-| Funktion | Beispiel |
-|----------|----------|
-| Server-Info | "Zeige Server-Informationen" |
-| Channels auflisten | "Welche Channels gibt es?" |
-| Nur Text-Channels | "Liste alle Text-Channels auf" |
-| Nur Voice-Channels | "Welche Voice-Channels gibt es?" |
-| Online-Anzahl | "Wie viele User sind online?" |
-| Online-Mitglieder | "Wer ist aktuell online?" |
-                """)
-
-                gr.Markdown("---")
-                gr.Markdown("### Tabs")
-                gr.Markdown("""
-| Tab | Beschreibung |
-|-----|--------------|
-| Chat | Sprach- oder Texteingabe fuer Discord-Befehle |
-| Kalender | Monatsuebersicht aller Discord-Events |
-| Einstellungen | LLM-Provider und API-Keys konfigurieren |
-| Tutorial | Diese Anleitung |
-                """)
-
-                gr.Markdown("---")
-                gr.Markdown("### Technische Hinweise")
-                gr.Markdown("""
-- Die App nutzt das Model Context Protocol (MCP) zur Discord-Kommunikation
-- Unterstuetzte LLM-Provider: OpenAI, Groq, Google Gemini, Ollama (lokal)
-- Speech-to-Text: Groq Whisper API oder Faster Whisper (lokal)
-- Bot-Token und Guild-ID muessen in der .env Datei konfiguriert sein
-                """)
+                gr.Markdown(TUTORIAL_MARKDOWN)
 
         # === EVENT HANDLERS ===
 
@@ -2178,47 +2728,38 @@ def create_interface():
         )
 
         audio_btn.click(
-            fn=process_audio_sync,
+            fn=process_audio,
             inputs=[audio_input, chat_state],
             outputs=[chatbot, chat_state, status, audio_input]
         )
 
         text_btn.click(
-            fn=process_text_sync,
+            fn=process_text,
             inputs=[text_input, chat_state],
             outputs=[chatbot, chat_state, status, text_input]
         )
 
         text_input.submit(
-            fn=process_text_sync,
+            fn=process_text,
             inputs=[text_input, chat_state],
             outputs=[chatbot, chat_state, status, text_input]
         )
 
-        # Kalender-Events
-        def go_prev(year, month):
-            return navigate_calendar(year, month, "prev")
-
-        def go_next(year, month):
-            return navigate_calendar(year, month, "next")
-
-        def go_today(year, month):
-            return navigate_calendar(year, month, "today")
-
+        # Kalender-Events (async: laufen direkt auf dem Event-Loop, ohne Worker-Thread)
         prev_btn.click(
-            fn=go_prev,
+            fn=partial(navigate_calendar, direction="prev"),
             inputs=[calendar_year, calendar_month],
             outputs=[calendar_year, calendar_month, calendar_html]
         )
 
         next_btn.click(
-            fn=go_next,
+            fn=partial(navigate_calendar, direction="next"),
             inputs=[calendar_year, calendar_month],
             outputs=[calendar_year, calendar_month, calendar_html]
         )
 
         today_btn.click(
-            fn=go_today,
+            fn=partial(navigate_calendar, direction="today"),
             inputs=[calendar_year, calendar_month],
             outputs=[calendar_year, calendar_month, calendar_html]
         )
@@ -2229,18 +2770,14 @@ def create_interface():
             outputs=[calendar_html]
         )
 
-        # Kalender beim Start laden
-        demo.load(
-            fn=load_calendar_sync,
-            inputs=[calendar_year, calendar_month],
-            outputs=[calendar_html]
-        )
-
         # === LLM EINSTELLUNGEN EVENT HANDLERS ===
 
         # LLM Modell wechseln
-        def on_llm_change(model_selection):
-            result = switch_llm_model(model_selection)
+        async def on_llm_change(model_selection):
+            # Dropdown-Refresh auf das bereits aktive Modell: kein erneuter Client-Wechsel
+            if is_active_llm_selection(model_selection):
+                return gr.skip(), gr.skip()
+            result = await asyncio.to_thread(switch_llm_model, model_selection)
             info = get_current_llm_info()
             return result, info
 
@@ -2250,122 +2787,33 @@ def create_interface():
             outputs=[status, llm_status]
         )
 
-        # OpenAI validiren
-        def on_openai_validate(api_key, saved_keys):
-            result = validate_openai_key(api_key)
-            if _validated_providers["openai"]["valid"]:
-                # Modelle mit Preisen für CheckboxGroup
-                choices = get_model_choices_with_prices("openai")
-                # Erste 5 vorauswählen
-                default_selected = choices[:5]
-                # Auswahl speichern
-                _selected_models["openai"] = [extract_model_name(c) for c in default_selected]
-                checkbox_update = gr.update(choices=choices, value=default_selected, visible=True)
-                # API-Key im Browser speichern
-                saved_keys["openai"] = api_key.strip()
-            else:
-                checkbox_update = gr.update(visible=False)
-                saved_keys["openai"] = ""  # Bei Fehler Key entfernen
-            dropdown_update = update_model_dropdown()
-            info = get_current_llm_info()
-            return result, checkbox_update, dropdown_update, info, saved_keys
-
-        openai_validate_btn.click(
-            fn=on_openai_validate,
-            inputs=[openai_key_input, saved_api_keys],
-            outputs=[openai_status, openai_models_group, llm_dropdown, llm_status, saved_api_keys]
-        )
-
-        # OpenAI Modellauswahl ändern
-        def on_openai_models_change(selected):
-            model_names = [extract_model_name(s) for s in selected]
-            update_selected_models("openai", model_names)
-            return update_model_dropdown()
-
-        openai_models_group.change(
-            fn=on_openai_models_change,
-            inputs=[openai_models_group],
-            outputs=[llm_dropdown]
-        )
-
-        # Groq validieren
-        def on_groq_validate(api_key, saved_keys):
-            result = validate_groq_key(api_key)
-            if _validated_providers["groq"]["valid"]:
-                choices = get_model_choices_with_prices("groq")
-                default_selected = choices[:5]
-                _selected_models["groq"] = [extract_model_name(c) for c in default_selected]
-                checkbox_update = gr.update(choices=choices, value=default_selected, visible=True)
-                # API-Key im Browser speichern
-                saved_keys["groq"] = api_key.strip()
-            else:
-                checkbox_update = gr.update(visible=False)
-                saved_keys["groq"] = ""
-            dropdown_update = update_model_dropdown()
-            info = get_current_llm_info()
-            return result, checkbox_update, dropdown_update, info, saved_keys
-
-        groq_validate_btn.click(
-            fn=on_groq_validate,
-            inputs=[groq_key_input, saved_api_keys],
-            outputs=[groq_status, groq_models_group, llm_dropdown, llm_status, saved_api_keys]
-        )
-
-        # Groq Modellauswahl ändern
-        def on_groq_models_change(selected):
-            model_names = [extract_model_name(s) for s in selected]
-            update_selected_models("groq", model_names)
-            return update_model_dropdown()
-
-        groq_models_group.change(
-            fn=on_groq_models_change,
-            inputs=[groq_models_group],
-            outputs=[llm_dropdown]
-        )
-
-        # Gemini validieren
-        def on_gemini_validate(api_key, saved_keys):
-            result = validate_gemini_key(api_key)
-            if _validated_providers["gemini"]["valid"]:
-                choices = get_model_choices_with_prices("gemini")
-                default_selected = choices[:5]
-                _selected_models["gemini"] = [extract_model_name(c) for c in default_selected]
-                checkbox_update = gr.update(choices=choices, value=default_selected, visible=True)
-                # API-Key im Browser speichern
-                saved_keys["gemini"] = api_key.strip()
-            else:
-                checkbox_update = gr.update(visible=False)
-                saved_keys["gemini"] = ""
-            dropdown_update = update_model_dropdown()
-            info = get_current_llm_info()
-            return result, checkbox_update, dropdown_update, info, saved_keys
-
-        gemini_validate_btn.click(
-            fn=on_gemini_validate,
-            inputs=[gemini_key_input, saved_api_keys],
-            outputs=[gemini_status, gemini_models_group, llm_dropdown, llm_status, saved_api_keys]
-        )
-
-        # Gemini Modellauswahl ändern
-        def on_gemini_models_change(selected):
-            model_names = [extract_model_name(s) for s in selected]
-            update_selected_models("gemini", model_names)
-            return update_model_dropdown()
-
-        gemini_models_group.change(
-            fn=on_gemini_models_change,
-            inputs=[gemini_models_group],
-            outputs=[llm_dropdown]
-        )
+        # Cloud-Provider: Key-Eingabe, Validieren-Button, Status, Modellauswahl
+        provider_components = {
+            "openai": (openai_key_input, openai_validate_btn, openai_status, openai_models_group),
+            "groq": (groq_key_input, groq_validate_btn, groq_status, groq_models_group),
+            "gemini": (gemini_key_input, gemini_validate_btn, gemini_status, gemini_models_group),
+        }
+
+        for provider, (key_input, validate_btn, status_box, models_group) in provider_components.items():
+            validate_btn.click(
+                fn=partial(_validate_and_build, provider),
+                inputs=[key_input, saved_api_keys],
+                outputs=[status_box, models_group, llm_dropdown, llm_status, saved_api_keys]
+            )
+            models_group.change(
+                fn=partial(_on_models_change, provider),
+                inputs=[models_group],
+                outputs=[llm_dropdown]
+            )
 
         # Ollama aktualisieren
         def on_ollama_refresh():
             result = refresh_ollama_models()
             status = get_ollama_status()
             if _ollama_available and _ollama_models:
-                choices = [f"{m} [lokal/free]" for m in _ollama_models]
-                default_selected = choices[:3]  # Erste 3 vorauswählen
-                _selected_models["ollama"] = [extract_model_name(c) for c in default_selected]
+                choices = [(f"{m} [lokal/free]", m) for m in _ollama_models]
+                default_selected = _ollama_models[:3]  # Erste 3 vorauswählen
+                _providers["ollama"].selected = list(default_selected)
                 checkbox_update = gr.update(choices=choices, value=default_selected, visible=True)
             else:
                 checkbox_update = gr.update(choices=[], value=[], visible=False)
@@ -2380,20 +2828,15 @@ def create_interface():
         )
 
         # Ollama Modellauswahl ändern
-        def on_ollama_models_change(selected):
-            model_names = [extract_model_name(s) for s in selected]
-            update_selected_models("ollama", model_names)
-            return update_model_dropdown()
-
         ollama_models_group.change(
-            fn=on_ollama_models_change,
+            fn=partial(_on_models_change, "ollama"),
             inputs=[ollama_models_group],
             outputs=[llm_dropdown]
         )
 
         # Preise aktualisieren
-        def on_prices_refresh():
-            fetch_litellm_prices()
+        async def on_prices_refresh():
+            await asyncio.to_thread(fetch_litellm_prices)
             status = get_prices_status()
             dropdown_update = update_model_dropdown()
             return status, dropdown_update
@@ -2405,77 +2848,34 @@ def create_interface():
         )
 
         # === API-Keys aus Browser wiederherstelen ===
-        def on_page_load(saved_keys):
-            """Lädt gespeicherte API-Keys aus dem Browser und validiert sie automatisch"""
-            results = {
-                "openai_key": "",
-                "openai_status": "Nicht validiert",
-                "openai_checkbox": gr.update(visible=False),
-                "groq_key": "",
-                "groq_status": "Nicht validiert",
-                "groq_checkbox": gr.update(visible=False),
-                "gemini_key": "",
-                "gemini_status": "Nicht validiert",
-                "gemini_checkbox": gr.update(visible=False),
-            }
-
-            if not saved_keys:
-                return (
-                    results["openai_key"], results["openai_status"], results["openai_checkbox"],
-                    results["groq_key"], results["groq_status"], results["groq_checkbox"],
-                    results["gemini_key"], results["gemini_status"], results["gemini_checkbox"],
-                    update_model_dropdown(), get_current_llm_info()
-                )
-
-            # OpenAI Key wiederherstellen
-            if saved_keys.get("openai"):
-                results["openai_key"] = saved_keys["openai"]
-                validation_result = validate_openai_key(saved_keys["openai"])
-                results["openai_status"] = validation_result
-                if _validated_providers["openai"]["valid"]:
-                    choices = get_model_choices_with_prices("openai")
-                    default_selected = choices[:5]
-                    _selected_models["openai"] = [extract_model_name(c) for c in default_selected]
-                    results["openai_checkbox"] = gr.update(choices=choices, value=default_selected, visible=True)
-
-            # Groq Key wiederherstellen
-            if saved_keys.get("groq"):
-                results["groq_key"] = saved_keys["groq"]
-                validation_result = validate_groq_key(saved_keys["groq"])
-                results["groq_status"] = validation_result
-                if _validated_providers["groq"]["valid"]:
-                    choices = get_model_choices_with_prices("groq")
-                    default_selected = choices[:5]
-                    _selected_models["groq"] = [extract_model_name(c) for c in default_selected]
-                    results["groq_checkbox"] = gr.update(choices=choices, value=default_selected, visible=True)
-
-            # Gemini Key wiederherstellen
-            if saved_keys.get("gemini"):
-                results["gemini_key"] = saved_keys["gemini"]
-                validation_result = validate_gemini_key(saved_keys["gemini"])
-                results["gemini_status"] = validation_result
-                if _validated_providers["gemini"]["valid"]:
-                    choices = get_model_choices_with_prices("gemini")
-                    default_selected = choices[:5]
-                    _selected_models["gemini"] = [extract_model_name(c) for c in default_selected]
-                    results["gemini_checkbox"] = gr.update(choices=choices, value=default_selected, visible=True)
-
-            return (
-                results["openai_key"], results["openai_status"], results["openai_checkbox"],
-                results["groq_key"], results["groq_status"], results["groq_checkbox"],
-                results["gemini_key"], results["gemini_status"], results["gemini_checkbox"],
-                update_model_dropdown(), get_current_llm_info()
+        async def on_page_load(saved_keys, year, month):
+            """Lädt gespeicherte API-Keys aus dem Browser, validiert sie automatisch
+            und lädt parallel dazu den Kalender"""
+            saved_keys = saved_keys or {}
+
+            # Key-Validierungen und Kalender nebenläufig (Wartezeit = langsamster Teil)
+            statuses, calendar = await asyncio.gather(
+                validate_all_keys(saved_keys),
+                load_calendar(year, month)
             )
 
+            outputs = []
+            for provider in provider_components:
+                api_key = saved_keys.get(provider)
+                if api_key:
+                    outputs += [api_key, statuses[provider], _provider_checkbox_update(provider)]
+                else:
+                    outputs += ["", "Nicht validiert", gr.update(visible=False)]
+            return (*outputs, update_model_dropdown(), get_current_llm_info(), calendar)
+
         demo.load(
             fn=on_page_load,
-            inputs=[saved_api_keys],
+            inputs=[saved_api_keys, calendar_year, calendar_month],
             outputs=[
-                openai_key_input, openai_status, openai_models_group,
-                groq_key_input, groq_status, groq_models_group,
-                gemini_key_input, gemini_status, gemini_models_group,
-                llm_dropdown, llm_status
-            ]
+                component
+                for key_input, _, status_box, models_group in provider_components.values()
+                for component in (key_input, status_box, models_group)
+            ] + [llm_dropdown, llm_status, calendar_html]
         )
 
     return demo
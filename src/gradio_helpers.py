@@ -0,0 +1,87 @@
+"""
+Helfer für die Gradio GUI ohne Import-Seiteneffekte
+(kein Bot-Start, keine Netzwerk-Aufrufe, kein Log-File) - einzeln testbar
+"""
+
+import re
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from threading import Lock
+
+
+@dataclass(slots=True)
+class ProviderState:
+    """Validierungs-Status und Modellauswahl eines LLM-Providers"""
+    valid: bool = False
+    api_key: str | None = None
+    selected: list[str] = field(default_factory=list)  # Liste der ausgewählten Modellnamen
+
+    def mark_valid(self, api_key: str | None):
+        self.valid = True
+        self.api_key = api_key
+
+    def invalidate(self):
+        self.valid = False
+        self.api_key = None
+
+
+_MODEL_TAG_RE = re.compile(r'\s*(?:\((?:empfohlen|aktiv)\)|\[.*?\])')
+
+
+def extract_model_name(choice: str) -> str:
+    """Extrahiert den Modellnamen aus einer Choice mit Preis und Tags"""
+    # "gpt-4o [$2.50/$10] (empfohlen)" -> "gpt-4o"
+    # Normalfall: Tags folgen auf den Preis, Modellnamen enthalten kein " ["
+    name, sep, _ = choice.partition(" [")
+    if sep:
+        return name.strip()
+    return _MODEL_TAG_RE.sub('', choice).strip()
+
+
+def llm_switch_key(model_selection: str, providers: dict[str, ProviderState]) -> tuple[str, str | None]:
+    """Auswahl ohne Tags plus validierter API Key des Providers"""
+    name = extract_model_name(model_selection)
+    state = providers.get(name.split(": ", 1)[0].strip().lower())
+    return name, state.api_key if state is not None else None
+
+
+def startup_llm_key(llm_config: dict, providers: dict[str, ProviderState]) -> tuple[str, str | None] | None:
+    """Schlüssel des beim Start aktiven LLM - gleicher Wert wie nach einem Wechsel"""
+    provider, model = llm_config.get("provider"), llm_config.get("model")
+    if not provider:
+        return None
+    return llm_switch_key(f"{provider}: {model}", providers)
+
+
+class RenderCache:
+    """Thread-sicherer LRU-Cache für gerendertes HTML
+
+    Gradio führt Handler in Worker-Threads aus, daher läuft jeder Zugriff
+    auf das OrderedDict unter einem Lock.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._entries: OrderedDict[tuple, str] = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key: tuple) -> str | None:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def store(self, key: tuple, value: str):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -10,8 +10,9 @@ die Methode `chat_completion()` aufruft.
 """
 
 from .llm_client import LLMClient
+from .semantic_cache import SemanticCache
 
-__all__ = ["LLMClient"]
+__all__ = ["LLMClient", "SemanticCache"]
 
 # Optionaler Import des Adapters
 try:
@@ -3,6 +3,7 @@
 Dieser Adapter ermöglicht die Nutzung von LLMClient als llama-index LLM.
 """
 
+import asyncio
 from typing import Any
 
 from pydantic import Field
@@ -28,6 +29,15 @@ except ImportError:
     CompletionResponse = dict  # type: ignore
     LLMMetadata = dict  # type: ignore
 
+# Standard-Parallelität für achat_batch je Provider (an Rate-Limits angelehnt,
+# Ollama läuft lokal und ist durch die GPU begrenzt)
+DEFAULT_BATCH_CONCURRENCY: dict[str, int] = {
+    "openai": 8,
+    "groq": 4,
+    "gemini": 8,
+    "ollama": 1,
+}
+
 
 class LLMClientAdapter(LLM):
     """Adapter für llama-index zur Nutzung des LLMClient.
@@ -94,13 +104,23 @@ class LLMClientAdapter(LLM):
         if self.client is None:
             raise ValueError("LLMClient instance must be provided")
 
-        # Konvertiere llama_index Nachrichten in dict
-        hf_messages = [{"role": m.role, "content": m.content} for m in messages]
-
         # Nutze LLMClient
-        response = self.client.chat_completion(hf_messages)
+        response = self.client.chat_completion(self._to_client_messages(messages))
+
+        return self._to_chat_response(response)
 
-        return ChatResponse(message=ChatMessage(role="assistant", content=response))
+    @staticmethod
+    def _to_client_messages(messages: list[ChatMessage]) -> list[dict[str, str]]:
+        """Konvertiert llama-index Nachrichten in das dict-Format des LLMClient."""
+        return [{"role": m.role, "content": m.content} for m in messages]
+
+    @staticmethod
+    def _to_chat_response(response: str) -> ChatResponse:
+        """Verpackt die Antwort des LLMClient als llama-index ChatResponse."""
+        # ChatMessage normal bauen (bildet content je nach llama-index Version auf
+        # blocks ab), die Hülle ohne erneute Validierung der bereits geprüften Nachricht
+        message = ChatMessage(role="assistant", content=response)
+        return ChatResponse.model_construct(message=message)
 
     def complete(self, prompt: str, **kwargs: Any) -> CompletionResponse:
         """Führt einen Completion Request aus.
@@ -165,17 +185,65 @@ class LLMClientAdapter(LLM):
         """
         raise NotImplementedError("astream_complete not implemented")
 
-    async def achat(self, *args: Any, **kwargs: Any) -> Any:
-        """Async Chat ist nicht implementiert.
+    async def achat(self, messages: list[ChatMessage], **kwargs: Any) -> ChatResponse:
+        """Async Chat-Completion Request.
+
+        Nutzt LLMClient.achat_completion (Async-Clients der SDKs), damit der
+        Event-Loop (z.B. bei llama-index ``aquery``) nicht blockiert wird und
+        mehrere Anfragen parallel laufen können.
 
         Args:
-            *args: Positionsargumente.
-            **kwargs: Keyword-Argumente.
+            messages: Liste von ChatMessage-Objekten von llama-index.
+            **kwargs: Zusätzliche Keyword-Argumente (werden ignoriert).
+
+        Returns:
+            ChatResponse-Objekt mit der generierten Antwort.
 
         Raises:
-            NotImplementedError: Diese Methode ist nicht implementiert.
+            ValueError: Wenn kein Client gesetzt ist.
+
+        Examples:
+            >>> response = await adapter.achat(messages)
+        """
+        if self.client is None:
+            raise ValueError("LLMClient instance must be provided")
+
+        response = await self.client.achat_completion(self._to_client_messages(messages))
+
+        return self._to_chat_response(response)
+
+    async def achat_batch(
+        self, batch: list[list[ChatMessage]], concurrency: int | None = None
+    ) -> list[ChatResponse]:
+        """Führt mehrere Chat-Requests parallel aus (begrenzt per Semaphore).
+
+        Args:
+            batch: Liste von Nachrichtenlisten, eine pro Request.
+            concurrency: Maximale Anzahl gleichzeitiger Requests. Wenn None,
+                wird der Standardwert des Providers aus DEFAULT_BATCH_CONCURRENCY
+                verwendet.
+
+        Returns:
+            Liste von ChatResponse-Objekten in der Reihenfolge von batch.
+
+        Raises:
+            ValueError: Wenn kein Client gesetzt ist.
+
+        Examples:
+            >>> responses = await adapter.achat_batch([messages_a, messages_b])
         """
-        raise NotImplementedError("achat not implemented")
+        if self.client is None:
+            raise ValueError("LLMClient instance must be provided")
+
+        if concurrency is None:
+            concurrency = DEFAULT_BATCH_CONCURRENCY.get(self.client.api_choice, 4)
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async def _one(messages: list[ChatMessage]) -> ChatResponse:
+            async with semaphore:
+                return await self.achat(messages)
+
+        return list(await asyncio.gather(*(_one(messages) for messages in batch)))
 
     async def acomplete(self, *args: Any, **kwargs: Any) -> Any:
         """Async Completion ist nicht implementiert.
@@ -1,29 +1,334 @@
 """LLM Client Module für universelle LLM-API Zugriffe."""
 
+import asyncio
+import copy
+import hashlib
+import importlib
 import json
 import logging
 import os
-from typing import Any, Literal
+import re
+import sys
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Callable, Iterator, Literal, TypedDict
 
 logger = logging.getLogger(__name__)
 
 from dotenv import load_dotenv
 
-# Optionale Imports – falls nicht installiert, wird das erkannt
-try:
-    from openai import OpenAI
-except ImportError:
-    OpenAI = None  # type: ignore
+from .semantic_cache import SemanticCache
 
+# Optional: orjson für schnelleres JSON (Fallback auf stdlib json)
 try:
-    from groq import Groq
-except ImportError:
-    Groq = None  # type: ignore
+    import orjson
 
-try:
-    import ollama
+    _json_loads = orjson.loads
+
+    def _json_dumps(obj: Any) -> str:
+        return orjson.dumps(obj).decode("utf-8")
+
+    def _json_key_bytes(obj: Any) -> bytes:
+        """Stabile Serialisierung für Cache-Keys (sortierte Keys)."""
+        return orjson.dumps(obj, default=str, option=orjson.OPT_SORT_KEYS)
 except ImportError:
-    ollama = None  # type: ignore
+    _json_loads = json.loads
+
+    def _json_dumps(obj: Any) -> str:
+        return json.dumps(obj, ensure_ascii=False)
+
+    def _json_key_bytes(obj: Any) -> bytes:
+        """Stabile Serialisierung für Cache-Keys (sortierte Keys)."""
+        return json.dumps(obj, sort_keys=True, ensure_ascii=False, default=str).encode("utf-8")
+
+# Optionale Provider-SDKs werden erst bei Bedarf importiert (openai/groq laden
+# beim Import hunderte pydantic-Modelle). Name -> (Modul, Attribut oder None).
+_LAZY_IMPORTS: dict[str, tuple[str, str | None]] = {
+    "OpenAI": ("openai", "OpenAI"),
+    "AsyncOpenAI": ("openai", "AsyncOpenAI"),
+    "Groq": ("groq", "Groq"),
+    "AsyncGroq": ("groq", "AsyncGroq"),
+    "ollama": ("ollama", None),
+}
+
+
+def _import_provider(name: str) -> Any | None:
+    """Importiert ein Provider-SDK bei Bedarf; None, falls nicht installiert.
+
+    Das Ergebnis wird als Modul-Global abgelegt, damit weitere Zugriffe (und
+    ``mock.patch("llm_client.llm_client.OpenAI")``) ohne Import auskommen.
+    """
+    namespace = globals()
+    if name not in namespace:
+        module_name, attr = _LAZY_IMPORTS[name]
+        try:
+            module = importlib.import_module(module_name)
+            namespace[name] = getattr(module, attr) if attr else module
+        except ImportError:
+            namespace[name] = None
+    return namespace[name]
+
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY_IMPORTS:
+        return _import_provider(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+_OPENAI_COMPATIBLE = ("openai", "groq", "gemini")
+_PROVIDER_LABELS = {"openai": "OpenAI", "groq": "Groq", "gemini": "Gemini"}
+_GEMINI_BASE_URL = "https://generativelanguage.googleapis.com/v1beta/openai/"
+
+# OpenAI-Modelle mit max_completion_tokens und ohne temperature (GPT-5, o1, o3)
+_NEW_MODEL_RE = re.compile(r"gpt-5|o1|o3")
+
+# Marker für Cache-Fehltreffer in _cache_get
+_MISSING = object()
+
+
+class ToolFunction(TypedDict):
+    name: str
+    arguments: str  # JSON-String
+
+
+class ToolCall(TypedDict):
+    id: str
+    type: Literal["function"]
+    function: ToolFunction
+
+
+class ChatResult(TypedDict):
+    """Normalisierte Antwort von chat_completion_with_tools (zur Laufzeit ein dict)."""
+
+    role: Literal["assistant"]
+    content: str | None
+    tool_calls: list[ToolCall] | None
+
+
+# Ein Schritt in chat_chain: fester Prompt oder Funktion, die aus der vorherigen
+# Antwort (bzw. "" beim ersten Schritt) den nächsten Prompt baut
+ChainStep = str | Callable[[str], str]
+
+
+def _copy_result(result: Any) -> Any:
+    """Kopie einer gecachten Antwort; ChatResult wird gezielt statt per deepcopy kopiert."""
+    if isinstance(result, str):
+        return result
+    if isinstance(result, dict) and "tool_calls" in result:
+        tool_calls = result["tool_calls"]
+        return {
+            **result,
+            "tool_calls": None
+            if tool_calls is None
+            else [{**tc, "function": {**tc["function"]}} for tc in tool_calls],
+        }
+    return copy.deepcopy(result)
+
+
+@dataclass(frozen=True, slots=True)
+class ApiKeys:
+    """API-Keys der Provider (None, falls nicht gesetzt)."""
+
+    openai: str | None = None
+    groq: str | None = None
+    gemini: str | None = None
+
+    def or_(self, fallback: "ApiKeys") -> "ApiKeys":
+        """Ergänzt fehlende Keys aus fallback."""
+        return ApiKeys(
+            openai=self.openai or fallback.openai,
+            groq=self.groq or fallback.groq,
+            gemini=self.gemini or fallback.gemini,
+        )
+
+
+def _env_api_keys() -> ApiKeys:
+    """Liest die Keys aus os.environ.
+
+    Bewusst ohne prozessweiten Snapshot: LLMVoiceInterface setzt den Key des
+    gewählten Providers zur Laufzeit in os.environ, bevor es den Client erstellt.
+    """
+    environ = os.environ
+    return ApiKeys(
+        openai=environ.get("OPENAI_API_KEY"),
+        groq=environ.get("GROQ_API_KEY"),
+        gemini=environ.get("GEMINI_API_KEY"),
+    )
+
+
+@lru_cache(maxsize=4)
+def _load_secrets(secrets_path: str) -> None:
+    """Lädt eine secrets.env nur einmal pro Prozess.
+
+    Auch das Ergebnis der Existenzprüfung wird gemerkt: weitere Instanzen
+    greifen weder auf das Dateisystem noch auf den dotenv-Parser zu.
+    """
+    if os.path.exists(secrets_path):
+        load_dotenv(secrets_path)
+
+
+def _in_colab() -> bool:
+    return "google.colab" in sys.modules or "COLAB_GPU" in os.environ
+
+
+@lru_cache(maxsize=1)
+def _colab_api_keys() -> ApiKeys:
+    """Liest die Keys einmalig aus Google Colab userdata – jeden Key einzeln und robust."""
+    try:
+        from google.colab import userdata
+    except Exception:
+        return ApiKeys()
+
+    def _get(name: str) -> str | None:
+        try:
+            return userdata.get(name)
+        except Exception:
+            return None
+
+    return ApiKeys(
+        openai=_get("OPENAI_API_KEY"),
+        groq=_get("GROQ_API_KEY"),
+        gemini=_get("GEMINI_API_KEY"),
+    )
+
+
+_KEEP_ALIVE_RE = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*(ms|s|m|h)?\s*$")
+_KEEP_ALIVE_UNITS = {"ms": 0.001, "s": 1, "m": 60, "h": 3600}
+
+
+def _keep_alive_seconds(keep_alive: str | int | float) -> float | None:
+    """Wandelt Ollama-keep_alive ("5m", "30s", 300) in Sekunden um.
+
+    None bei 0, negativen Werten (unbegrenzt) oder unbekanntem Format.
+    """
+    if isinstance(keep_alive, (int, float)):
+        seconds = float(keep_alive)
+    else:
+        match = _KEEP_ALIVE_RE.match(keep_alive)
+        if not match:
+            return None
+        seconds = float(match.group(1)) * _KEEP_ALIVE_UNITS[match.group(2) or "s"]
+    return seconds if seconds > 0 else None
+
+
+def _keep_warm_loop(client_ref: "weakref.ref[LLMClient]", interval: float, stop: threading.Event) -> None:
+    """Lädt das Ollama-Modell periodisch, bis stop gesetzt oder der Client freigegeben ist."""
+    while True:
+        client = client_ref()
+        if client is None:
+            return
+        client.warm_up()
+        del client  # keine starke Referenz während des Wartens halten
+        if stop.wait(interval):
+            return
+
+
+# Rollen, deren aufeinanderfolgende Nachrichten gefahrlos zusammengefasst werden können
+# (tool/assistant nicht: jede Tool-Antwort braucht ihre eigene tool_call_id)
+_MERGEABLE_ROLES = frozenset({"user", "system"})
+
+
+def _is_plain_message(message: dict[str, Any]) -> bool:
+    return message.keys() == {"role", "content"} and isinstance(message["content"], str)
+
+
+def _compact_messages(messages: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Fasst direkt aufeinanderfolgende user/system-Nachrichten zusammen.
+
+    Ein System-Prompt, der direkt auf einen identischen folgt, wird nur
+    einmal gesendet; liegen andere Nachrichten dazwischen, bleibt er erhalten.
+    Nachrichten mit zusätzlichen Feldern (name, tool_call_id, ...) oder
+    nicht-Text-Inhalt bleiben unverändert. Die Eingabe wird nicht verändert; ohne Änderung
+    wird dieselbe Liste zurückgegeben.
+    """
+    compacted: list[dict[str, Any]] = []
+    changed = False
+
+    for message in messages:
+        plain = _is_plain_message(message)
+        role = message.get("role")
+        previous = compacted[-1] if compacted else None
+
+        if plain and role == "system" and previous == message:
+            changed = True
+            continue
+
+        if (
+            plain
+            and role in _MERGEABLE_ROLES
+            and previous is not None
+            and previous["role"] == role
+            and _is_plain_message(previous)
+        ):
+            compacted[-1] = {"role": role, "content": f"{previous['content']}\n\n{message['content']}"}
+            changed = True
+            continue
+
+        compacted.append(message)
+
+    return compacted if changed else messages
+
+
+@dataclass(frozen=True, slots=True)
+class _RequestParams:
+    """Pro Konfiguration einmal berechnete Request-Parameter eines LLMClient."""
+
+    signature: tuple
+    chat: Callable[[list[dict[str, str]]], str]
+    is_new_model: bool
+    openai_base: dict[str, Any]
+    ollama_base: dict[str, Any]
+    ollama_tool_base: dict[str, Any]
+
+
+# Gemeinsame HTTP-Clients je SDK: alle LLMClient-Instanzen teilen sich einen
+# Connection-Pool, TCP/TLS-Verbindungen werden wiederverwendet.
+_HTTP_CLIENTS: dict[str, Any] = {}
+_HTTP_CLIENTS_LOCK = threading.Lock()
+
+
+def _shared_http_client(sdk: str) -> Any | None:
+    """Gibt den gemeinsamen HTTP-Client des SDKs ('openai' oder 'groq') zurück.
+
+    Verwendet den DefaultHttpxClient des SDKs, damit dessen Timeouts und
+    Pool-Limits erhalten bleiben. None, falls das SDK keinen bereitstellt.
+    """
+    with _HTTP_CLIENTS_LOCK:
+        if sdk not in _HTTP_CLIENTS:
+            try:
+                _HTTP_CLIENTS[sdk] = importlib.import_module(sdk).DefaultHttpxClient()
+            except (ImportError, AttributeError):
+                _HTTP_CLIENTS[sdk] = None
+        return _HTTP_CLIENTS[sdk]
+
+
+@lru_cache(maxsize=8)
+def _get_provider_client(
+    factory: Callable[..., Any], sdk: str, api_key: str | None, base_url: str | None = None
+) -> Any:
+    """SDK-Client (OpenAI/Groq) einmal pro Prozess je Factory, API-Key und base_url.
+
+    LLMClient-Instanzen mit gleichem Provider und Key teilen sich so einen
+    Client samt Connection-Pool; die SDK-Clients sind thread-safe.
+    """
+    kwargs: dict[str, Any] = {"api_key": api_key, "http_client": _shared_http_client(sdk)}
+    if base_url:
+        kwargs["base_url"] = base_url
+    return factory(**kwargs)
+
+
+def _log_prompt_cache(response: Any) -> None:
+    """Loggt, wie viele Prompt-Tokens der Provider aus seinem Prefix-Cache bedient hat."""
+    usage = getattr(response, "usage", None)
+    details = getattr(usage, "prompt_tokens_details", None)
+    cached = getattr(details, "cached_tokens", None)
+    if cached:
+        logger.debug(f"Prompt-Cache: {cached} von {usage.prompt_tokens} Prompt-Tokens wiederverwendet")
 
 
 class LLMClient:
@@ -38,6 +343,11 @@ class LLMClient:
         temperature: Sampling-Temperatur für die Generierung.
         max_tokens: Maximale Anzahl zu generierender Tokens.
         keep_alive: Ollama-spezifisch - wie lange Modell im Speicher bleibt.
+        dedup: Gleichzeitige identische chat_completion-Aufrufe zusammenführen
+            (None = automatisch bei temperature 0).
+        cache_size: Größe des LRU-Antwort-Caches (nur bei temperature 0 aktiv).
+        cache_stats: Treffer ("hits") und Fehlschläge ("misses") des Antwort-Caches.
+        semantic_cache: Optionaler SemanticCache für ähnlich formulierte Anfragen.
         client: Instanz des gewählten API-Clients.
         openai_api_key: OpenAI API Key (falls vorhanden).
         groq_api_key: Groq API Key (falls vorhanden).
@@ -60,7 +370,12 @@ class LLMClient:
         max_tokens: int = 512,
         api_choice: Literal["openai", "groq", "gemini", "ollama"] | None = None,
         secrets_path: str = "secrets.env",
-        keep_alive: str = "5m",
+        keep_alive: str | None = None,
+        dedup: bool | None = None,
+        cache_size: int = 128,
+        semantic_threshold: float | None = None,
+        keep_warm: bool = False,
+        prewarm: bool = False,
     ) -> None:
         """Initialisiert den LLM Client.
 
@@ -71,7 +386,25 @@ class LLMClient:
             api_choice: Explizite API-Wahl ('openai', 'groq', 'gemini', 'ollama').
                 Wenn None, wird automatisch gewählt.
             secrets_path: Pfad zur secrets.env-Datei. Standard: "secrets.env".
-            keep_alive: Ollama-Parameter für Modell-Caching. Standard: "5m".
+            keep_alive: Ollama-Parameter für Modell-Caching. None nutzt
+                OLLAMA_KEEP_ALIVE aus der Umgebung, sonst "5m".
+            dedup: Laufende identische Anfragen (gleiche Nachrichten und
+                Parameter) nur einmal an den Provider senden. None aktiviert
+                das nur bei temperature 0 (deterministische Antworten).
+            cache_size: Anzahl gecachter Antworten für identische Anfragen bei
+                temperature 0 (LRU). 0 deaktiviert den Cache. Standard: 128.
+            semantic_threshold: Aktiviert den semantischen Cache: liegt die
+                Ähnlichkeit der letzten User-Nachricht zu einer bereits
+                beantworteten über diesem Wert (0.0 bis 1.0), wird die
+                gecachte Antwort zurückgegeben. None (Standard) deaktiviert ihn.
+            keep_warm: Nur Ollama – Modell sofort im Hintergrund laden und
+                alle keep_alive/2 erneut anstoßen, damit es nicht aus dem
+                Speicher fällt (siehe start_keep_warm). Ein explizit gesetztes
+                keep_alive (Parameter oder OLLAMA_KEEP_ALIVE) hat Vorrang,
+                dann startet kein Heartbeat. Standard: False.
+            prewarm: Verbindung zum Provider direkt nach dem Erstellen im
+                Hintergrund aufbauen (siehe warm_up_in_background), damit die
+                erste Anfrage keinen TCP/TLS-Handshake zahlt. Standard: False.
 
         Raises:
             ValueError: Wenn api_choice einen ungültigen Wert hat.
@@ -80,36 +413,19 @@ class LLMClient:
             >>> client = LLMClient(llm="gpt-4o", temperature=0.5)
             >>> client = LLMClient(api_choice="gemini", llm="gemini-2.5-flash")
         """
-        # 1. Lade secrets.env, falls vorhanden
-        if os.path.exists(secrets_path):
-            load_dotenv(secrets_path)
+        # 1. Lade secrets.env, falls vorhanden (einmal pro Prozess)
+        _load_secrets(secrets_path)
 
-        self.openai_api_key: str | None = os.getenv("OPENAI_API_KEY")
-        self.groq_api_key: str | None = os.getenv("GROQ_API_KEY")
-        self.gemini_api_key: str | None = os.getenv("GEMINI_API_KEY")
+        keys = _env_api_keys()
 
-        # 2. Fallback für Google Colab – Keys einzeln und robust prüfen
-        import sys
-        if ("google.colab" in sys.modules or "COLAB_GPU" in os.environ):
-            try:
-                from google.colab import userdata
-                try:
-                    if not self.openai_api_key:
-                        self.openai_api_key = userdata.get("OPENAI_API_KEY")
-                except Exception:
-                    pass
-                try:
-                    if not self.groq_api_key:
-                        self.groq_api_key = userdata.get("GROQ_API_KEY")
-                except Exception:
-                    pass
-                try:
-                    if not self.gemini_api_key:
-                        self.gemini_api_key = userdata.get("GEMINI_API_KEY")
-                except Exception:
-                    pass
-            except Exception:
-                pass
+        # 2. Fallback für Google Colab (userdata wird nur einmal abgefragt)
+        in_colab = _in_colab()
+        if in_colab:
+            keys = keys.or_(_colab_api_keys())
+
+        self.openai_api_key: str | None = keys.openai
+        self.groq_api_key: str | None = keys.groq
+        self.gemini_api_key: str | None = keys.gemini
 
         # 3. Automatische API-Auswahl
         if api_choice is None:
@@ -120,7 +436,7 @@ class LLMClient:
             elif self.gemini_api_key:
                 self.api_choice = "gemini"
             else:
-                if ("google.colab" in sys.modules or "COLAB_GPU" in os.environ):
+                if in_colab:
                     raise RuntimeError(
                         "Kein API-Key gefunden. Bitte OPENAI_API_KEY, GROQ_API_KEY "
                         "oder GEMINI_API_KEY in Colab-Umgebung setzen."
@@ -150,21 +466,58 @@ class LLMClient:
 
         self.temperature: float = temperature
         self.max_tokens: int = max_tokens
-        self.keep_alive: str = keep_alive
+        # Explizites keep_alive des Nutzers nicht per Heartbeat aushebeln
+        env_keep_alive = os.getenv("OLLAMA_KEEP_ALIVE")
+        keep_alive_explicit = keep_alive is not None or env_keep_alive is not None
+        self.keep_alive: str = keep_alive or env_keep_alive or "5m"
+        self.dedup: bool | None = dedup
+
+        # In-flight Anfragen: Request-Key -> Future der laufenden Anfrage
+        self._inflight: dict[str, Future] = {}
+        self._inflight_lock = threading.Lock()
+
+        # Antwort-Cache (LRU) für deterministische Anfragen: Request-Key -> Antwort
+        self.cache_size: int = cache_size
+        self._cache: OrderedDict[str, Any] = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self.cache_stats: dict[str, int] = {"hits": 0, "misses": 0}
+
+        # Vorberechnete Request-Parameter (siehe _request_params)
+        self._params: _RequestParams | None = None
+
+        # Async-Client (lazy in _get_async_client) und zugehörige (api_choice, Loop)
+        self._async_client: Any | None = None
+        self._async_client_owner: tuple[str, Any] | None = None
+
+        # Semantischer Cache (opt-in) für ähnlich formulierte Anfragen
+        self.semantic_cache: SemanticCache | None = (
+            SemanticCache(threshold=semantic_threshold) if semantic_threshold is not None else None
+        )
 
         # 5. Clients vorbereiten
         self.client: Any | None = None
+        OpenAI = _import_provider("OpenAI") if self.api_choice in ("openai", "gemini") else None
+        Groq = _import_provider("Groq") if self.api_choice == "groq" else None
         if self.api_choice == "openai" and OpenAI:
-            self.client = OpenAI(api_key=self.openai_api_key)
+            self.client = _get_provider_client(OpenAI, "openai", self.openai_api_key)
         elif self.api_choice == "groq" and Groq:
-            self.client = Groq(api_key=self.groq_api_key)
+            self.client = _get_provider_client(Groq, "groq", self.groq_api_key)
         elif self.api_choice == "gemini" and OpenAI:
             # Nutze OpenAI-Kompatibilitätsmodus für Gemini
-            self.client = OpenAI(
-                api_key=self.gemini_api_key,
-                base_url="https://generativelanguage.googleapis.com/v1beta/openai/"
+            self.client = _get_provider_client(
+                OpenAI, "openai", self.gemini_api_key, _GEMINI_BASE_URL
             )
 
+        # 6. Optional: Ollama-Modell dauerhaft geladen halten bzw. Verbindung vorwärmen
+        #    (der keep-warm Heartbeat wärmt bereits beim Start)
+        self._keep_warm_stop: threading.Event | None = None
+        if keep_warm and keep_alive_explicit:
+            logger.info(f"keep_warm ignoriert: explizites keep_alive={self.keep_alive} hat Vorrang")
+            keep_warm = False
+        keep_warm_started = keep_warm and self.start_keep_warm()
+        if prewarm and not keep_warm_started:
+            self.warm_up_in_background()
+
     def chat_completion(self, messages: list[dict[str, str]]) -> str:
         """Führt eine Chat-Completion mit der gewählten API aus.
 
@@ -189,189 +542,694 @@ class LLMClient:
             >>> response = client.chat_completion(messages)
             >>> print(response)
         """
-        if self.api_choice == "openai":
-            if not self.client:
-                raise RuntimeError("OpenAI client not available or not installed.")
-
-            # GPT-5 und o1/o3 Modelle haben andere Parameter-Anforderungen:
-            # - max_completion_tokens statt max_tokens
-            # - temperature wird nicht unterstützt (nur default=1)
-            is_new_model = self.llm.startswith(('gpt-5', 'o1', 'o3'))
-
-            if is_new_model:
-                # GPT-5/o1/o3: Kein temperature, max_completion_tokens statt max_tokens
-                response = self.client.chat.completions.create(
-                    model=self.llm,
-                    messages=messages,
-                    max_completion_tokens=self.max_tokens,
-                )
-            else:
-                # GPT-4/3.5: Alte Parameter
-                response = self.client.chat.completions.create(
-                    model=self.llm,
-                    messages=messages,
-                    temperature=self.temperature,
-                    max_tokens=self.max_tokens,
-                )
-            return response.choices[0].message.content
+        semantic = self._semantic_scope(messages)
+        if semantic:
+            cached = self.semantic_cache.lookup(*semantic)
+            if cached is not None:
+                return cached
 
-        elif self.api_choice == "groq":
-            if not self.client:
-                raise RuntimeError("Groq client not available or not installed.")
-            response = self.client.chat.completions.create(
-                model=self.llm,
-                messages=messages,
-                temperature=self.temperature,
-                max_tokens=self.max_tokens,
-            )
-            return response.choices[0].message.content
+        result = self._cached_call(self._chat_completion, messages)
+        if semantic and result:
+            self.semantic_cache.add(*semantic, result)
+        return result
 
-        elif self.api_choice == "gemini":
-            if not self.client:
-                raise RuntimeError("Gemini client not available or not installed.")
-            response = self.client.chat.completions.create(
-                model=self.llm,
-                messages=messages,
-                temperature=self.temperature,
-                max_tokens=self.max_tokens,
-            )
+    def _semantic_scope(self, messages: list[dict[str, Any]]) -> tuple[str, str] | None:
+        """(Scope, Text) für den semantischen Cache oder None, falls nicht anwendbar.
 
-            # Debug: Prüfe was zurückkommt
-            if not response or not response.choices:
-                import logging
-                logger = logging.getLogger(__name__)
-                logger.error(f"Gemini gab leere Response zurück. Response: {response}")
-                return None
+        Verglichen wird nur die letzte User-Nachricht; Verlauf und Parameter
+        bilden den Scope, damit Antworten nicht zwischen Gesprächen wandern.
+        """
+        if self.semantic_cache is None or not messages:
+            return None
+        last = messages[-1]
+        content = last.get("content")
+        if last.get("role") != "user" or not isinstance(content, str):
+            return None
+        return self._request_key(messages[:-1]), content
 
-            content = response.choices[0].message.content
-            if not content:
-                import logging
-                logger = logging.getLogger(__name__)
-                logger.error(f"Gemini message.content ist None. Response: {response}")
-                logger.error(f"Choices: {response.choices}")
-                logger.error(f"Message: {response.choices[0].message}")
+    def _cached_call(self, func, messages: list[dict[str, Any]], key_extra: Any = None, **kwargs: Any) -> Any:
+        """Führt func über Antwort-Cache und In-flight Deduplizierung aus.
 
-            return content
+        key_extra fließt zusätzlich in den Request-Key ein (z.B. Tools und tool_choice).
+        """
+        use_cache = self._cache_enabled()
+        dedup = self.dedup if self.dedup is not None else self.temperature == 0
+        if not use_cache and not dedup:
+            return func(messages, **kwargs)
+
+        key = self._request_key(messages, key_extra)
+        if use_cache and (hit := self._cache_get(key)) is not _MISSING:
+            return hit
+
+        if dedup:
+            result = self._run_deduplicated(key, func, messages, **kwargs)
+        else:
+            result = func(messages, **kwargs)
+
+        if use_cache:
+            self._cache_put(key, result)
+        return result
+
+    def _cache_enabled(self) -> bool:
+        return self.cache_size > 0 and self.temperature == 0
+
+    def _cache_get(self, key: str) -> Any:
+        """Gecachte Antwort (als Kopie) oder _MISSING."""
+        with self._cache_lock:
+            if key not in self._cache:
+                self.cache_stats["misses"] += 1
+                return _MISSING
+            self.cache_stats["hits"] += 1
+            self._cache.move_to_end(key)
+            return _copy_result(self._cache[key])
+
+    def _cache_put(self, key: str, result: Any) -> None:
+        """Speichert eine Antwort im LRU-Cache (None wird nicht gecacht)."""
+        if result is None:
+            return
+        with self._cache_lock:
+            self._cache[key] = _copy_result(result)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
 
+    def _run_deduplicated(self, key: str, func, messages: list[dict[str, Any]], **kwargs: Any) -> Any:
+        """Führt func aus; gleichzeitige Aufrufe mit gleichem Key warten auf dasselbe Ergebnis."""
+        with self._inflight_lock:
+            future = self._inflight.get(key)
+            is_owner = future is None
+            if is_owner:
+                future = Future()
+                self._inflight[key] = future
+
+        # Identische Anfrage läuft bereits: auf deren Ergebnis warten
+        if not is_owner:
+            return _copy_result(future.result())
+
+        try:
+            result = func(messages, **kwargs)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(key, None)
+
+    def _request_key(self, messages: list[dict[str, Any]], extra: Any = None) -> str:
+        """Eindeutiger Key aus Nachrichten, Generierungs-Parametern und ggf. Tools."""
+        payload = _json_key_bytes(
+            [self.api_choice, self.llm, self.temperature, self.max_tokens, messages, extra]
+        )
+        return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+    def _chat_completion(self, messages: list[dict[str, str]]) -> str:
+        """Führt den eigentlichen Provider-Request aus (siehe chat_completion)."""
+        return self._request_params().chat(messages)
+
+    def _openai_chat(self, messages: list[dict[str, str]]) -> str:
+        """Chat-Completion über OpenAI-kompatible APIs (OpenAI, Groq, Gemini)."""
+        self._require_client(self.client)
+        response = self.client.chat.completions.create(**self._openai_kwargs(messages))
+        return self._openai_content(response)
+
+    def _ollama_chat(self, messages: list[dict[str, str]]) -> str:
+        """Chat-Completion über Ollama."""
+        ollama = self._require_ollama()
+        response = ollama.chat(**self._ollama_kwargs(messages))
+        return response["message"]["content"]
+
+    def _unsupported_chat(self, messages: list[dict[str, str]]) -> str:
+        raise ValueError(f"Unsupported API choice: {self.api_choice}")
+
+    def _request_params(self) -> _RequestParams:
+        """Vorberechnete Request-Parameter für die aktuelle Konfiguration.
+
+        Wird nur neu gebaut, wenn sich api_choice, llm, temperature,
+        max_tokens oder keep_alive seit dem letzten Aufruf geändert haben.
+        """
+        signature = (self.api_choice, self.llm, self.temperature, self.max_tokens, self.keep_alive)
+        params = self._params
+        if params is None or params.signature != signature:
+            params = self._params = self._build_request_params(signature)
+        return params
+
+    def _build_request_params(self, signature: tuple) -> _RequestParams:
+        if self.api_choice in _OPENAI_COMPATIBLE:
+            chat = self._openai_chat
         elif self.api_choice == "ollama":
-            if not ollama:
-                raise RuntimeError(
-                    "Ollama Python package not available. "
-                    "Please install it via `pip install ollama`."
-                )
-            response = ollama.chat(
-                model=self.llm,
-                messages=messages,
-                stream=False,
-                options={
-                    "temperature": self.temperature,
-                    "num_predict": self.max_tokens,
-                    "repeat_penalty": 1.2,
-                    "top_k": 10,
-                    "top_p": 0.5,
-                },
-                keep_alive=self.keep_alive,
+            chat = self._ollama_chat
+        else:
+            chat = self._unsupported_chat
+
+        # GPT-5 und o1/o3 Modelle haben andere Parameter-Anforderungen:
+        # - max_completion_tokens statt max_tokens
+        # - temperature wird nicht unterstützt (nur default=1)
+        is_new_model = self.api_choice == "openai" and _NEW_MODEL_RE.match(self.llm) is not None
+        openai_base: dict[str, Any] = {"model": self.llm}
+        if is_new_model:
+            openai_base["max_completion_tokens"] = self.max_tokens
+        else:
+            openai_base["temperature"] = self.temperature
+            openai_base["max_tokens"] = self.max_tokens
+
+        # Ollama: mit Tools ohne Sampling-Tuning
+        tool_options = {"temperature": self.temperature, "num_predict": self.max_tokens}
+        ollama_tool_base = {
+            "model": self.llm,
+            "stream": False,
+            "options": tool_options,
+            "keep_alive": self.keep_alive,
+        }
+        ollama_base = {
+            **ollama_tool_base,
+            "options": {**tool_options, "repeat_penalty": 1.2, "top_k": 10, "top_p": 0.5},
+        }
+        return _RequestParams(
+            signature=signature,
+            chat=chat,
+            is_new_model=is_new_model,
+            openai_base=openai_base,
+            ollama_base=ollama_base,
+            ollama_tool_base=ollama_tool_base,
+        )
+
+    def chat_chain(self, steps: list[ChainStep], system: str | None = None) -> list[str]:
+        """Führt abhängige Schritte (z.B. Plan -> Ausführen -> Verfeinern) als ein Gespräch aus.
+
+        Bei OpenAI wird die Responses API mit previous_response_id genutzt: der
+        bisherige Verlauf liegt beim Provider und wird nicht bei jedem Schritt
+        erneut hochgeladen. Andere Provider bekommen den Verlauf lokal
+        mitgeschickt; Ollama verwendet dabei den KV-Cache des gleichbleibenden
+        Präfixes wieder (solange das Modell per keep_alive geladen bleibt).
+
+        Args:
+            steps: Prompts oder Funktionen, die aus der vorherigen Antwort den
+                nächsten Prompt bauen.
+            system: Optionaler System-Prompt für die ganze Kette.
+
+        Returns:
+            Die Antworten aller Schritte in Reihenfolge.
+
+        Examples:
+            >>> plan, result = client.chat_chain([
+            ...     "Plane die Schritte für: Termin am Freitag eintragen.",
+            ...     lambda plan: f"Führe diesen Plan aus: {plan}",
+            ... ])
+        """
+        if self.api_choice == "openai":
+            return self._openai_response_chain(steps, system)
+
+        messages: list[dict[str, str]] = [{"role": "system", "content": system}] if system else []
+        answers: list[str] = []
+        for step in steps:
+            prompt = step(answers[-1] if answers else "") if callable(step) else step
+            # Neue Liste je Schritt: übergebene Verläufe (Cache, Dedup) bleiben unverändert
+            messages = [*messages, {"role": "user", "content": prompt}]
+            answer = self.chat_completion(messages) or ""
+            messages = [*messages, {"role": "assistant", "content": answer}]
+            answers.append(answer)
+        return answers
+
+    def _openai_response_chain(self, steps: list[ChainStep], system: str | None) -> list[str]:
+        """chat_chain über die OpenAI Responses API (Verlauf per previous_response_id)."""
+        self._require_client(self.client)
+        params = self._request_params()
+
+        base: dict[str, Any] = {"model": self.llm, "max_output_tokens": self.max_tokens}
+        if not params.is_new_model:
+            base["temperature"] = self.temperature
+        if system:
+            base["instructions"] = system
+
+        answers: list[str] = []
+        previous_id: str | None = None
+        for step in steps:
+            prompt = step(answers[-1] if answers else "") if callable(step) else step
+            kwargs = {**base, "input": prompt}
+            if previous_id:
+                kwargs["previous_response_id"] = previous_id
+            response = self.client.responses.create(**kwargs)
+            previous_id = response.id
+            answers.append(response.output_text)
+        return answers
+
+    def batch_completion(
+        self,
+        batch: list[list[dict[str, str]]],
+        mode: Literal["concurrent", "batch_api"] = "concurrent",
+        max_workers: int = 16,
+        poll_interval: float = 30.0,
+    ) -> list[str | None]:
+        """Beantwortet mehrere unabhängige Anfragen auf einmal.
+
+        Args:
+            batch: Liste von Nachrichtenlisten, eine pro Anfrage.
+            mode: "concurrent" schickt die Anfragen parallel über einen
+                Thread-Pool (für latenzkritische Aufrufe). "batch_api" nutzt die
+                OpenAI Batch API (günstiger, Ergebnis aber erst nach Minuten bis
+                Stunden; nur api_choice "openai").
+            max_workers: Maximale Anzahl paralleler Anfragen bei "concurrent".
+            poll_interval: Sekunden zwischen Statusabfragen bei "batch_api".
+
+        Returns:
+            Antworten in der Reihenfolge von batch. Bei "batch_api" steht None
+            für Anfragen, die der Provider nicht beantwortet hat.
+
+        Raises:
+            ValueError: Bei unbekanntem mode oder "batch_api" ohne OpenAI.
+            RuntimeError: Wenn der Batch-Job fehlschlägt oder abläuft.
+
+        Examples:
+            >>> answers = client.batch_completion([messages_a, messages_b], max_workers=4)
+        """
+        if not batch:
+            return []
+        if mode == "concurrent":
+            with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(batch)))) as executor:
+                return list(executor.map(self.chat_completion, batch))
+        if mode == "batch_api":
+            return self._openai_batch(batch, poll_interval)
+        raise ValueError(f"Unsupported batch mode: {mode}")
+
+    def _openai_batch(self, batch: list[list[dict[str, str]]], poll_interval: float) -> list[str | None]:
+        """Führt batch über die OpenAI Batch API aus (JSONL hochladen, pollen, Ergebnisse zuordnen)."""
+        if self.api_choice != "openai":
+            raise ValueError("batch_api mode is only supported for api_choice 'openai'.")
+        self._require_client(self.client)
+
+        lines = [
+            _json_dumps(
+                {
+                    "custom_id": str(i),
+                    "method": "POST",
+                    "url": "/v1/chat/completions",
+                    "body": self._openai_kwargs(messages),
+                }
             )
-            return response["message"]["content"]
+            for i, messages in enumerate(batch)
+        ]
+        input_file = self.client.files.create(
+            file=("batch.jsonl", "\n".join(lines).encode("utf-8")), purpose="batch"
+        )
+        job = self.client.batches.create(
+            input_file_id=input_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h",
+        )
+
+        while job.status not in ("completed", "failed", "expired", "cancelled"):
+            time.sleep(poll_interval)
+            job = self.client.batches.retrieve(job.id)
+
+        if job.status != "completed" or not job.output_file_id:
+            raise RuntimeError(f"OpenAI batch {job.id} ended with status '{job.status}'.")
+
+        results: list[str | None] = [None] * len(batch)
+        for line in self.client.files.content(job.output_file_id).text.splitlines():
+            if not line.strip():
+                continue
+            entry = _json_loads(line)
+            body = (entry.get("response") or {}).get("body") or {}
+            choices = body.get("choices") or []
+            if choices:
+                results[int(entry["custom_id"])] = choices[0]["message"]["content"]
+        return results
 
+    def chat_completion_stream(self, messages: list[dict[str, str]]) -> Iterator[str]:
+        """Wie chat_completion, liefert die Antwort aber stückweise während der Generierung.
+
+        So kann z.B. TTS schon mit dem ersten Satz beginnen, während das
+        Modell noch schreibt. Bei temperature 0 wird eine gecachte Antwort
+        als ein Stück geliefert und eine vollständige neue Antwort gecacht.
+
+        Args:
+            messages: Liste von Nachrichten im Chat-Format.
+
+        Yields:
+            Text-Stücke in der Reihenfolge der Generierung (ohne leere Stücke).
+
+        Examples:
+            >>> for part in client.chat_completion_stream(messages):
+            ...     print(part, end="", flush=True)
+        """
+        key = self._request_key(messages) if self._cache_enabled() else None
+        if key is not None and (hit := self._cache_get(key)) is not _MISSING:
+            yield hit
+            return
+
+        if self.api_choice in _OPENAI_COMPATIBLE:
+            self._require_client(self.client)
+            response = self.client.chat.completions.create(
+                **self._openai_kwargs(messages), stream=True
+            )
+            parts = (
+                chunk.choices[0].delta.content
+                for chunk in response
+                if chunk.choices
+            )
+        elif self.api_choice == "ollama":
+            ollama = self._require_ollama()
+            response = ollama.chat(**{**self._ollama_kwargs(messages), "stream": True})
+            parts = (part["message"]["content"] for part in response)
         else:
             raise ValueError(f"Unsupported API choice: {self.api_choice}")
 
+        collected: list[str] = []
+        for part in parts:
+            if part:
+                collected.append(part)
+                yield part
+
+        if key is not None and collected:
+            self._cache_put(key, "".join(collected))
+
     def chat_completion_with_tools(
         self,
         messages: list[dict[str, Any]],
         tools: list[dict[str, Any]],
         tool_choice: str = "auto",
-    ) -> dict[str, Any]:
+    ) -> ChatResult:
         """Chat-Completion mit nativen Tool-Calls (alle Provider).
-        Gibt normalisiertes dict mit role, content und tool_calls zurueck."""
-        if self.api_choice in ("openai", "groq", "gemini"):
-            if not self.client:
-                raise RuntimeError(f"{self.api_choice} client not available.")
-
-            kwargs: dict[str, Any] = {
-                "model": self.llm,
-                "messages": messages,
-                "tools": tools,
-                "tool_choice": tool_choice,
-            }
-
-            is_new_model = self.api_choice == "openai" and self.llm.startswith(
-                ("gpt-5", "o1", "o3")
+        Gibt normalisiertes dict mit role, content und tool_calls zurueck.
+        Bei temperature 0 greifen Antwort-Cache und Deduplizierung wie bei chat_completion."""
+        return self._cached_call(
+            self._chat_completion_with_tools, messages, [tools, tool_choice], tools=tools, tool_choice=tool_choice
+        )
+
+    def _chat_completion_with_tools(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]],
+        tool_choice: str = "auto",
+    ) -> ChatResult:
+        """Führt den eigentlichen Tool-Call-Request aus (siehe chat_completion_with_tools)."""
+        if self.api_choice in _OPENAI_COMPATIBLE:
+            self._require_client(self.client)
+            response = self.client.chat.completions.create(
+                **self._openai_kwargs(messages, tools=tools, tool_choice=tool_choice)
             )
-            if is_new_model:
-                kwargs["max_completion_tokens"] = self.max_tokens
-            else:
-                kwargs["temperature"] = self.temperature
-                kwargs["max_tokens"] = self.max_tokens
-
-            response = self.client.chat.completions.create(**kwargs)
-            message = response.choices[0].message
-
-            tool_calls_data = None
-            if message.tool_calls:
-                tool_calls_data = [
-                    {
-                        "id": tc.id,
-                        "type": "function",
-                        "function": {
-                            "name": tc.function.name,
-                            "arguments": tc.function.arguments,
-                        },
-                    }
-                    for tc in message.tool_calls
-                ]
-
-            return {
-                "role": "assistant",
-                "content": message.content,
-                "tool_calls": tool_calls_data,
-            }
+            return self._openai_tool_message(response.choices[0].message)
 
         elif self.api_choice == "ollama":
-            if not ollama:
-                raise RuntimeError("Ollama Python package not available.")
-
-            response = ollama.chat(
-                model=self.llm,
-                messages=messages,
-                tools=tools,
-                stream=False,
-                options={
-                    "temperature": self.temperature,
-                    "num_predict": self.max_tokens,
-                },
-                keep_alive=self.keep_alive,
+            ollama = self._require_ollama()
+            response = ollama.chat(**self._ollama_kwargs(messages, tools=tools))
+            return self._ollama_tool_message(response["message"])
+
+        else:
+            raise ValueError(f"Unsupported API choice: {self.api_choice}")
+
+    async def achat_completion(self, messages: list[dict[str, str]]) -> str:
+        """Asynchrone Variante von chat_completion.
+
+        Nutzt die Async-Clients der SDKs (AsyncOpenAI, AsyncGroq,
+        ollama.AsyncClient), sodass viele Anfragen parallel laufen können,
+        ohne Threads zu blockieren. Antwort- und semantischer Cache gelten
+        wie bei chat_completion.
+
+        Examples:
+            >>> response = await client.achat_completion(messages)
+        """
+        semantic = self._semantic_scope(messages)
+        if semantic:
+            cached = self.semantic_cache.lookup(*semantic)
+            if cached is not None:
+                return cached
+
+        key = self._request_key(messages) if self._cache_enabled() else None
+        if key is not None and (hit := self._cache_get(key)) is not _MISSING:
+            return hit
+
+        client = self._get_async_client()
+        if self.api_choice in _OPENAI_COMPATIBLE:
+            response = await client.chat.completions.create(**self._openai_kwargs(messages))
+            result = self._openai_content(response)
+        else:
+            response = await client.chat(**self._ollama_kwargs(messages))
+            result = response["message"]["content"]
+
+        if key is not None:
+            self._cache_put(key, result)
+        if semantic and result:
+            self.semantic_cache.add(*semantic, result)
+        return result
+
+    async def achat_completion_with_tools(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]],
+        tool_choice: str = "auto",
+    ) -> ChatResult:
+        """Asynchrone Variante von chat_completion_with_tools."""
+        key = self._request_key(messages, [tools, tool_choice]) if self._cache_enabled() else None
+        if key is not None and (hit := self._cache_get(key)) is not _MISSING:
+            return hit
+
+        client = self._get_async_client()
+        if self.api_choice in _OPENAI_COMPATIBLE:
+            response = await client.chat.completions.create(
+                **self._openai_kwargs(messages, tools=tools, tool_choice=tool_choice)
             )
-            message = response["message"]
-
-            tool_calls_data = None
-            if message.get("tool_calls"):
-                tool_calls_data = [
-                    {
-                        "id": f"call_{i}",
-                        "type": "function",
-                        "function": {
-                            "name": tc["function"]["name"],
-                            "arguments": json.dumps(
-                                tc["function"]["arguments"], ensure_ascii=False
-                            )
-                            if isinstance(tc["function"]["arguments"], dict)
-                            else tc["function"]["arguments"],
-                        },
-                    }
-                    for i, tc in enumerate(message["tool_calls"])
-                ]
-
-            return {
-                "role": "assistant",
-                "content": message.get("content"),
-                "tool_calls": tool_calls_data,
-            }
+            result = self._openai_tool_message(response.choices[0].message)
+        else:
+            response = await client.chat(**self._ollama_kwargs(messages, tools=tools))
+            result = self._ollama_tool_message(response["message"])
+
+        if key is not None:
+            self._cache_put(key, result)
+        return result
+
+    async def abatch(
+        self, list_of_messages: list[list[dict[str, str]]], max_concurrency: int = 20
+    ) -> list[str]:
+        """Beantwortet mehrere Anfragen parallel (höchstens max_concurrency gleichzeitig).
+
+        Returns:
+            Antworten in der Reihenfolge der Eingaben.
+
+        Examples:
+            >>> answers = await client.abatch([messages_a, messages_b], max_concurrency=4)
+        """
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+        async def _run(messages: list[dict[str, str]]) -> str:
+            async with semaphore:
+                return await self.achat_completion(messages)
 
+        return await asyncio.gather(*(_run(messages) for messages in list_of_messages))
+
+    def _get_async_client(self) -> Any:
+        """Async-Client des Providers, lazy erstellt und je Event-Loop wiederverwendet.
+
+        Async-Verbindungspools sind an ihren Event-Loop gebunden, daher wird
+        für einen anderen Loop (oder eine geänderte api_choice) neu erstellt.
+        """
+        loop = asyncio.get_running_loop()
+        if self._async_client is not None and self._async_client_owner == (self.api_choice, loop):
+            return self._async_client
+
+        if self.api_choice in _OPENAI_COMPATIBLE:
+            self._require_client(self.client)
+            if self.api_choice == "groq":
+                AsyncGroq = _import_provider("AsyncGroq")
+                if AsyncGroq is None:
+                    raise RuntimeError("Groq client not available or not installed.")
+                client = AsyncGroq(api_key=self.groq_api_key)
+            else:
+                AsyncOpenAI = _import_provider("AsyncOpenAI")
+                if AsyncOpenAI is None:
+                    raise RuntimeError(f"{_PROVIDER_LABELS[self.api_choice]} client not available or not installed.")
+                if self.api_choice == "gemini":
+                    client = AsyncOpenAI(api_key=self.gemini_api_key, base_url=_GEMINI_BASE_URL)
+                else:
+                    client = AsyncOpenAI(api_key=self.openai_api_key)
+        elif self.api_choice == "ollama":
+            client = self._require_ollama().AsyncClient()
         else:
             raise ValueError(f"Unsupported API choice: {self.api_choice}")
 
+        self._async_client = client
+        self._async_client_owner = (self.api_choice, loop)
+        return client
+
+    def _require_client(self, client: Any) -> None:
+        if not client:
+            raise RuntimeError(
+                f"{_PROVIDER_LABELS[self.api_choice]} client not available or not installed."
+            )
+
+    @staticmethod
+    def _require_ollama() -> Any:
+        """Gibt das ollama-Modul zurück oder wirft RuntimeError, falls nicht installiert."""
+        ollama = _import_provider("ollama")
+        if not ollama:
+            raise RuntimeError(
+                "Ollama Python package not available. "
+                "Please install it via `pip install ollama`."
+            )
+        return ollama
+
+    def _openai_kwargs(self, messages: list[dict[str, Any]], **extra: Any) -> dict[str, Any]:
+        """Request-Parameter für OpenAI-kompatible APIs (OpenAI, Groq, Gemini)."""
+        return {**self._request_params().openai_base, "messages": _compact_messages(messages), **extra}
+
+    def _ollama_kwargs(
+        self, messages: list[dict[str, Any]], tools: list[dict[str, Any]] | None = None
+    ) -> dict[str, Any]:
+        """Request-Parameter für ollama.chat (mit Tools ohne Sampling-Tuning)."""
+        params = self._request_params()
+        messages = _compact_messages(messages)
+        if tools is None:
+            return {**params.ollama_base, "messages": messages}
+        return {**params.ollama_tool_base, "messages": messages, "tools": tools}
+
+    def _openai_content(self, response: Any) -> str | None:
+        """Text aus einer OpenAI-kompatiblen Response (Gemini liefert teils leere Antworten)."""
+        if logger.isEnabledFor(logging.DEBUG):
+            _log_prompt_cache(response)
+
+        if self.api_choice == "gemini":
+            # Debug: Prüfe was zurückkommt (Response-repr nur formatieren, wenn geloggt wird)
+            if not response or not response.choices:
+                if logger.isEnabledFor(logging.ERROR):
+                    logger.error(f"Gemini gab leere Response zurück. Response: {response}")
+                return None
+
+            content = response.choices[0].message.content
+            if not content and logger.isEnabledFor(logging.ERROR):
+                logger.error(f"Gemini message.content ist None. Response: {response}")
+                logger.error(f"Choices: {response.choices}")
+                logger.error(f"Message: {response.choices[0].message}")
+            return content
+
+        return response.choices[0].message.content
+
+    @staticmethod
+    def _openai_tool_message(message: Any) -> ChatResult:
+        """Normalisiert eine OpenAI-kompatible Nachricht mit Tool-Calls."""
+        tool_calls_data = None
+        if message.tool_calls:
+            tool_calls_data = [
+                {
+                    "id": tc.id,
+                    "type": "function",
+                    "function": {"name": function.name, "arguments": function.arguments},
+                }
+                for tc in message.tool_calls
+                for function in (tc.function,)
+            ]
+
+        return {
+            "role": "assistant",
+            "content": message.content,
+            "tool_calls": tool_calls_data,
+        }
+
+    @staticmethod
+    def _ollama_tool_message(message: Any) -> ChatResult:
+        """Normalisiert eine Ollama-Nachricht mit Tool-Calls (Argumente als JSON-String)."""
+        tool_calls_data = None
+        if message.get("tool_calls"):
+            tool_calls_data = [
+                {
+                    "id": f"call_{i}",
+                    "type": "function",
+                    "function": {
+                        "name": function["name"],
+                        "arguments": _json_dumps(arguments)
+                        if isinstance(arguments := function["arguments"], dict)
+                        else arguments,
+                    },
+                }
+                for i, tc in enumerate(message["tool_calls"])
+                for function in (tc["function"],)
+            ]
+
+        return {
+            "role": "assistant",
+            "content": message.get("content"),
+            "tool_calls": tool_calls_data,
+        }
+
+    def warm_up(self) -> bool:
+        """Baut die Verbindung zum Provider vorab auf.
+
+        Für OpenAI, Groq und Gemini wird eine günstige Modell-Liste abgefragt,
+        damit TCP/TLS-Verbindung im Pool des SDK-Clients bereitsteht. Bei Ollama
+        wird das Modell in den Speicher geladen. Fehler werden nur geloggt.
+
+        Returns:
+            True wenn die Verbindung aufgebaut werden konnte, sonst False.
+
+        Examples:
+            >>> client = LLMClient(api_choice="groq")
+            >>> client.warm_up()  # z.B. während einer Transkription
+            True
+        """
+        try:
+            if self.api_choice in ("openai", "groq", "gemini"):
+                if not self.client:
+                    return False
+                self.client.models.list()
+            elif self.api_choice == "ollama":
+                ollama = _import_provider("ollama")
+                if not ollama:
+                    return False
+                # Leerer Prompt lädt nur das Modell (keep_alive hält es im Speicher)
+                ollama.generate(model=self.llm, prompt="", keep_alive=self.keep_alive)
+            else:
+                return False
+            return True
+        except Exception as e:
+            logger.debug(f"Warm-up für {self.api_choice} fehlgeschlagen: {e}")
+            return False
+
+    def warm_up_in_background(self) -> threading.Thread:
+        """Führt warm_up in einem Daemon-Thread aus (blockiert den Aufrufer nicht).
+
+        Returns:
+            Der gestartete Thread (z.B. für join in Tests).
+        """
+        thread = threading.Thread(
+            target=self.warm_up, name=f"llm-warm-up-{self.api_choice}", daemon=True
+        )
+        thread.start()
+        return thread
+
+    def start_keep_warm(self) -> bool:
+        """Hält das Ollama-Modell per Hintergrund-Heartbeat im Speicher.
+
+        Ein Daemon-Thread lädt das Modell sofort (warm_up) und wiederholt das
+        alle keep_alive/2 Sekunden, sodass auch nach längeren Pausen kein
+        Kaltstart auf dem kritischen Pfad anfällt. Der Thread endet mit
+        stop_keep_warm() oder sobald der Client freigegeben wird.
+
+        Returns:
+            True wenn der Heartbeat läuft, False bei anderem Provider oder
+            unbegrenztem/ungültigem keep_alive.
+        """
+        interval = _keep_alive_seconds(self.keep_alive)
+        if self.api_choice != "ollama" or interval is None:
+            return False
+        if self._keep_warm_stop is not None and not self._keep_warm_stop.is_set():
+            return True
+
+        self._keep_warm_stop = threading.Event()
+        threading.Thread(
+            target=_keep_warm_loop,
+            args=(weakref.ref(self), interval / 2, self._keep_warm_stop),
+            name=f"ollama-keep-warm-{self.llm}",
+            daemon=True,
+        ).start()
+        return True
+
+    def stop_keep_warm(self) -> None:
+        """Beendet den Heartbeat aus start_keep_warm (falls aktiv)."""
+        if self._keep_warm_stop is not None:
+            self._keep_warm_stop.set()
+
     def __repr__(self) -> str:
         """Gibt eine String-Repräsentation des Clients zurück.
 
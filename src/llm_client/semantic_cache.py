@@ -0,0 +1,104 @@
+"""Semantischer Antwort-Cache für LLMClient.
+
+Findet bereits beantwortete Anfragen auch bei leicht abweichender
+Formulierung ("Hauptstadt von Frankreich?" vs. "Frankreichs Hauptstadt?").
+Die Ähnlichkeit wird als Kosinus über Zeichen-Trigramme berechnet – ohne
+Embedding-Modell und ohne zusätzliche Abhängigkeiten. Zahlen und IDs
+müssen exakt übereinstimmen ("12. März" trifft nicht "13. März").
+"""
+
+import math
+import re
+import threading
+from collections import Counter, OrderedDict
+
+_WORD_RE = re.compile(r"\w+")
+_ID_RE = re.compile(r"\w*\d\w*")
+
+
+def _vectorize(text: str) -> dict[str, float]:
+    """Normalisierter Trigramm-Vektor (L2-Norm 1, Skalarprodukt == Kosinus)."""
+    grams: Counter[str] = Counter()
+    for word in _WORD_RE.findall(text.lower()):
+        padded = f" {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    norm = math.sqrt(sum(c * c for c in grams.values()))
+    if not norm:
+        return {}
+    return {gram: count / norm for gram, count in grams.items()}
+
+
+def _signature(text: str) -> tuple[str, ...]:
+    """Alle Tokens mit Ziffern (Zahlen, Datumsteile, IDs) in Reihenfolge."""
+    return tuple(_ID_RE.findall(text.lower()))
+
+
+def _cosine(a: dict[str, float], b: dict[str, float]) -> float:
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(weight * b.get(gram, 0.0) for gram, weight in a.items())
+
+
+class SemanticCache:
+    """Kleiner LRU-Cache, der Antworten über Textähnlichkeit wiederfindet.
+
+    Einträge sind einem Scope zugeordnet (z.B. Modell, Parameter und
+    vorheriger Gesprächsverlauf); Treffer gibt es nur innerhalb desselben Scopes.
+
+    Examples:
+        >>> cache = SemanticCache(threshold=0.8)
+        >>> cache.add("scope", "Was ist die Hauptstadt von Frankreich?", "Paris")
+        >>> cache.lookup("scope", "Was ist die Hauptstadt Frankreichs?")
+        'Paris'
+    """
+
+    def __init__(self, threshold: float = 0.92, max_entries: int = 256) -> None:
+        self.threshold: float = threshold
+        self.max_entries: int = max_entries
+        self._entries: OrderedDict[tuple[str, str], tuple[dict[str, float], tuple[str, ...], str]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def lookup(self, scope: str, text: str) -> str | None:
+        """Gibt die Antwort des ähnlichsten Eintrags zurück (oder None)."""
+        vector = _vectorize(text)
+        if not vector:
+            return None
+
+        with self._lock:
+            exact = self._entries.get((scope, text))
+            if exact is not None:
+                self._entries.move_to_end((scope, text))
+                return exact[2]
+
+            signature = _signature(text)
+            best_key, best_score = None, self.threshold
+            for key, (cached_vector, cached_signature, _) in self._entries.items():
+                if key[0] != scope or cached_signature != signature:
+                    continue
+                score = _cosine(vector, cached_vector)
+                if score >= best_score:
+                    best_key, best_score = key, score
+
+            if best_key is None:
+                return None
+            self._entries.move_to_end(best_key)
+            return self._entries[best_key][2]
+
+    def add(self, scope: str, text: str, response: str) -> None:
+        """Speichert eine Antwort; verdrängt bei Bedarf den ältesten Eintrag."""
+        vector = _vectorize(text)
+        if not vector or self.max_entries <= 0:
+            return
+
+        with self._lock:
+            self._entries[(scope, text)] = (vector, _signature(text), response)
+            self._entries.move_to_end((scope, text))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
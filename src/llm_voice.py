@@ -6,17 +6,23 @@ Verwendet llm_client für universellen LLM-Zugriff:
 - Konversations-Management
 """
 
+import asyncio
+import hashlib
 import logging
 import json
 import os
-from typing import Optional, List, Dict, Any
+import re
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Optional, List, Dict, Any, AsyncIterator
 from pathlib import Path
 
 # Lokaler Import des llm_client
 from llm_client import LLMClient
 
 # Groq Client für Whisper API
-from groq import Groq
+from groq import Groq, Timeout
 
 # Faster Whisper für lokales Speech-to-Text
 try:
@@ -26,18 +32,146 @@ except ImportError:
     FASTER_WHISPER_AVAILABLE = False
     WhisperModel = None
 
+# Optional: orjson für schnelleres JSON (Fallback auf stdlib json)
+try:
+    import orjson
+    _json_loads = orjson.loads
+
+    def _json_dumps(obj: Any) -> str:
+        return orjson.dumps(obj).decode("utf-8")
+except ImportError:
+    _json_loads = json.loads
+
+    def _json_dumps(obj: Any) -> str:
+        return json.dumps(obj, ensure_ascii=False)
+
+# CTranslate2 (Backend von Faster Whisper) für die GPU-Erkennung
+try:
+    import ctranslate2
+except ImportError:
+    ctranslate2 = None
+
 logger = logging.getLogger(__name__)
 
+# Anzahl gemerkter Rechtschreibprüfungen (LRU, exakter Text als Key)
+SPELLING_CACHE_SIZE = 256
+
+# Zeitabhängige Angaben (Zeitstempel, Datum, UUIDs), die den System-Prompt
+# von Aufruf zu Aufruf verändern und damit den Prompt-Cache der Provider brechen
+_VOLATILE_RE = re.compile(
+    r"\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}"
+    r"|\b\d{1,2}\.\d{1,2}\.\d{2,4}\b"
+    r"|\b\d{1,2}:\d{2}(?::\d{2})?\s*(?:Uhr)?\b"
+    r"|\b[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}\b",
+    re.IGNORECASE,
+)
+
+
+# Anweisung der Rechtschreibprüfung - als eigene System-Nachricht immer
+# byte-identisch, damit die Provider den Prefix cachen können
+SPELLING_SYSTEM_PROMPT = """Korrigiere deutschen Text: Rechtschreibung, Kommata, Satzzeichen. Jeder Satz endet mit Punkt/Fragezeichen/Ausrufezeichen.
+
+Gib NUR den korrigierten Text zurück als JSON:
+{"corrected": "..."}"""
+
+# Markdown-Codeblock um die JSON-Antwort (```json ... ```)
+_FENCE_RE = re.compile(r"\A```(?:json)?\s*|\s*```\Z")
+
+# Wörter (inkl. Bindestrich-Komposita) und Satzgrenzen für die lokale Vorprüfung
+_WORD_RE = re.compile(r"[^\W\d_]+(?:-[^\W\d_]+)*")
+_SENTENCE_SPLIT_RE = re.compile(r"(?<=[.!?])\s+")
+
+
+@lru_cache(maxsize=2)
+def _load_wordlist(path: str) -> frozenset:
+    """Lädt eine Wortliste (ein Wort pro Zeile, optional gefolgt von Häufigkeit)
+
+    Fehlende oder unlesbare Datei: leere Menge (einmal gewarnt, Prüfung per LLM).
+    """
+    try:
+        with open(path, encoding="utf-8") as f:
+            words = frozenset(line.split()[0] for line in f if line.strip())
+    except (OSError, UnicodeDecodeError) as e:
+        logger.warning(f"Wortliste {path} nicht lesbar, Vorprüfung deaktiviert: {e}")
+        return frozenset()
+    logger.info(f"Wortliste für Rechtschreibprüfung geladen: {len(words)} Wörter")
+    return words
+
+
+def _is_known_text(text: str, words: frozenset) -> bool:
+    """True wenn alle Wörter bekannt sind und der Text mit Satzzeichen endet.
+
+    Groß-/Kleinschreibung zählt; nur am Satzanfang ist auch die klein
+    geschriebene Form erlaubt. Kommasetzung wird nicht geprüft.
+    """
+    text = text.strip()
+    if not text or text[-1] not in ".!?":
+        return False
+    for sentence in _SENTENCE_SPLIT_RE.split(text):
+        for i, word in enumerate(_WORD_RE.findall(sentence)):
+            if word not in words and not (i == 0 and word.lower() in words):
+                return False
+    return True
+
 
 def _safe_log(text: str, max_len: int = 200) -> str:
     """Entfernt Emojis und nicht-ASCII-Zeichen für sicheres Logging auf Windows"""
     if not text:
         return ""
+    # Häufigster Fall: reiner ASCII-Text, kein Umkodieren nötig
+    if text.isascii():
+        return text[:max_len]
     # Entferne alle Zeichen, die nicht in ASCII kodierbar sind (z.B. Emojis)
     safe = text.encode('ascii', errors='ignore').decode('ascii')
     return safe[:max_len] if len(safe) > max_len else safe
 
 
+def _canonicalize_context(context: str) -> tuple[str, str]:
+    """Trennt einen System-Context in stabilen und zeitabhängigen Teil.
+
+    Zeilen mit Zeitstempeln oder UUIDs wandern in den zweiten Teil, damit der
+    System-Prompt über Aufrufe hinweg byte-identisch bleibt und die Provider
+    (OpenAI, Groq) ihren Prefix-Cache nutzen können.
+
+    Returns:
+        (stabiler Context, zeitabhängige Zeilen)
+    """
+    stable: List[str] = []
+    volatile: List[str] = []
+    for line in context.strip().splitlines():
+        (volatile if _VOLATILE_RE.search(line) else stable).append(line.rstrip())
+    return "\n".join(stable), "\n".join(volatile)
+
+
+def _whisper_backend(device: str) -> tuple[str, str]:
+    """Wählt Gerät und compute_type für Faster Whisper.
+
+    Args:
+        device: "auto", "cpu" oder "cuda" (WHISPER_DEVICE)
+
+    Returns:
+        (device, compute_type) - GPU mit float16, sonst CPU mit int8
+    """
+    if device == "auto":
+        has_cuda = ctranslate2 is not None and ctranslate2.get_cuda_device_count() > 0
+        device = "cuda" if has_cuda else "cpu"
+    if device == "cuda":
+        return "cuda", "float16"
+    return "cpu", "int8"
+
+
+@lru_cache(maxsize=4)
+def _get_whisper_model(size: str, device: str, compute_type: str):
+    """Lädt ein Faster Whisper Modell einmal pro Prozess (geteilt zwischen Instanzen)"""
+    return WhisperModel(
+        size,                 # Modellgröße: tiny, base, small, medium, large-v3
+        device=device,
+        compute_type=compute_type,
+        cpu_threads=max(2, (os.cpu_count() or 2) - 1),  # Ein Kern bleibt für den Bot frei
+        num_workers=1
+    )
+
+
 class LLMVoiceInterface:
     """Interface für LLM API mit Voice-Support (via llm_client)"""
 
@@ -47,6 +181,11 @@ class LLMVoiceInterface:
         self.spell_check_client = None
         self.llm_available = False
 
+        # Ergebnisse der Rechtschreibprüfung: blake2b(Text) -> Ergebnis-Dict.
+        # Bewusst nur exakte Treffer: ein ähnlicher Text bekäme sonst die
+        # Korrektur eines anderen Satzes zurück.
+        self._spelling_cache: OrderedDict[bytes, Dict[str, Any]] = OrderedDict()
+
         # LLM nur initialisieren wenn Provider konfiguriert ist
         if config.llm_provider and config.llm_available:
             self._init_llm_client(config.llm_provider, config.llm_model)
@@ -66,7 +205,8 @@ class LLMVoiceInterface:
                     "GROQ_API_KEY nicht gesetzt.\n"
                     "Bitte GROQ_API_KEY in .env eintragen für Speech-to-Text."
                 )
-            self.groq_client = Groq(api_key=config.groq_api_key)
+            # Kurzer Connect-Timeout, damit der Fallback bei Netzproblemen schnell greift
+            self.groq_client = Groq(api_key=config.groq_api_key, timeout=Timeout(60.0, connect=5.0))
             logger.info(f"Speech-to-Text: Groq Whisper (whisper-large-v3-turbo)")
 
         # Faster Whisper initialisieren (wenn benötigt)
@@ -81,14 +221,12 @@ class LLMVoiceInterface:
                     logger.warning("faster-whisper nicht verfügbar, Fallback nicht möglich")
             else:
                 try:
+                    # GPU (float16) wenn vorhanden, sonst CPU (int8)
+                    device, compute_type = _whisper_backend(config.whisper_device)
                     # Base Model (74MB) ---- Guter Kompromiss zwischen Geschwindigkeit und Qualität
-                    self.faster_whisper_model = WhisperModel(
-                        "base",               # Modellgröße: tiny, base, small, medium, large-v3
-                        device="cpu",         # CPU-Modus (für GPU: "cuda")
-                        compute_type="int8"   # Optimiert für CPU
-                    )
+                    self.faster_whisper_model = _get_whisper_model("base", device, compute_type)
                     if self.speech_provider == "faster-whisper":
-                        logger.info(f"Speech-to-Text: Faster Whisper (base model, CPU)")
+                        logger.info(f"Speech-to-Text: Faster Whisper (base model, {device.upper()}, {compute_type})")
                     else:
                         logger.info(f"Speech-to-Text: Groq Whisper + Faster Whisper Fallback")
                 except Exception as e:
@@ -112,12 +250,23 @@ class LLMVoiceInterface:
             os.environ['GEMINI_API_KEY'] = self.config.gemini_api_key
         # Ollama braucht keinen API Key
 
+        # Heartbeat des bisherigen Clients beenden (Modellwechsel)
+        if self.llm_client is not None:
+            self.llm_client.stop_keep_warm()
+        # Korrekturen des bisherigen Modells nicht weiterverwenden
+        self._spelling_cache.clear()
+
         # LLM Client initialisieren (flexibel)
+        # Optional (LLM_KEEP_WARM): Ollama-Modell im Speicher halten bzw. Cloud-
+        # Verbindung vorwärmen, damit die erste Sprachanfrage keinen Kaltstart zahlt
+        keep_warm = self.config.llm_keep_warm
         self.llm_client = LLMClient(
             api_choice=provider,
             llm=model,
             temperature=0.7,
-            max_tokens=8192
+            max_tokens=8192,
+            keep_warm=keep_warm and provider == "ollama",
+            prewarm=keep_warm,
         )
 
         #Schneller LLM Client für Rechtschreibprüfung (optimiert für Geschwindigkeit)
@@ -165,6 +314,10 @@ class LLMVoiceInterface:
                 return await self._speech_to_text_faster_whisper(audio_file_path)
 
             elif self.speech_provider == "groq-fallback":
+                # Groq und Faster Whisper parallel (opt-in, kostet kurz lokale CPU)
+                if self.config.speculative_stt and self.faster_whisper_model:
+                    return await self._speech_to_text_speculative(audio_file_path)
+
                 # Groq mit Faster Whisper Fallback
                 try:
                     return await self._speech_to_text_groq(audio_file_path)
@@ -189,12 +342,17 @@ class LLMVoiceInterface:
         Returns:
             Transkribierter Text
         """
+        return self._transcribe_groq(audio_file_path)
+
+    def _transcribe_groq(self, audio_file_path: str) -> str:
+        """Blockierender Groq-Aufruf (siehe _speech_to_text_groq)"""
         logger.info(f"Konvertiere Audio zu Text (Groq Whisper): {audio_file_path}")
 
-        # Audio-Datei öffnen und an Groq Whisper senden
+        # Audio-Datei öffnen und als Datei-Handle an Groq Whisper senden
+        # (wird beim Upload gestreamt statt vorher komplett eingelesen)
         with open(audio_file_path, "rb") as audio_file:
             transcription = self.groq_client.audio.transcriptions.create(
-                file=(Path(audio_file_path).name, audio_file.read()),
+                file=(Path(audio_file_path).name, audio_file),
                 model="whisper-large-v3-turbo",  # Schnellstes und günstigstes Modell
                 language="de",  # Deutsch
                 response_format="text"
@@ -215,20 +373,60 @@ class LLMVoiceInterface:
         Returns:
             Transkribierter Text
         """
+        return self._transcribe_faster_whisper(audio_file_path)
+
+    def _transcribe_faster_whisper(self, audio_file_path: str) -> str:
+        """Blockierende lokale Transkription (siehe _speech_to_text_faster_whisper)"""
         logger.info(f"Konvertiere Audio zu Text (Faster Whisper): {audio_file_path}")
 
         # Transkribieren
         segments, info = self.faster_whisper_model.transcribe(
             audio_file_path,
             language="de",
-            beam_size=5  # Qualität vs. Geschwindigkeit (1-10)
+            beam_size=1,  # Greedy: deutlich schneller, für kurze Sprachbefehle ausreichend
+            vad_filter=True,  # Stille überspringen statt sie zu dekodieren
+            vad_parameters={"min_silence_duration_ms": 500},
+            condition_on_previous_text=False,
+            without_timestamps=True
         )
 
-        # Segmente zu Text kombinieren
-        text = " ".join([segment.text for segment in segments]).strip()
+        # Segmente zu Text kombinieren (Generator wird beim Joinen dekodiert)
+        text = " ".join(segment.text for segment in segments).strip()
         logger.info(f"Transkription (Faster Whisper): {text}")
         return text
 
+    async def _speech_to_text_speculative(self, audio_file_path: str) -> str:
+        """
+        Startet Groq und Faster Whisper gleichzeitig, das erste erfolgreiche Ergebnis gewinnt
+
+        Ein Groq-Timeout kostet so nicht mehr Timeout + lokale Transkription.
+        Beide laufen in Threads, da die Aufrufe blockieren.
+
+        Args:
+            audio_file_path: Pfad zur Audio-Datei
+
+        Returns:
+            Transkribierter Text
+        """
+        pending = {
+            asyncio.create_task(asyncio.to_thread(self._transcribe_groq, audio_file_path)),
+            asyncio.create_task(asyncio.to_thread(self._transcribe_faster_whisper, audio_file_path)),
+        }
+        errors = []
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    errors.append(task.exception())
+                    logger.warning(f"Speech-to-Text Variante fehlgeschlagen: {task.exception()}")
+            raise Exception(f"Groq und Faster Whisper fehlgeschlagen: {errors}")
+        finally:
+            # Der Thread des Verlierers läuft zu Ende, sein Ergebnis wird verworfen
+            for task in pending:
+                task.cancel()
+
 
     async def process_with_context(
         self,
@@ -250,9 +448,13 @@ class LLMVoiceInterface:
         try:
             logger.info(f"Verarbeite mit Context: {user_input[:50]}...")
 
-            # Messages für llm_client erstellen
+            # Messages für llm_client erstellen: stabiler System-Prompt zuerst
+            # (Prefix-Cache), zeitabhängige Angaben gehören zur User-Nachricht
+            system_context, volatile = _canonicalize_context(context)
+            if volatile:
+                user_input = f"{volatile}\n\n{user_input}"
             messages = [
-                {"role": "system", "content": context},
+                {"role": "system", "content": system_context},
                 {"role": "user", "content": user_input}
             ]
 
@@ -265,7 +467,7 @@ class LLMVoiceInterface:
         except Exception as e:
             logger.error(f"Fehler bei Context-Verarbeitung: {e}", exc_info=True)
             # Fallback: Einfache Antwort
-            return json.dumps({
+            return _json_dumps({
                 "message": f"Fehler bei der Verarbeitung: {str(e)}",
                 "actions": []
             })
@@ -298,17 +500,32 @@ class LLMVoiceInterface:
                     "errors": []
                 }
 
-            logger.info(f"Prüfe Text (Rechtschreibung & Interpunktion): {text[:50]}...")
-
-            # Sehr kompakter Prompt - nur korrigierten Text zurückgeben
-            prompt = f"""Korrigiere deutschen Text: Rechtschreibung, Kommata, Satzzeichen. Jeder Satz endet mit Punkt/Fragezeichen/Ausrufezeichen.
+            # Nur bekannte Wörter und korrektes Satzende: keine LLM-Anfrage nötig
+            wordlist_path = self.config.spellcheck_wordlist
+            if wordlist_path and _is_known_text(text, _load_wordlist(wordlist_path)):
+                logger.info("Rechtschreibung lokal geprüft: Keine Fehler")
+                return {
+                    "has_errors": False,
+                    "original": text,
+                    "corrected": text,
+                    "errors": []
+                }
 
-Gib NUR den korrigierten Text zurück als JSON:
-{{"corrected": "..."}}
+            # Bereits geprüfter Text: Ergebnis ohne LLM-Anfrage zurückgeben
+            cache_key = hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+            cached = self._spelling_cache.get(cache_key)
+            if cached is not None:
+                self._spelling_cache.move_to_end(cache_key)
+                logger.info("Rechtschreibung aus Cache")
+                return {**cached, "errors": []}
 
-Text: {text}"""
+            logger.info(f"Prüfe Text (Rechtschreibung & Interpunktion): {text[:50]}...")
 
-            messages = [{"role": "user", "content": prompt}]
+            # Sehr kompakter Prompt - nur korrigierten Text zurückgeben
+            messages = [
+                {"role": "system", "content": SPELLING_SYSTEM_PROMPT},
+                {"role": "user", "content": f"Text: {text}"}
+            ]
 
             # Schnelleren LLM Client für Rechtschreibprüfung nutzen
             result = self.spell_check_client.chat_completion(messages)
@@ -324,15 +541,11 @@ Text: {text}"""
                 }
 
             # JSON extrahieren (falls LLM zusätzlichen Text zurückgibt)
-            result = result.strip()
-            if result.startswith("```json"):
-                result = result.replace("```json", "").replace("```", "").strip()
-            elif result.startswith("```"):
-                result = result.replace("```", "").strip()
+            result = _FENCE_RE.sub("", result.strip())
 
             # JSON parsen
             try:
-                parsed = json.loads(result)
+                parsed = _json_loads(result)
                 corrected = parsed.get('corrected', text)
 
                 # Prüfe ob es Änderungen gab
@@ -340,13 +553,17 @@ Text: {text}"""
 
                 logger.info(f"Rechtschreibung geprüft: {'Änderungen vorgenommen' if has_errors else 'Keine Fehler'}")
 
-                return {
+                spelling = {
                     "has_errors": has_errors,
                     "original": text,
                     "corrected": corrected,
                     "errors": []  # Nicht mehr benötigt, aber für Kompatibilität
                 }
-            except json.JSONDecodeError:
+                self._spelling_cache[cache_key] = spelling
+                while len(self._spelling_cache) > SPELLING_CACHE_SIZE:
+                    self._spelling_cache.popitem(last=False)
+                return {**spelling, "errors": []}
+            except json.JSONDecodeError:  # auch orjson.JSONDecodeError (Unterklasse)
                 # Fallback bei Parse-Fehler
                 logger.warning(f"Konnte JSON nicht parsen: {result[:100]}")
                 return {
@@ -370,6 +587,9 @@ Text: {text}"""
         """
         Fasst Text zusammen oder beantwortet einen Prompt
 
+        Sammelt die Stücke aus summarize_text_stream, der Event-Loop bleibt
+        während der Generierung frei.
+
         Args:
             prompt: Der Prompt mit dem zu verarbeitenden Text
 
@@ -377,12 +597,8 @@ Text: {text}"""
             Zusammenfassung als String
         """
         try:
-            logger.info(f"Erstelle Zusammenfassung...")
-
-            messages = [{"role": "user", "content": prompt}]
-
             # Haupt-LLM Client für Zusammenfassung nutzen
-            result = self.llm_client.chat_completion(messages)
+            result = "".join([part async for part in self.summarize_text_stream(prompt)])
 
             if result is None or not result:
                 logger.warning("LLM gab keine Antwort zurück")
@@ -399,6 +615,61 @@ Text: {text}"""
             logger.error(f"Fehler bei Zusammenfassung: {e}", exc_info=True)
             return f"Fehler bei der Zusammenfassung: {str(e)}"
 
+    async def summarize_text_stream(self, prompt: str) -> AsyncIterator[str]:
+        """
+        Wie summarize_text, liefert die Antwort aber stückweise während der Generierung
+
+        So kann die Ausgabe (Chat, TTS) schon mit dem ersten Satz beginnen.
+        Ein Worker-Thread liest den Stream und reicht die Stücke über eine
+        Queue weiter, damit der Event-Loop während der Generierung nicht
+        blockiert. Er schließt den Stream auch selbst, so läuft close() nie
+        parallel zu einem noch laufenden next().
+
+        Args:
+            prompt: Der Prompt mit dem zu verarbeitenden Text
+
+        Yields:
+            Text-Stücke der Zusammenfassung
+        """
+        logger.info(f"Erstelle Zusammenfassung (Stream)...")
+
+        messages = [{"role": "user", "content": prompt}]
+        parts = self.llm_client.chat_completion_stream(messages)
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        stop = threading.Event()
+        end = object()
+
+        def put(item):
+            if stop.is_set():
+                return
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, item)
+            except RuntimeError:  # Event-Loop bereits geschlossen
+                stop.set()
+
+        def pump():
+            try:
+                for part in parts:
+                    if stop.is_set():
+                        break
+                    put(part)
+                put(end)
+            except Exception as e:
+                put(e)
+            finally:
+                parts.close()
+
+        loop.run_in_executor(None, pump)
+        try:
+            while (item := await queue.get()) is not end:
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            # Abbruch: der Worker beendet das laufende next() und schließt dann
+            stop.set()
+
 
 # Backwards-Compatibility Alias
 GeminiVoiceInterface = LLMVoiceInterface
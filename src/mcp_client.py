@@ -6,10 +6,53 @@ Eigene Implementierung mit FastMCP, inspiriert durch das Raw-API-Konzept von han
 import asyncio
 import logging
 import json
+import time
 from typing import Optional, Dict, Any, List
 
+# Optional: orjson für schnelleres JSON (Fallback auf stdlib json)
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
 logger = logging.getLogger(__name__)
 
+# Erlaubte HTTP-Methoden für discord_api und welche davon einen JSON-Body senden
+_HTTP_METHODS = frozenset({"GET", "POST", "PATCH", "DELETE", "PUT"})
+_BODY_METHODS = frozenset({"POST", "PATCH", "PUT"})
+
+# Ergebnis bei 204 No Content (Discord sendet dann keinen Body)
+_NO_CONTENT_RESULTS = {"DELETE": {"success": True, "deleted": True}}
+
+# Maximal gleichzeitige Discord API Calls in call_discord_api_batch (Rate-Limit)
+_API_CONCURRENCY = 10
+
+
+def _build_external_event(location: Optional[str], channel_id: Optional[str]) -> Dict[str, Any]:
+    """Felder für External Events (Ort statt Channel)"""
+    if not location:
+        raise ValueError("Location ist erforderlich für External Events")
+    return {"entity_metadata": {"location": location}}
+
+
+def _build_channel_event(location: Optional[str], channel_id: Optional[str]) -> Dict[str, Any]:
+    """Felder für Voice/Stage Events (Channel statt Ort)"""
+    if not channel_id:
+        raise ValueError("Channel ID ist erforderlich für Voice/Stage Events")
+    return {"channel_id": channel_id}
+
+
+# Type-spezifische Felder je entity_type (1=STAGE, 2=VOICE, 3=EXTERNAL)
+_EVENT_BUILDERS = {
+    1: _build_channel_event,
+    2: _build_channel_event,
+    3: _build_external_event,
+}
+
+# Wie lange die Tool-Liste des MCP Servers wiederverwendet wird (Sekunden)
+_TOOLS_CACHE_TTL = 60.0
+
 
 class DiscordMCPClient:
     """Client für MCP Discord Raw API Server"""
@@ -19,6 +62,13 @@ class DiscordMCPClient:
         self.server_process = None
         self.client = None
         self.connected = False
+        # Persistente HTTP-Session für Discord API Calls (lazy in _get_http_session)
+        self._http_session = None
+        # Tool-Liste des Servers (ändert sich nur bei neuem Server, siehe list_tools)
+        self._tools_cache: Optional[List[Any]] = None
+        self._tools_cache_ts: float = 0.0
+        # Begrenzt parallele Calls aus call_discord_api_batch
+        self._api_semaphore = asyncio.Semaphore(_API_CONCURRENCY)
 
     async def connect(self):
         """
@@ -48,6 +98,21 @@ class DiscordMCPClient:
             logger.error(f"Fehler beim Verbinden: {e}", exc_info=True)
             raise
 
+    async def _get_http_session(self):
+        """Gibt die persistente aiohttp-Session zurück (Keep-Alive spart TCP/TLS-Handshake pro Call)"""
+        import aiohttp
+
+        if self._http_session is None or self._http_session.closed:
+            self._http_session = aiohttp.ClientSession(
+                headers={
+                    'Authorization': f'Bot {self.config.discord_token}',
+                    'User-Agent': 'DiscordBot (https://github.com/discord-bot) Python/3.11 aiohttp/3.9',
+                    'Content-Type': 'application/json'
+                },
+                connector=aiohttp.TCPConnector(limit=32, ttl_dns_cache=300, keepalive_timeout=75)
+            )
+        return self._http_session
+
     async def _start_server_subprocess(self):
         """Startet MCP Server als Subprocess"""
         try:
@@ -81,65 +146,40 @@ class DiscordMCPClient:
                 base_url = "https://discord.com/api/v10"
                 url = f"{base_url}{endpoint}"
 
-                headers = {
-                    'Authorization': f'Bot {self.config.discord_token}',
-                    'User-Agent': 'DiscordBot (https://github.com/discord-bot) Python/3.11 aiohttp/3.9',
-                    'Content-Type': 'application/json'
-                }
-
                 logger.info(f"Discord API Call: {method} {endpoint}")
 
-                async with aiohttp.ClientSession(headers=headers) as session:
-                    try:
-                        result = None
-
-                        if method.upper() == 'GET':
-                            async with session.get(url) as response:
-                                response.raise_for_status()
-                                result = await response.json()
-
-                        elif method.upper() == 'POST':
-                            async with session.post(url, json=data) as response:
-                                response.raise_for_status()
-                                result = await response.json()
-
-                        elif method.upper() == 'PATCH':
-                            async with session.patch(url, json=data) as response:
-                                response.raise_for_status()
-                                result = await response.json()
-
-                        elif method.upper() == 'DELETE':
-                            async with session.delete(url) as response:
-                                response.raise_for_status()
-                                if response.status == 204:
-                                    return {"success": True, "deleted": True}
-                                result = await response.json()
-
-                        elif method.upper() == 'PUT':
-                            async with session.put(url, json=data) as response:
-                                response.raise_for_status()
-                                result = await response.json()
-
-                        else:
-                            raise ValueError(f"Unsupported HTTP method: {method}")
-
-                        # FastMCP Fix: Wrappen von Listen
-                        if isinstance(result, list):
-                            return {"items": result, "count": len(result)}
-                        return result
-
-                    except aiohttp.ClientResponseError as e:
-                        error_text = await e.response.text() if hasattr(e, 'response') else str(e)
-                        logger.error(f"Discord API Error: {e.status} - {error_text}")
-                        raise Exception(f"Discord API Error {e.status}: {error_text}")
-
-                    except Exception as e:
-                        logger.error(f"Unexpected error: {e}", exc_info=True)
-                        raise
+                http_method = method.upper()
+                if http_method not in _HTTP_METHODS:
+                    raise ValueError(f"Unsupported HTTP method: {method}")
+
+                session = await self._get_http_session()
+
+                try:
+                    body = data if http_method in _BODY_METHODS else None
+                    async with session.request(http_method, url, json=body) as response:
+                        response.raise_for_status()
+                        if response.status == 204:
+                            return dict(_NO_CONTENT_RESULTS.get(http_method, {"success": True}))
+                        result = await response.json()
+
+                    # FastMCP Fix: Wrappen von Listen
+                    if isinstance(result, list):
+                        return {"items": result, "count": len(result)}
+                    return result
+
+                except aiohttp.ClientResponseError as e:
+                    error_text = await e.response.text() if hasattr(e, 'response') else str(e)
+                    logger.error(f"Discord API Error: {e.status} - {error_text}")
+                    raise Exception(f"Discord API Error {e.status}: {error_text}")
+
+                except Exception as e:
+                    logger.error(f"Unexpected error: {e}", exc_info=True)
+                    raise
 
             # Client erstellen und verbinden
             self.client = Client(mcp)
             await self.client.__aenter__()
+            self._tools_cache = None
 
             logger.info("MCP Server als Subprocess gestartet")
 
@@ -172,6 +212,7 @@ class DiscordMCPClient:
 
             # Verbindung testen
             tools = await self.client.list_tools()
+            self._tools_cache, self._tools_cache_ts = tools, time.monotonic()
             tool_names = [t.name for t in tools]
             logger.info(f"Remote MCP Server verbunden - {len(tools)} Tools: {tool_names}")
 
@@ -180,12 +221,16 @@ class DiscordMCPClient:
             raise
 
     async def list_tools(self) -> List[Dict[str, Any]]:
-        """Listet alle verfügbaren MCP Tools auf"""
+        """Listet alle verfügbaren MCP Tools auf (für _TOOLS_CACHE_TTL Sekunden gecacht)"""
         try:
             if not self.connected:
                 raise Exception("MCP Client nicht verbunden")
 
+            if self._tools_cache is not None and time.monotonic() - self._tools_cache_ts < _TOOLS_CACHE_TTL:
+                return self._tools_cache
+
             tools = await self.client.list_tools()
+            self._tools_cache, self._tools_cache_ts = tools, time.monotonic()
             logger.info(f"Gefundene Tools: {[t.name for t in tools]}")
             return tools
 
@@ -226,13 +271,18 @@ class DiscordMCPClient:
                 }
             )
 
+            # Strukturiertes Ergebnis (FastMCP hat es bereits deserialisiert)
+            data = getattr(result, 'data', None)
+            if isinstance(data, dict):
+                return data
+
             # Result extrahieren
             if hasattr(result, 'content') and result.content:
                 # FastMCP gibt Content als Liste zurück
                 content = result.content[0]
                 if hasattr(content, 'text'):
                     # Text zu JSON parsen
-                    parsed = json.loads(content.text)
+                    parsed = _json_loads(content.text)
                     # Wenn Discord eine Liste zurückgibt, wrappen wir sie
                     if isinstance(parsed, list):
                         return {"items": parsed, "count": len(parsed)}
@@ -248,6 +298,28 @@ class DiscordMCPClient:
             logger.error(f"Fehler beim API Call: {e}", exc_info=True)
             raise
 
+    async def call_discord_api_batch(
+        self,
+        calls: List[Dict[str, Any]]
+    ) -> List[Any]:
+        """
+        Führt mehrere Discord API Calls parallel aus
+
+        Höchstens _API_CONCURRENCY Calls laufen gleichzeitig. Ein fehlgeschlagener
+        Call bricht die anderen nicht ab.
+
+        Args:
+            calls: Liste von Dicts mit method, endpoint und optional data
+
+        Returns:
+            Ergebnisse in der Reihenfolge von calls (Exception bei Fehlschlag)
+        """
+        async def limited(call: Dict[str, Any]) -> Dict[str, Any]:
+            async with self._api_semaphore:
+                return await self.call_discord_api(**call)
+
+        return await asyncio.gather(*(limited(call) for call in calls), return_exceptions=True)
+
     async def create_discord_event(
         self,
         guild_id: str,
@@ -281,22 +353,15 @@ class DiscordMCPClient:
             "name": name,
             "description": description,
             "scheduled_start_time": start_time,
+            "scheduled_end_time": end_time,  # End time für alle Event-Types
             "privacy_level": 2,  # GUILD_ONLY
             "entity_type": entity_type
         }
 
-        # End time für alle Event-Types
-        event_data["scheduled_end_time"] = end_time
-
         # Type-spezifische Felder
-        if entity_type == 3:  # EXTERNAL
-            if not location:
-                raise ValueError("Location ist erforderlich für External Events")
-            event_data["entity_metadata"] = {"location": location}
-        elif entity_type in [1, 2]:  # STAGE oder VOICE
-            if not channel_id:
-                raise ValueError("Channel ID ist erforderlich für Voice/Stage Events")
-            event_data["channel_id"] = channel_id
+        build = _EVENT_BUILDERS.get(entity_type)
+        if build is not None:
+            event_data.update(build(location, channel_id))
 
         return await self.call_discord_api("POST", endpoint, event_data)
 
@@ -307,6 +372,11 @@ class DiscordMCPClient:
                 await self.client.__aexit__(None, None, None)
                 logger.info("MCP Client getrennt")
 
+            if self._http_session is not None and not self._http_session.closed:
+                await self._http_session.close()
+            self._http_session = None
+            self._tools_cache = None
+
             self.connected = False
 
         except Exception as e:
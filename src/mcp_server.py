@@ -7,15 +7,16 @@ import asyncio
 import json
 import logging
 import os
+import reprlib
 import sys
 import time
-from collections import defaultdict
+from collections import OrderedDict
 from typing import Optional, List, Dict, Any
 
 from fastmcp import FastMCP
 from fastmcp.server.auth import StaticTokenVerifier
 from fastmcp.server.middleware import Middleware, MiddlewareContext
-from fastmcp.server.dependencies import get_access_token
+from fastmcp.server.dependencies import get_access_token, get_context
 
 from audit_log import init_db, log_action
 
@@ -58,6 +59,26 @@ def _role_to_scopes(role: str) -> list:
     return []
 
 
+# === AUDIT SUMMARY ===
+
+# Gekuerzte Darstellung: grosse Ergebnisse (z.B. 50 Events) nicht komplett in Strings wandeln
+_summary_repr = reprlib.Repr()
+_summary_repr.maxlevel = 3
+_summary_repr.maxdict = 3
+_summary_repr.maxlist = 3
+_summary_repr.maxstring = 60
+_summary_repr.maxother = 120
+
+
+def _short_repr(obj: Any, limit: int = 200) -> str:
+    """Kurze Zusammenfassung eines Tool-Ergebnisses fuer das Audit-Log."""
+    # ToolResult: die strukturierten Daten sind aussagekraeftiger als die Content-Liste
+    data = getattr(obj, "structured_content", None)
+    if data is not None:
+        obj = data
+    return _summary_repr.repr(obj)[:limit]
+
+
 # === SECURITY MIDDLEWARE ===
 
 
@@ -75,38 +96,85 @@ class SecurityMiddleware(Middleware):
     }
     # Alles andere: reader reicht
 
+    # Tools mit Scope-Pflicht zaehlen beim Rate-Limit als Writes (ein Lookup pro Call)
+    WRITE_TOOLS = frozenset(TOOL_SCOPES)
+
     # Rate-Limits (max_calls, window_seconds)
     WRITE_RATE_LIMIT = (10, 60)   # 10 writes/min
     READ_RATE_LIMIT = (30, 60)    # 30 reads/min
 
+    # "token_bucket": erlaubt kurze Bursts bis max_calls, dann gleichmaessig nachfuellen
+    # "sliding_window": max_calls pro gleitendem Fenster (gewichteter Zaehler), strenger bei Bursts
+    RATE_LIMIT_STRATEGY = "token_bucket"
+
+    # Maximal gemerkte Clients pro Rate-Limit-Tabelle (LRU, begrenzt Speicher bei langer Laufzeit)
+    MAX_CLIENTS = 10_000
+
     def __init__(self):
         super().__init__()
-        # Rate-Limit Counter im Speicher
-        self._rate_counters: dict = defaultdict(list)
+        # Token-Buckets im Speicher: (client_id, is_write) -> [tokens, last_refill]
+        self._buckets: OrderedDict[tuple[str, bool], list[float]] = OrderedDict()
+        # Sliding-Window-Zaehler: (client_id, is_write) -> [window_idx, prev_count, curr_count]
+        self._windows: OrderedDict[tuple[str, bool], list[int]] = OrderedDict()
 
     def _check_rate_limit(self, client_id: str, is_write: bool) -> bool:
-        """True wenn noch innerhalb vom Limit."""
-        now = time.time()
+        """True wenn noch innerhalb vom Limit (O(1) pro Aufruf, siehe RATE_LIMIT_STRATEGY)."""
         max_calls, window = self.WRITE_RATE_LIMIT if is_write else self.READ_RATE_LIMIT
+        key = (client_id, is_write)
+        if self.RATE_LIMIT_STRATEGY == "sliding_window":
+            return self._check_sliding_window(key, max_calls, window)
+        return self._check_token_bucket(key, max_calls, window)
+
+    def _check_token_bucket(self, key: tuple[str, bool], max_calls: int, window: float) -> bool:
+        """Token-Bucket: max_calls Tokens, nachgefuellt mit max_calls pro window."""
+        now = time.monotonic()
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            # Neuer Client startet mit vollem Bucket
+            self._buckets[key] = bucket = [float(max_calls), now]
+            self._evict_oldest(self._buckets)
+        else:
+            self._buckets.move_to_end(key)
+            # Seit dem letzten Aufruf nachfuellen: max_calls Tokens pro window
+            bucket[0] = min(max_calls, bucket[0] + (now - bucket[1]) * max_calls / window)
+            bucket[1] = now
+
+        if bucket[0] < 1:
+            return False
 
-        # Alte Eintraege entfernen
-        self._rate_counters[client_id] = [
-            (ts, wt) for ts, wt in self._rate_counters[client_id]
-            if now - ts < window
-        ]
-
-        # Relevante Aufrufe zaehlen
-        count = sum(
-            1 for _, wt in self._rate_counters[client_id]
-            if wt == is_write
-        )
+        bucket[0] -= 1
+        return True
 
-        if count >= max_calls:
+    def _check_sliding_window(self, key: tuple[str, bool], max_calls: int, window: float) -> bool:
+        """Sliding-Window-Counter: aktuelles Fenster + anteilig gewichtetes Vorfenster."""
+        now = time.monotonic()
+        window_idx = int(now // window)
+
+        counter = self._windows.get(key)
+        if counter is None:
+            self._windows[key] = counter = [window_idx, 0, 0]
+            self._evict_oldest(self._windows)
+        else:
+            self._windows.move_to_end(key)
+
+        if counter[0] != window_idx:
+            # Neues Fenster: direktes Vorfenster zaehlt anteilig, aeltere gar nicht
+            counter[1] = counter[2] if window_idx == counter[0] + 1 else 0
+            counter[2] = 0
+            counter[0] = window_idx
+
+        elapsed = (now - window_idx * window) / window
+        if counter[2] + counter[1] * (1 - elapsed) >= max_calls:
             return False
 
-        self._rate_counters[client_id].append((now, is_write))
+        counter[2] += 1
         return True
 
+    def _evict_oldest(self, table: OrderedDict) -> None:
+        """Entfernt den am laengsten inaktiven Client, wenn MAX_CLIENTS ueberschritten ist."""
+        if len(table) > self.MAX_CLIENTS:
+            table.popitem(last=False)
+
     async def on_call_tool(self, context: MiddlewareContext, call_next):
         """Intercepted Tool-Calls fuer Auth, Rate-Limit und Audit."""
         token = get_access_token()
@@ -116,9 +184,14 @@ class SecurityMiddleware(Middleware):
         client_id = token.client_id if token else "unknown"
         user_scopes = token.scopes if token else []
 
-        # 1. Permsission Check
-        required_scope = self.TOOL_SCOPES.get(tool_name)
-        if required_scope and required_scope not in user_scopes:
+        # Aufrufer fuer die Tools merken (spart den zweiten Token-Lookup in _get_triggered_by)
+        if context.fastmcp_context is not None:
+            context.fastmcp_context.set_state("triggered_by", token.client_id if token else None)
+
+        # 1. Permsission Check (Reader-Tools: nur ein frozenset-Lookup)
+        is_write = tool_name in self.WRITE_TOOLS
+        required_scope = self.TOOL_SCOPES[tool_name] if is_write else None
+        if is_write and required_scope not in user_scopes:
             log_action(
                 client_id=client_id,
                 user_name=client_id,
@@ -134,7 +207,6 @@ class SecurityMiddleware(Middleware):
             )
 
         # 2. Rate-Limiting
-        is_write = required_scope is not None
         if not self._check_rate_limit(client_id, is_write):
             action_type = "Write" if is_write else "Read"
             log_action(
@@ -153,7 +225,7 @@ class SecurityMiddleware(Middleware):
         try:
             result = await call_next(context)
             success = True
-            result_summary = str(result)[:200] if result else "OK"
+            result_summary = _short_repr(result) if result else "OK"
         except Exception as e:
             success = False
             result_summary = f"ERROR: {str(e)[:180]}"
@@ -198,16 +270,28 @@ mcp = FastMCP(
 _helper = None
 _mcp_client = None
 _llm_voice = None
-_initialized = False
+# Gesetzt nach erfolgreicher Init; der Lock verhindert doppelte Discord-Verbindungen,
+# wenn mehrere Tool-Calls gleichzeitig als erste ankommen
+_init_event = asyncio.Event()
+_init_lock = asyncio.Lock()
 
 
 async def _ensure_initialized():
     """Lazy init - startet Helper beim ersten Aufruf."""
-    global _helper, _mcp_client, _llm_voice, _initialized
-
-    if _initialized:
+    if _init_event.is_set():
         return _helper
 
+    async with _init_lock:
+        # Ein anderer Call hat waehrend des Wartens initialisiert
+        if not _init_event.is_set():
+            await _initialize()
+    return _helper
+
+
+async def _initialize():
+    """Verbindet MCP Client, LLM und Discord Helper (nur einmal, unter _init_lock)."""
+    global _helper, _mcp_client, _llm_voice
+
     from config import Config
     from mcp_client import DiscordMCPClient
     from llm_voice import LLMVoiceInterface
@@ -237,12 +321,19 @@ async def _ensure_initialized():
     await _helper.initialize()
     logger.info("Discord Helper initialisiert")
 
-    _initialized = True
-    return _helper
+    _init_event.set()
 
 
 def _get_triggered_by() -> Optional[str]:
-    """User-Name aus Auth-Token holen (fuer Attribution)."""
+    """User-Name aus Auth-Token holen (fuer Attribution, von SecurityMiddleware vorbelegt)."""
+    try:
+        triggered_by = get_context().get_state("triggered_by")
+    except RuntimeError:
+        # Kein aktiver Request-Context
+        triggered_by = None
+    if triggered_by is not None:
+        return triggered_by
+
     token = get_access_token()
     return token.client_id if token else None
 
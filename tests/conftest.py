@@ -26,6 +26,10 @@ def mock_config():
     config.debug_mode = False
     config.log_level = "INFO"
     config.speech_provider = "groq-fallback"
+    config.whisper_device = "cpu"
+    config.speculative_stt = False
+    config.spellcheck_wordlist = None
+    config.llm_keep_warm = False
     config.groq_api_key = "test_groq_key"
     config.gemini_api_key = "test_gemini_key"
     return config
@@ -0,0 +1,57 @@
+"""
+Unit Tests für audit_log.py
+Testet das gebündelte Schreiben ins SQLite Audit-Log
+"""
+
+import queue
+import pytest
+from unittest.mock import patch
+
+
+@pytest.fixture
+def audit_db(tmp_path, monkeypatch):
+    """Audit-Log mit eigener DB im Temp-Verzeichnis"""
+    import audit_log
+
+    monkeypatch.setattr(audit_log, "DB_PATH", str(tmp_path / "audit_log.db"))
+    monkeypatch.setattr(audit_log, "_connection", None)
+    audit_log.init_db()
+    yield audit_log
+    audit_log.flush()
+    audit_log._connection.close()
+
+
+class TestLogAction:
+    """Tests für log_action"""
+
+    def test_entries_written_in_order(self, audit_db):
+        """Test: Einträge landen vollständig und in Reihenfolge in der DB"""
+        for i in range(250):
+            audit_db.log_action("alice", "alice", f"action_{i}", params={"i": i})
+
+        actions = audit_db.get_recent_actions(limit=300)
+
+        assert len(actions) == 250
+        assert actions[0]["action"] == "action_249"
+        assert actions[-1]["params"] == '{"i": 0}'
+
+    def test_summary_and_success_stored(self, audit_db):
+        """Test: Zusammenfassung wird gekürzt, success als 0/1 gespeichert"""
+        audit_db.log_action("bob", "bob", "send_message", result_summary="x" * 300, success=False)
+
+        entry = audit_db.get_recent_actions(limit=1)[0]
+
+        assert len(entry["result_summary"]) == 200
+        assert entry["success"] == 0
+        assert entry["params"] is None
+
+    def test_full_queue_drops_entry(self, audit_db):
+        """Test: Bei voller Queue wird verworfen statt zu blockieren"""
+        full = queue.Queue(maxsize=1)
+        full.put(None)
+        with patch.object(audit_db, "_queue", full), \
+                patch.object(audit_db, "dropped_count", 0), \
+                patch.object(audit_db, "_writer", object()):  # Writer nicht starten
+            audit_db.log_action("alice", "alice", "create_event")
+
+            assert audit_db.dropped_count == 1
@@ -114,6 +114,36 @@ class TestConfig:
 
             assert "SPEECH_PROVIDER" in str(exc_info.value)
 
+    @patch('config.load_dotenv')
+    @patch('config.Path')
+    def test_config_whisper_device_validation(self, mock_path, mock_dotenv, mock_env_vars):
+        """Test: Whisper Gerät-Validierung"""
+        mock_path.return_value.exists.return_value = True
+
+        invalid_env = mock_env_vars.copy()
+        invalid_env["WHISPER_DEVICE"] = "tpu"
+
+        with patch.dict(os.environ, invalid_env, clear=True):
+            from config import Config
+
+            with pytest.raises(ValueError) as exc_info:
+                Config(env_file=".env")
+
+            assert "WHISPER_DEVICE" in str(exc_info.value)
+
+    @patch('config.load_dotenv')
+    @patch('config.Path')
+    def test_config_llm_keep_warm(self, mock_path, mock_dotenv, mock_env_vars):
+        """Test: LLM_KEEP_WARM ist standardmäßig aus"""
+        mock_path.return_value.exists.return_value = True
+
+        with patch.dict(os.environ, mock_env_vars, clear=True):
+            from config import Config
+            assert Config(env_file=".env").llm_keep_warm is False
+
+        with patch.dict(os.environ, {**mock_env_vars, "LLM_KEEP_WARM": "true"}, clear=True):
+            assert Config(env_file=".env").llm_keep_warm is True
+
     @patch('config.load_dotenv')
     @patch('config.Path')
     def test_config_debug_mode_boolean(self, mock_path, mock_dotenv, mock_env_vars):
@@ -0,0 +1,102 @@
+"""
+Unit Tests für gradio_helpers.py
+Testet die seiteneffektfreien Helfer der Gradio GUI (ohne gradio_app zu importieren)
+"""
+
+import threading
+
+import pytest
+
+
+@pytest.fixture
+def providers():
+    """Provider-Status mit Groq als Start-LLM (Key aus der .env)"""
+    from gradio_helpers import ProviderState
+
+    providers = {name: ProviderState() for name in ("openai", "groq", "gemini", "ollama")}
+    providers["groq"].mark_valid("env_key")
+    return providers
+
+
+class TestLLMSwitchKey:
+    """Tests für llm_switch_key und startup_llm_key"""
+
+    def test_startup_key_matches_switch_key(self, providers):
+        """Test: Start-Schlüssel entspricht dem Schlüssel eines Wechsels auf dieselbe Auswahl"""
+        from gradio_helpers import llm_switch_key, startup_llm_key
+
+        config = {"provider": "groq", "model": "llama-3.3-70b-versatile"}
+
+        assert startup_llm_key(config, providers) == ("groq: llama-3.3-70b-versatile", "env_key")
+        assert startup_llm_key(config, providers) == llm_switch_key(
+            "groq: llama-3.3-70b-versatile [$0.59/$0.79] (aktiv)", providers
+        )
+
+    def test_other_model_or_new_key_differs(self, providers):
+        """Test: Anderes Modell oder neu validierter Key ergibt einen anderen Schlüssel"""
+        from gradio_helpers import llm_switch_key, startup_llm_key
+
+        active = startup_llm_key({"provider": "groq", "model": "llama-3.3-70b-versatile"}, providers)
+
+        assert llm_switch_key("groq: llama-3.1-8b-instant", providers) != active
+        providers["groq"].mark_valid("new_key")
+        assert llm_switch_key("groq: llama-3.3-70b-versatile", providers) != active
+
+    def test_no_provider_has_no_key(self, providers):
+        """Test: Ohne Start-Provider gibt es keinen aktiven Schlüssel"""
+        from gradio_helpers import startup_llm_key
+
+        assert startup_llm_key({"provider": None, "model": None}, providers) is None
+
+    def test_extract_model_name_strips_tags(self):
+        """Test: Preis und Tags werden aus der Auswahl entfernt"""
+        from gradio_helpers import extract_model_name
+
+        assert extract_model_name("openai: gpt-4o [$2.50/$10] (empfohlen)") == "openai: gpt-4o"
+        assert extract_model_name("ollama: llama3 (aktiv)") == "ollama: llama3"
+
+
+class TestRenderCache:
+    """Tests für den HTML-Render-Cache des Kalenders"""
+
+    def test_lru_eviction_and_clear(self):
+        """Test: Älteste Einträge werden verdrängt, clear() leert den Cache"""
+        from gradio_helpers import RenderCache
+
+        cache = RenderCache(maxsize=2)
+        cache.store((2026, 1, None), "jan")
+        cache.store((2026, 2, None), "feb")
+        cache.get((2026, 1, None))
+        cache.store((2026, 3, None), "mar")
+
+        assert cache.get((2026, 1, None)) == "jan"
+        assert cache.get((2026, 2, None)) is None
+
+        cache.clear()
+        assert cache.get((2026, 1, None)) is None
+        assert len(cache) == 0
+
+    def test_concurrent_access(self):
+        """Test: Gleichzeitige Zugriffe aus Worker-Threads bleiben konsistent"""
+        from gradio_helpers import RenderCache
+
+        cache = RenderCache(maxsize=24)
+        errors = []
+
+        def worker(offset):
+            try:
+                for i in range(500):
+                    key = (2026, (i + offset) % 40, None)
+                    cache.store(key, "html")
+                    cache.get(key)
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert not errors
+        assert len(cache) <= 24
@@ -5,7 +5,7 @@ Testet den universellen LLM Client mit Multi-Provider-Support
 
 import os
 import pytest
-from unittest.mock import patch, MagicMock, AsyncMock
+from unittest.mock import patch, MagicMock, AsyncMock, ANY
 
 
 class TestLLMClientInit:
@@ -102,6 +102,70 @@ class TestLLMClientInit:
         assert client.max_tokens == 1024
 
 
+    @patch('llm_client.llm_client.load_dotenv')
+    @patch('llm_client.llm_client.Groq')
+    def test_colab_userdata_read_once(self, mock_groq_class, mock_dotenv):
+        """Test: Colab-userdata wird nur einmal abgefragt, auch bei mehreren Instanzen"""
+        import sys
+        import types
+        import llm_client.llm_client as module
+
+        userdata = MagicMock()
+        userdata.get.side_effect = lambda name: {"GROQ_API_KEY": "gsk-colab"}.get(name)
+        colab = types.ModuleType("google.colab")
+        colab.userdata = userdata
+        google = types.ModuleType("google")
+        google.colab = colab
+
+        module._colab_api_keys.cache_clear()
+        try:
+            with patch.dict(sys.modules, {"google": google, "google.colab": colab}):
+                with patch.dict(os.environ, {}, clear=True):
+                    with patch('os.path.exists', return_value=False):
+                        from llm_client import LLMClient
+                        first = LLMClient()
+                        second = LLMClient()
+        finally:
+            module._colab_api_keys.cache_clear()
+
+        assert first.api_choice == second.api_choice == "groq"
+        assert second.groq_api_key == "gsk-colab"
+        assert userdata.get.call_count == 3
+
+    @patch('llm_client.llm_client.load_dotenv')
+    @patch('llm_client.llm_client.Groq')
+    def test_key_set_at_runtime_is_used(self, mock_groq_class, mock_dotenv):
+        """Test: Zur Laufzeit gesetzte Keys werden von neuen Instanzen gelesen (kein Snapshot)"""
+        with patch.dict(os.environ, {}, clear=True):
+            with patch('os.path.exists', return_value=False):
+                from llm_client import LLMClient
+                assert LLMClient().api_choice == "ollama"
+
+                os.environ["GROQ_API_KEY"] = "gsk-runtime"
+                client = LLMClient()
+
+        assert client.api_choice == "groq"
+        assert client.groq_api_key == "gsk-runtime"
+
+    @patch('llm_client.llm_client.load_dotenv')
+    def test_secrets_file_loaded_once(self, mock_dotenv):
+        """Test: secrets.env wird pro Prozess nur einmal geprüft und geladen"""
+        import llm_client.llm_client as module
+
+        module._load_secrets.cache_clear()
+        try:
+            with patch.dict(os.environ, {}, clear=True):
+                with patch('os.path.exists', return_value=True) as mock_exists:
+                    from llm_client import LLMClient
+                    LLMClient(api_choice="ollama", secrets_path="test_secrets.env")
+                    LLMClient(api_choice="ollama", secrets_path="test_secrets.env")
+        finally:
+            module._load_secrets.cache_clear()
+
+        mock_dotenv.assert_called_once_with("test_secrets.env")
+        mock_exists.assert_called_once_with("test_secrets.env")
+
+
 class TestLLMClientDefaultModels:
     """Tests für Default-Modell-Auswahl"""
 
@@ -181,6 +245,29 @@ class TestLLMClientChatCompletion:
         assert response == "Hello, I'm an AI assistant!"
         mock_client.chat.completions.create.assert_called_once()
 
+    @patch('llm_client.llm_client.load_dotenv')
+    @patch('llm_client.llm_client.OpenAI')
+    def test_chat_completion_follows_model_change(self, mock_openai_class, mock_dotenv):
+        """Test: Nachträglicher Modellwechsel auf GPT-5 nutzt max_completion_tokens"""
+        mock_client = mock_openai_class.return_value
+        mock_client.chat.completions.create.return_value.choices = [MagicMock()]
+
+        with patch.dict(os.environ, {"OPENAI_API_KEY": "sk-test"}, clear=True):
+            with patch('os.path.exists', return_value=False):
+                from llm_client import LLMClient
+                client = LLMClient(api_choice="openai", llm="gpt-4o", max_tokens=100)
+
+        messages = [{"role": "user", "content": "Hallo"}]
+        client.chat_completion(messages)
+        assert mock_client.chat.completions.create.call_args.kwargs["max_tokens"] == 100
+
+        client.llm = "gpt-5-mini"
+        client.chat_completion(messages)
+        kwargs = mock_client.chat.completions.create.call_args.kwargs
+        assert kwargs["model"] == "gpt-5-mini"
+        assert kwargs["max_completion_tokens"] == 100
+        assert "temperature" not in kwargs
+
     @patch('llm_client.llm_client.load_dotenv')
     @patch('llm_client.llm_client.Groq')
     def test_chat_completion_groq(self, mock_groq_class, mock_dotenv):
@@ -226,6 +313,74 @@ class TestLLMClientChatCompletion:
         assert response == "Ollama local response!"
         mock_ollama.chat.assert_called_once()
 
+    @patch('llm_client.llm_client.load_dotenv')
+    @patch('llm_client.llm_client.OpenAI')
+    def test_chat_completion_stream_openai(self, mock_openai_class, mock_dotenv):
+        """Test: Streaming liefert die Text-Stücke der Chunks"""
+        def chunk(text):
+            return MagicMock(choices=[MagicMock(delta=MagicMock(content=text))])
+
+        mock_client = mock_openai_class.return_value
+        mock_client.chat.completions.create.return_value = iter(
+            [chunk("Hal"), chunk(None), chunk("lo"), MagicMock(choices=[])]
+        )
+
+        with patch.dict(os.environ, {"OPENAI_API_KEY": "sk-test"}, clear=True):
+            with patch('os.path.exists', return_value=False):
+                from llm_client import LLMClient
+                client = LLMClient(api_choice="openai")
+
+        parts = list(client.chat_completion_stream([{"role": "user", "content": "Hi"}]))
+
+        assert parts == ["Hal", "lo"]
+        assert mock_client.chat.completions.create.call_args.kwargs["stream"] is True
+
+    @patch('llm_client.llm_client.load_dotenv')
+    @patch('llm_client.llm_client.ollama')
+    def test_chat_completion_stream_ollama(self, mock_ollama, mock_dotenv):
+        """Test: Ollama-Streaming liefert message.content je Teil"""
+        mock_ollama.chat.return_value = iter(
+            [{"message": {"content": "Guten "}}, {"message": {"content": "Tag"}}]
+        )
+
+        with patch.dict(os.environ, {}, clear=True):
+            with patch('os.path.exists', return_value=False):
+                from llm_client import LLMClient
+                client = LLMClient(api_choice="ollama")
+
+        parts = list(client.chat_completion_stream([{"role": "user", "content": "Hallo"}]))
+
+        assert parts == ["Guten ", "Tag"]
+        assert mock_ollama.chat.call_args.kwargs["stream"] is True
+
+    @patch('llm_client.llm_client.load_dotenv')
+    @patch('llm_client.llm_client.ollama')
+    def test_chat_completion_with_tools_ollama(self, mock_ollama, mock_dotenv):
+        """Test: Tool-Calls von Ollama werden normalisiert, Tools ohne Sampling-Tuning gesendet"""
+        mock_ollama.chat.return_value = {
+            "message": {
+                "content": "",
+                "tool_calls": [{"function": {"name": "list_events", "arguments": {"tag": "heute"}}}],
+            }
+        }
+        tools = [{"type": "function", "function": {"name": "list_events"}}]
+
+        with patch.dict(os.environ, {}, clear=True):
+            with patch('os.path.exists', return_value=False):
+                from llm_client import LLMClient
+                client = LLMClient(api_choice="ollama", max_tokens=64)
+
+        result = client.chat_completion_with_tools([{"role": "user", "content": "Termine?"}], tools)
+
+        import json
+
+        function = result["tool_calls"][0]["function"]
+        assert function["name"] == "list_events"
+        assert json.loads(function["arguments"]) == {"tag": "heute"}
+        kwargs = mock_ollama.chat.call_args.kwargs
+        assert kwargs["tools"] == tools
+        assert kwargs["options"] == {"temperature": 0.7, "num_predict": 64}
+
     @patch('llm_client.llm_client.load_dotenv')
     def test_chat_completion_no_client_raises_error(self, mock_dotenv):
         """Test: Fehlender Client wirft RuntimeError"""
@@ -248,6 +403,598 @@ class TestLLMClientChatCompletion:
         assert "not available" in str(exc_info.value)
 
 
+class TestLLMClientInflightDedup:
+    """Tests für das Zusammenführen gleichzeitiger identischer Anfragen"""
+
+    @staticmethod
+    def _run_concurrently(client, messages, count=3):
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=count) as executor:
+            futures = [executor.submit(client.chat_completion, messages) for _ in range(count)]
+            return [f.result(timeout=5) for f in futures]
+
+    @staticmethod
+    def _blocking_chat(started, release):
+        def _chat(**kwargs):
+            started.set()
+            release.wait(timeout=5)
+            return {"message": {"content": "Einmal beantwortet"}}
+        return _chat
+
+    @patch('llm_client.llm_client.load_dotenv')
+    @patch('llm_client.llm_client.ollama')
+    def test_concurrent_identical_requests_hit_provider_once(self, mock_ollama, mock_dotenv):
+        """Test: Bei dedup teilen sich gleichzeitige identische Anfragen einen Request"""
+        import threading
+        import time
+
+        started, release = threading.Event(), threading.Event()
+        mock_ollama.chat.side_effect = self._blocking_chat(started, release)
+
+        with patch.dict(os.environ, {}, clear=True):
+            with patch('os.path.exists', return_value=False):
+                from llm_client import LLMClient
+                client = LLMClient(api_choice="ollama", dedup=True)
+
+        messages = [{"role": "user", "content": "Gleiche Frage"}]
+
+        def _release_when_waiting():
+            started.wait(timeout=5)
+            time.sleep(0.1)
+            release.set()
+
+        threading.Thread(target=_release_when_waiting).start()
+        results = self._run_concurrently(client, messages)
+
+        assert results == ["Einmal beantwortet"] * 3
+        assert mock_ollama.chat.call_count == 1
+        assert client._inflight == {}
+
+    @patch('llm_client.llm_client.load_dotenv')
+    @patch('llm_client.llm_client.ollama')
+    def test_dedup_disabled_by_default_with_temperature(self, mock_ollama, mock_dotenv):
+        """Test: Ohne dedup und mit temperature > 0 geht jede Anfrage an den Provider"""
+        mock_ollama.chat.return_value = {"message": {"content": "Antwort"}}
+
+        with patch.dict(os.environ, {}, clear=True):
+            with patch('os.path.exists', return_value=False):
+                from llm_client import LLMClient
+                client = LLMClient(api_choice="ollama", temperature=0.7)
+
+        results = self._run_concurrently(client, [{"role": "user", "content": "Frage"}])
+
+        assert results == ["Antwort"] * 3
+        assert mock_ollama.chat.call_count == 3
+
+    @patch('llm_client.llm_client.load_dotenv')
+    @patch('llm_client.llm_client.ollama')
+    def test_dedup_propagates_errors_and_clears_inflight(self, mock_ollama, mock_dotenv):
+        """Test: Fehler werden weitergereicht, der In-flight Eintrag wird entfernt"""
+        mock_ollama.chat.side_effect = RuntimeError("Provider down")
+
+        with patch.dict(os.environ, {}, clear=True):
+            with patch('os.path.exists', return_value=False):
+                from llm_client import LLMClient
+                client = LLMClient(api_choice="ollama", temperature=0)
+
+        with pytest.raises(RuntimeError):
+            client.chat_completion([{"role": "user", "content": "Frage"}])
+
+        assert client._inflight == {}
+
+
+class TestLLMClientResponseCache:
+    """Tests für den LRU-Antwort-Cache bei temperature 0"""
+
+    @staticmethod
+    def _make_client(**kwargs):
+        with patch.dict(os.environ, {}, clear=True):
+            with patch('os.path.exists', return_value=False):
+                from llm_client import LLMClient
+                return LLMClient(api_choice="ollama", **kwargs)
+
+    @patch('llm_client.llm_client.load_dotenv')
+    @patch('llm_client.llm_client.ollama')
+    def test_repeated_deterministic_request_is_cached(self, mock_ollama, mock_dotenv):
+        """Test: Wiederholte Anfrage bei temperature 0 geht nur einmal an den Provider"""
+        mock_ollama.chat.return_value = {"message": {"content": "Gecacht"}}
+        client = self._make_client(temperature=0)
+        messages = [{"role": "user", "content": "Frage"}]
+
+        assert client.chat_completion(messages) == "Gecacht"
+        assert client.chat_completion(messages) == "Gecacht"
+        assert mock_ollama.chat.call_count == 1
+
+    @patch('llm_client.llm_client.load_dotenv')
+    @patch('llm_client.llm_client.ollama')
+    def test_cached_tool_result_is_independent_copy(self, mock_ollama, mock_dotenv):
+        """Test: Änderungen am zurückgegebenen Tool-Ergebnis verändern den Cache nicht"""
+        mock_ollama.chat.return_value = {
+            "message": {"content": "", "tool_calls": [{"function": {"name": "f", "arguments": {}}}]}
+        }
+        client = self._make_client(temperature=0)
+        messages = [{"role": "user", "content": "Frage"}]
+        tools = [{"type": "function", "function": {"name": "f"}}]
+
+        first = client.chat_completion_with_tools(messages, tools)
+        first["tool_calls"][0]["function"]["name"] = "verändert"
+        second = client.chat_completion_with_tools(messages, tools)
+
+        assert second["tool_calls"][0]["function"]["name"] == "f"
+        assert mock_ollama.chat.call_count == 1
+
+    @patch('llm_client.llm_client.load_dotenv')
+    @patch('llm_client.llm_client.ollama')
+    def test_no_cache_with_temperature(self, mock_ollama, mock_dotenv):
+        """Test: Bei temperature > 0 wird nicht gecacht"""
+        mock_ollama.chat.return_value = {"message": {"content": "Antwort"}}
+        client = self._make_client(temperature=0.7)
+        messages = [{"role": "user", "content": "Frage"}]
+
+        client.chat_completion(messages)
+        client.chat_completion(messages)
+        assert mock_ollama.chat.call_count == 2
+        assert len(client._cache) == 0
+
+    @patch('llm_client.llm_client.load_dotenv')
+    @patch('llm_client.llm_client.ollama')
+    def test_cache_evicts_least_recently_used(self, mock_ollama, mock_dotenv):
+        """Test: Bei vollem Cache wird der am längsten ungenutzte Eintrag verdrängt"""
+        mock_ollama.chat.return_value = {"message": {"content": "Antwort"}}
+        client = self._make_client(temperature=0, cache_size=2)
+
+        def ask(text):
+            client.chat_completion([{"role": "user", "content": text}])
+
+        ask("a")
+        ask("b")
+        ask("a")  # a wird zuletzt genutzt
+        ask("c")  # verdrängt b
+        assert mock_ollama.chat.call_count == 3
+
+        ask("a")
+        assert mock_ollama.chat.call_count == 3
+        ask("b")
+        assert mock_ollama.chat.call_count == 4
+
+    @patch('llm_client.llm_client.load_dotenv')
+    @patch('llm_client.llm_client.ollama')
+    def test_cache_stats_count_hits_and_misses(self, mock_ollama, mock_dotenv):
+        """Test: cache_stats zählt Treffer und Fehlschläge"""
+        mock_ollama.chat.return_value = {"message": {"content": "Antwort"}}
+        client = self._make_client(temperature=0)
+        messages = [{"role": "user", "content": "Frage"}]
+
+        client.chat_completion(messages)
+        client.chat_completion(messages)
+        client.chat_completion([{"role": "user", "content": "Andere Frage"}])
+
+        assert client.cache_stats == {"hits": 1, "misses": 2}
+
+
+class TestLLMClientSemanticCache:
+    """Tests für den optionalen semantischen Cache"""
+
+    def test_similar_text_hits_within_scope(self):
+        """Test: Ähnliche Formulierung trifft, anderer Scope nicht"""
+        from llm_client import SemanticCache
+
+        cache = SemanticCache(threshold=0.8)
+        cache.add("scope", "Was ist die Hauptstadt von Frankreich?", "Paris")
+
+        assert cache.lookup("scope", "Was ist die Hauptstadt Frankreichs?") == "Paris"
+        assert cache.lookup("anderer", "Was ist die Hauptstadt Frankreichs?") is None
+        assert cache.lookup("scope", "Wie wird das Wetter morgen?") is None
+
+    def test_numbers_and_ids_must_match(self):
+        """Test: Abweichende Zahlen, Daten oder IDs sind kein Treffer"""
+        from llm_client import SemanticCache
+
+        cache = SemanticCache(threshold=0.8)
+        cache.add("scope", "Welche Termine habe ich am 12. März?", "Zahnarzt")
+        cache.add("scope", "Zeige die Nachricht mit ID 4711a", "Hallo")
+
+        assert cache.lookup("scope", "Welche Termine habe ich am 13. März?") is None
+        assert cache.lookup("scope", "Zeige die Nachricht mit ID 4712a") is None
+        assert cache.lookup("scope", "Welche Termine hab ich am 12. März?") == "Zahnarzt"
+
+    @patch('llm_client.llm_client.load_dotenv')
+    @patch('llm_client.llm_client.ollama')
+    def test_chat_completion_uses_semantic_cache(self, mock_ollama, mock_dotenv):
+        """Test: Umformulierte Frage wird aus dem semantischen Cache beantwortet"""
+        mock_ollama.chat.return_value = {"message": {"content": "Paris"}}
+
+        with patch.dict(os.environ, {}, clear=True):
+            with patch('os.path.exists', return_value=False):
+                from llm_client import LLMClient
+                client = LLMClient(api_choice="ollama", semantic_threshold=0.8)
+
+        system = {"role": "system", "content": "Du bist hilfreich."}
+        client.chat_completion([system, {"role": "user", "content": "Was ist die Hauptstadt von Frankreich?"}])
+        answer = client.chat_completion([system, {"role": "user", "content": "Was ist die Hauptstadt Frankreichs?"}])
+
+        assert answer == "Paris"
+        assert mock_ollama.chat.call_count == 1
+
+    @patch('llm_client.llm_client.load_dotenv')
+    @patch('llm_client.llm_client.ollama')
+    def test_semantic_cache_disabled_by_default(self, mock_ollama, mock_dotenv):
+        """Test: Ohne semantic_threshold ist kein semantischer Cache aktiv"""
+        with patch.dict(os.environ, {}, clear=True):
+            with patch('os.path.exists', return_value=False):
+                from llm_client import LLMClient
+                client = LLMClient(api_choice="ollama")
+
+        assert client.semantic_cache is None
+
+
+class TestLLMClientWarmUp:
+    """Tests für warm_up Methode"""
+
+    @patch('llm_client.llm_client.load_dotenv')
+    @patch('llm_client.llm_client.OpenAI')
+    def test_warm_up_lists_models(self, mock_openai_class, mock_dotenv):
+        """Test: warm_up öffnet die Verbindung über eine Modell-Abfrage"""
+        mock_client = MagicMock()
+        mock_openai_class.return_value = mock_client
+
+        with patch.dict(os.environ, {"OPENAI_API_KEY": "sk-test"}, clear=True):
+            with patch('os.path.exists', return_value=False):
+                from llm_client import LLMClient
+                client = LLMClient(api_choice="openai")
+
+        assert client.warm_up() is True
+        mock_client.models.list.assert_called_once()
+
+    @patch('llm_client.llm_client.load_dotenv')
+    @patch('llm_client.llm_client.ollama')
+    def test_warm_up_swallows_errors(self, mock_ollama, mock_dotenv):
+        """Test: Fehler beim Warm-up werden nicht weitergereicht"""
+        mock_ollama.generate.side_effect = ConnectionError("Ollama läuft nicht")
+
+        with patch.dict(os.environ, {}, clear=True):
+            with patch('os.path.exists', return_value=False):
+                from llm_client import LLMClient
+                client = LLMClient(api_choice="ollama")
+
+        assert client.warm_up() is False
+        mock_ollama.generate.assert_called_once()
+
+
+class TestCompactMessages:
+    """Tests für das Zusammenfassen von Nachrichten vor dem Senden"""
+
+    def test_merges_adjacent_user_and_dedupes_system(self):
+        """Test: Aufeinanderfolgende User-Nachrichten und doppelte System-Prompts werden zusammengefasst"""
+        from llm_client.llm_client import _compact_messages
+
+        messages = [
+            {"role": "system", "content": "Sei hilfreich."},
+            {"role": "system", "content": "Sei hilfreich."},
+            {"role": "user", "content": "Hallo"},
+            {"role": "user", "content": "Wie spät ist es?"},
+            {"role": "assistant", "content": "12 Uhr"},
+        ]
+
+        assert _compact_messages(messages) == [
+            {"role": "system", "content": "Sei hilfreich."},
+            {"role": "user", "content": "Hallo\n\nWie spät ist es?"},
+            {"role": "assistant", "content": "12 Uhr"},
+        ]
+        assert len(messages) == 5
+
+    def test_keeps_repeated_system_prompt_after_other_turns(self):
+        """Test: Identische System-Prompts mit Nachrichten dazwischen bleiben beide erhalten"""
+        from llm_client.llm_client import _compact_messages
+
+        messages = [
+            {"role": "system", "content": "Antworte auf Deutsch."},
+            {"role": "user", "content": "Hallo"},
+            {"role": "system", "content": "Antworte auf Deutsch."},
+        ]
+
+        assert _compact_messages(messages) is messages
+
+    def test_keeps_tool_messages_separate(self):
+        """Test: Tool-Antworten behalten ihre tool_call_id und werden nicht verschmolzen"""
+        from llm_client.llm_client import _compact_messages
+
+        messages = [
+            {"role": "assistant", "content": None, "tool_calls": [{"id": "a"}, {"id": "b"}]},
+            {"role": "tool", "tool_call_id": "a", "content": "1"},
+            {"role": "tool", "tool_call_id": "b", "content": "2"},
+        ]
+
+        assert _compact_messages(messages) is messages
+
+
+class TestLLMClientPrewarm:
+    """Tests für das Vorwärmen der Verbindung beim Erstellen"""
+
+    @patch('llm_client.llm_client.load_dotenv')
+    @patch('llm_client.llm_client.OpenAI')
+    def test_prewarm_lists_models_in_background(self, mock_openai_class, mock_dotenv):
+        """Test: prewarm ruft models.list im Hintergrund auf"""
+        import threading
+
+        warmed = threading.Event()
+        mock_openai_class.return_value.models.list.side_effect = lambda: warmed.set()
+
+        with patch.dict(os.environ, {"OPENAI_API_KEY": "sk-prewarm"}, clear=True):
+            with patch('os.path.exists', return_value=False):
+                from llm_client import LLMClient
+                LLMClient(api_choice="openai", prewarm=True)
+
+        assert warmed.wait(timeout=5)
+
+    @patch('llm_client.llm_client.load_dotenv')
+    @patch('llm_client.llm_client.OpenAI')
+    def test_no_prewarm_by_default(self, mock_openai_class, mock_dotenv):
+        """Test: Ohne prewarm keine Anfrage beim Erstellen"""
+        with patch.dict(os.environ, {"OPENAI_API_KEY": "sk-test"}, clear=True):
+            with patch('os.path.exists', return_value=False):
+                from llm_client import LLMClient
+                LLMClient(api_choice="openai")
+
+        mock_openai_class.return_value.models.list.assert_not_called()
+
+
+class TestLLMClientKeepWarm:
+    """Tests für den Ollama keep-warm Heartbeat"""
+
+    def test_keep_alive_parsing(self):
+        """Test: keep_alive-Angaben werden in Sekunden umgerechnet"""
+        from llm_client.llm_client import _keep_alive_seconds
+
+        assert _keep_alive_seconds("5m") == 300
+        assert _keep_alive_seconds("30s") == 30
+        assert _keep_alive_seconds("1h") == 3600
+        assert _keep_alive_seconds(120) == 120
+        assert _keep_alive_seconds("-1") is None
+        assert _keep_alive_seconds("0") is None
+        assert _keep_alive_seconds("bald") is None
+
+    @patch('llm_client.llm_client.load_dotenv')
+    @patch('llm_client.llm_client.ollama')
+    def test_keep_warm_loads_model_until_stopped(self, mock_ollama, mock_dotenv):
+        """Test: keep_warm lädt das Modell sofort und stoppt auf Anfrage"""
+        import threading
+
+        loaded = threading.Event()
+        mock_ollama.generate.side_effect = lambda **kwargs: loaded.set()
+
+        with patch.dict(os.environ, {}, clear=True):
+            with patch('os.path.exists', return_value=False):
+                from llm_client import LLMClient
+                client = LLMClient(api_choice="ollama", keep_warm=True)
+
+        assert loaded.wait(timeout=5)
+        mock_ollama.generate.assert_called_with(model=client.llm, prompt="", keep_alive="5m")
+
+        client.stop_keep_warm()
+        assert client._keep_warm_stop.is_set()
+
+    @pytest.mark.parametrize("kwargs, env", [
+        ({"keep_alive": "10m"}, {}),
+        ({}, {"OLLAMA_KEEP_ALIVE": "10m"}),
+    ])
+    @patch('llm_client.llm_client.load_dotenv')
+    @patch('llm_client.llm_client.ollama')
+    def test_explicit_keep_alive_skips_heartbeat(self, mock_ollama, mock_dotenv, kwargs, env):
+        """Test: Explizites keep_alive hat Vorrang vor dem Heartbeat"""
+        with patch.dict(os.environ, env, clear=True):
+            with patch('os.path.exists', return_value=False):
+                from llm_client import LLMClient
+                client = LLMClient(api_choice="ollama", keep_warm=True, **kwargs)
+
+        assert client.keep_alive == "10m"
+        assert client._keep_warm_stop is None
+        mock_ollama.generate.assert_not_called()
+
+    @patch('llm_client.llm_client.load_dotenv')
+    @patch('llm_client.llm_client.OpenAI')
+    def test_keep_warm_only_for_ollama(self, mock_openai_class, mock_dotenv):
+        """Test: Für Cloud-Provider wird kein Heartbeat gestartet"""
+        with patch.dict(os.environ, {"OPENAI_API_KEY": "sk-test"}, clear=True):
+            with patch('os.path.exists', return_value=False):
+                from llm_client import LLMClient
+                client = LLMClient(api_choice="openai")
+
+        assert client.start_keep_warm() is False
+        mock_openai_class.return_value.models.list.assert_not_called()
+
+
+class TestLLMClientBatchCompletion:
+    """Tests für batch_completion"""
+
+    @patch('llm_client.llm_client.load_dotenv')
+    @patch('llm_client.llm_client.ollama')
+    def test_concurrent_mode_keeps_order(self, mock_ollama, mock_dotenv):
+        """Test: Parallele Ausführung liefert Antworten in Eingabe-Reihenfolge"""
+        mock_ollama.chat.side_effect = lambda **kwargs: {
+            "message": {"content": kwargs["messages"][-1]["content"].upper()}
+        }
+
+        with patch.dict(os.environ, {}, clear=True):
+            with patch('os.path.exists', return_value=False):
+                from llm_client import LLMClient
+                client = LLMClient(api_choice="ollama")
+
+        batch = [[{"role": "user", "content": text}] for text in ("eins", "zwei", "drei")]
+
+        assert client.batch_completion(batch, max_workers=2) == ["EINS", "ZWEI", "DREI"]
+        assert client.batch_completion([]) == []
+
+    @patch('llm_client.llm_client.load_dotenv')
+    @patch('llm_client.llm_client.OpenAI')
+    def test_batch_api_mode_maps_results_by_custom_id(self, mock_openai_class, mock_dotenv):
+        """Test: Batch API Ergebnisse werden per custom_id zugeordnet"""
+        import json
+
+        mock_client = mock_openai_class.return_value
+        mock_client.batches.create.return_value = MagicMock(id="batch_1", status="in_progress")
+        mock_client.batches.retrieve.return_value = MagicMock(
+            id="batch_1", status="completed", output_file_id="file_out"
+        )
+        output = [
+            {"custom_id": "1", "response": {"body": {"choices": [{"message": {"content": "B"}}]}}},
+            {"custom_id": "0", "response": {"body": {"choices": [{"message": {"content": "A"}}]}}},
+        ]
+        mock_client.files.content.return_value.text = "\n".join(json.dumps(o) for o in output)
+
+        with patch.dict(os.environ, {"OPENAI_API_KEY": "sk-test"}, clear=True):
+            with patch('os.path.exists', return_value=False):
+                from llm_client import LLMClient
+                client = LLMClient(api_choice="openai")
+
+        batch = [[{"role": "user", "content": "a"}], [{"role": "user", "content": "b"}], [{"role": "user", "content": "c"}]]
+        answers = client.batch_completion(batch, mode="batch_api", poll_interval=0)
+
+        assert answers == ["A", "B", None]
+        assert mock_client.files.create.call_args.kwargs["purpose"] == "batch"
+
+    @patch('llm_client.llm_client.load_dotenv')
+    @patch('llm_client.llm_client.ollama')
+    def test_batch_api_requires_openai(self, mock_ollama, mock_dotenv):
+        """Test: batch_api ist nur mit OpenAI möglich"""
+        with patch.dict(os.environ, {}, clear=True):
+            with patch('os.path.exists', return_value=False):
+                from llm_client import LLMClient
+                client = LLMClient(api_choice="ollama")
+
+        with pytest.raises(ValueError):
+            client.batch_completion([[{"role": "user", "content": "x"}]], mode="batch_api")
+
+
+class TestLLMClientChatChain:
+    """Tests für chat_chain"""
+
+    @patch('llm_client.llm_client.load_dotenv')
+    @patch('llm_client.llm_client.OpenAI')
+    def test_openai_chain_uses_previous_response_id(self, mock_openai_class, mock_dotenv):
+        """Test: OpenAI-Ketten verweisen auf die vorherige Response statt den Verlauf zu senden"""
+        mock_client = mock_openai_class.return_value
+        mock_client.responses.create.side_effect = [
+            MagicMock(id="resp_1", output_text="Plan"),
+            MagicMock(id="resp_2", output_text="Ergebnis"),
+        ]
+
+        with patch.dict(os.environ, {"OPENAI_API_KEY": "sk-test"}, clear=True):
+            with patch('os.path.exists', return_value=False):
+                from llm_client import LLMClient
+                client = LLMClient(api_choice="openai")
+
+        answers = client.chat_chain(["Plane", lambda plan: f"Führe aus: {plan}"], system="Kurz")
+
+        assert answers == ["Plan", "Ergebnis"]
+        first, second = mock_client.responses.create.call_args_list
+        assert "previous_response_id" not in first.kwargs
+        assert second.kwargs["previous_response_id"] == "resp_1"
+        assert second.kwargs["input"] == "Führe aus: Plan"
+        assert second.kwargs["instructions"] == "Kurz"
+
+    @patch('llm_client.llm_client.load_dotenv')
+    @patch('llm_client.llm_client.ollama')
+    def test_local_chain_keeps_history(self, mock_ollama, mock_dotenv):
+        """Test: Andere Provider bekommen den bisherigen Verlauf mitgeschickt"""
+        mock_ollama.chat.side_effect = [
+            {"message": {"content": "Plan"}},
+            {"message": {"content": "Ergebnis"}},
+        ]
+
+        with patch.dict(os.environ, {}, clear=True):
+            with patch('os.path.exists', return_value=False):
+                from llm_client import LLMClient
+                client = LLMClient(api_choice="ollama")
+
+        answers = client.chat_chain(["Plane", lambda plan: f"Führe aus: {plan}"])
+
+        assert answers == ["Plan", "Ergebnis"]
+        assert mock_ollama.chat.call_args.kwargs["messages"] == [
+            {"role": "user", "content": "Plane"},
+            {"role": "assistant", "content": "Plan"},
+            {"role": "user", "content": "Führe aus: Plan"},
+        ]
+
+
+class TestLLMClientAsync:
+    """Tests für achat_completion und abatch"""
+
+    @pytest.mark.asyncio
+    @patch('llm_client.llm_client.load_dotenv')
+    @patch('llm_client.llm_client.AsyncOpenAI')
+    @patch('llm_client.llm_client.OpenAI')
+    async def test_achat_completion_openai(self, mock_openai_class, mock_async_class, mock_dotenv):
+        """Test: achat_completion nutzt den AsyncOpenAI-Client"""
+        mock_response = MagicMock()
+        mock_response.choices = [MagicMock(message=MagicMock(content="Async Antwort"))]
+        mock_async_class.return_value.chat.completions.create = AsyncMock(return_value=mock_response)
+
+        with patch.dict(os.environ, {"OPENAI_API_KEY": "sk-test"}, clear=True):
+            with patch('os.path.exists', return_value=False):
+                from llm_client import LLMClient
+                client = LLMClient(api_choice="openai")
+
+        response = await client.achat_completion([{"role": "user", "content": "Hallo"}])
+
+        assert response == "Async Antwort"
+        mock_openai_class.return_value.chat.completions.create.assert_not_called()
+        mock_async_class.assert_called_once_with(api_key="sk-test")
+
+    @pytest.mark.asyncio
+    @patch('llm_client.llm_client.load_dotenv')
+    @patch('llm_client.llm_client.ollama')
+    async def test_abatch_limits_concurrency(self, mock_ollama, mock_dotenv):
+        """Test: abatch liefert Antworten in Eingabe-Reihenfolge und begrenzt die Parallelität"""
+        import asyncio
+
+        running, peak = 0, 0
+
+        async def _chat(**kwargs):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return {"message": {"content": kwargs["messages"][-1]["content"].upper()}}
+
+        mock_ollama.AsyncClient.return_value.chat = _chat
+
+        with patch.dict(os.environ, {}, clear=True):
+            with patch('os.path.exists', return_value=False):
+                from llm_client import LLMClient
+                client = LLMClient(api_choice="ollama")
+
+        batch = [[{"role": "user", "content": text}] for text in ("a", "b", "c", "d", "e")]
+        answers = await client.abatch(batch, max_concurrency=2)
+
+        assert answers == ["A", "B", "C", "D", "E"]
+        assert peak == 2
+        mock_ollama.AsyncClient.assert_called_once()
+
+
+class TestLLMClientLazyImports:
+    """Tests für den verzögerten Import der Provider-SDKs"""
+
+    def test_missing_provider_sdk_resolves_to_none(self):
+        """Test: Nicht installiertes SDK wird beim ersten Zugriff als None erkannt"""
+        import llm_client.llm_client as module
+
+        with patch.dict(module.__dict__):
+            module.__dict__.pop("Groq", None)
+            with patch('importlib.import_module', side_effect=ImportError):
+                assert module.Groq is None
+            assert module.__dict__["Groq"] is None
+
+    def test_unknown_attribute_raises(self):
+        """Test: Unbekannte Modul-Attribute werfen weiterhin AttributeError"""
+        import llm_client.llm_client as module
+
+        with pytest.raises(AttributeError):
+            module.NichtVorhanden
+
+
 class TestLLMClientRepr:
     """Tests für __repr__ Methode"""
 
@@ -285,5 +1032,39 @@ class TestLLMClientGeminiCompatibility:
         # Prüfe dass OpenAI mit Gemini base_url aufgerufen wurde
         mock_openai_class.assert_called_with(
             api_key="gemini-test",
-            base_url="https://generativelanguage.googleapis.com/v1beta/openai/"
+            base_url="https://generativelanguage.googleapis.com/v1beta/openai/",
+            http_client=ANY,
         )
+
+    @patch('llm_client.llm_client.load_dotenv')
+    @patch('llm_client.llm_client.OpenAI')
+    def test_clients_share_http_connection_pool(self, mock_openai_class, mock_dotenv):
+        """Test: Mehrere Instanzen teilen sich denselben HTTP-Client"""
+        env = {"OPENAI_API_KEY": "sk-test", "GEMINI_API_KEY": "gemini-test"}
+
+        with patch.dict(os.environ, env, clear=True):
+            with patch('os.path.exists', return_value=False):
+                from llm_client import LLMClient
+                LLMClient(api_choice="openai")
+                LLMClient(api_choice="gemini")
+
+        first, second = mock_openai_class.call_args_list
+        assert first.kwargs["http_client"] is second.kwargs["http_client"]
+
+    @patch('llm_client.llm_client.load_dotenv')
+    @patch('llm_client.llm_client.OpenAI')
+    def test_instances_share_provider_client_per_key(self, mock_openai_class, mock_dotenv):
+        """Test: Gleicher Provider und Key nutzen denselben SDK-Client"""
+        mock_openai_class.side_effect = lambda **kwargs: MagicMock()
+
+        with patch('os.path.exists', return_value=False):
+            from llm_client import LLMClient
+            with patch.dict(os.environ, {"OPENAI_API_KEY": "sk-eins"}, clear=True):
+                first = LLMClient(api_choice="openai")
+                second = LLMClient(api_choice="openai", llm="gpt-4o")
+            with patch.dict(os.environ, {"OPENAI_API_KEY": "sk-zwei"}, clear=True):
+                other_key = LLMClient(api_choice="openai")
+
+        assert first.client is second.client
+        assert other_key.client is not first.client
+        assert mock_openai_class.call_count == 2
@@ -0,0 +1,504 @@
+"""
+Unit Tests für llm_voice.py
+Testet das LLMVoiceInterface (ohne echte LLM- oder Whisper-Aufrufe)
+"""
+
+import asyncio
+import json
+import threading
+import pytest
+from unittest.mock import MagicMock, patch
+
+
+@pytest.fixture
+def voice(mock_config):
+    """LLMVoiceInterface mit gemocktem LLMClient und ohne Speech-to-Text"""
+    import llm_voice
+
+    mock_config.speech_provider = "none"
+    with patch.object(llm_voice, "LLMClient") as mock_client_cls:
+        interface = llm_voice.LLMVoiceInterface(mock_config)
+    assert mock_client_cls.call_count == 2
+    return interface
+
+
+class TestCheckSpellingCache:
+    """Tests für den Cache der Rechtschreibprüfung"""
+
+    @pytest.mark.asyncio
+    async def test_repeated_text_uses_cache(self, voice):
+        """Test: Gleicher Text wird nur einmal ans LLM geschickt"""
+        voice.spell_check_client.chat_completion.return_value = json.dumps(
+            {"corrected": "Hallo Welt, wie geht es?"}
+        )
+
+        first = await voice.check_spelling("hallo welt wie geht es")
+        second = await voice.check_spelling("hallo welt wie geht es")
+
+        assert voice.spell_check_client.chat_completion.call_count == 1
+        assert first == second
+        assert second["corrected"] == "Hallo Welt, wie geht es?"
+        assert second["has_errors"] is True
+
+    @pytest.mark.asyncio
+    async def test_different_text_not_cached(self, voice):
+        """Test: Abweichender Text löst eine neue Prüfung aus"""
+        voice.spell_check_client.chat_completion.return_value = json.dumps(
+            {"corrected": "Ein Satz."}
+        )
+
+        await voice.check_spelling("ein satz hier")
+        await voice.check_spelling("ein anderer satz")
+
+        assert voice.spell_check_client.chat_completion.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_parse_error_not_cached(self, voice):
+        """Test: Nicht parsebare Antworten werden nicht gemerkt"""
+        voice.spell_check_client.chat_completion.return_value = "kein json"
+
+        await voice.check_spelling("hallo welt wie geht es")
+        await voice.check_spelling("hallo welt wie geht es")
+
+        assert voice.spell_check_client.chat_completion.call_count == 2
+
+    def test_model_change_clears_cache(self, voice):
+        """Test: Modellwechsel verwirft gemerkte Korrekturen"""
+        import llm_voice
+
+        voice._spelling_cache[b"key"] = {"corrected": "x"}
+        with patch.object(llm_voice, "LLMClient"):
+            voice._init_llm_client("gemini", "gemini-2.5-pro")
+
+        assert len(voice._spelling_cache) == 0
+
+
+class TestInitLLMClientKeepWarm:
+    """Tests für LLM_KEEP_WARM beim Erstellen des LLM Clients"""
+
+    @pytest.mark.parametrize("flag, provider, keep_warm, prewarm", [
+        (False, "ollama", False, False),
+        (True, "ollama", True, True),
+        (True, "groq", False, True),
+    ])
+    def test_keep_warm_follows_config(self, voice, flag, provider, keep_warm, prewarm):
+        """Test: Heartbeat und Vorwärmen nur mit LLM_KEEP_WARM"""
+        import llm_voice
+
+        voice.config.llm_keep_warm = flag
+        with patch.object(llm_voice, "LLMClient") as mock_client_cls:
+            voice._init_llm_client(provider, "modell")
+
+        kwargs = mock_client_cls.call_args_list[0].kwargs
+        assert kwargs["keep_warm"] is keep_warm
+        assert kwargs["prewarm"] is prewarm
+
+
+class TestProcessWithContext:
+    """Tests für den stabilen System-Prompt in process_with_context"""
+
+    def test_canonicalize_context_moves_volatile_lines(self):
+        """Test: Zeitstempel und UUIDs werden aus dem System-Context gelöst"""
+        from llm_voice import _canonicalize_context
+
+        context = (
+            "Du bist ein Discord-Assistent.\n"
+            "Aktuelle Zeit: 2026-10-15 14:30\n"
+            "Request-ID: 123e4567-e89b-12d3-a456-426614174000\n"
+            "Verfügbare Funktionen: create_event   "
+        )
+        stable, volatile = _canonicalize_context(context)
+
+        assert stable == "Du bist ein Discord-Assistent.\nVerfügbare Funktionen: create_event"
+        assert "2026-10-15 14:30" in volatile
+        assert "123e4567" in volatile
+
+    @pytest.mark.asyncio
+    async def test_system_prompt_stable_across_calls(self, voice):
+        """Test: Unterschiedliche Uhrzeiten ergeben denselben System-Prompt"""
+        voice.llm_client.chat_completion.return_value = '{"message": "ok", "actions": []}'
+
+        await voice.process_with_context("Hallo", "Assistent.\nHeute: 15.10.2026 09:00")
+        await voice.process_with_context("Hallo", "Assistent.\nHeute: 16.10.2026 10:15")
+
+        first, second = (c.args[0] for c in voice.llm_client.chat_completion.call_args_list)
+        assert first[0] == second[0] == {"role": "system", "content": "Assistent."}
+        assert first[1]["content"] == "Heute: 15.10.2026 09:00\n\nHallo"
+
+
+class TestSpeechToTextFasterWhisper:
+    """Tests für die lokale Transkription mit Faster Whisper"""
+
+    @pytest.mark.asyncio
+    async def test_transcribe_uses_fast_decoding(self, voice):
+        """Test: Greedy-Dekodierung mit VAD, Segmente werden verbunden"""
+        segments = (MagicMock(text=t) for t in [" Hallo", " Welt "])
+        voice.faster_whisper_model = MagicMock()
+        voice.faster_whisper_model.transcribe.return_value = (segments, None)
+
+        text = await voice._speech_to_text_faster_whisper("audio.wav")
+
+        assert text == "Hallo  Welt"
+        kwargs = voice.faster_whisper_model.transcribe.call_args.kwargs
+        assert kwargs["beam_size"] == 1
+        assert kwargs["vad_filter"] is True
+
+
+class TestWhisperBackend:
+    """Tests für die Geräteauswahl von Faster Whisper"""
+
+    def test_auto_uses_gpu_when_available(self):
+        """Test: auto wählt CUDA mit float16, wenn eine GPU erkannt wird"""
+        import llm_voice
+
+        with patch.object(llm_voice, "ctranslate2") as mock_ct2:
+            mock_ct2.get_cuda_device_count.return_value = 1
+            assert llm_voice._whisper_backend("auto") == ("cuda", "float16")
+
+    def test_auto_falls_back_to_cpu(self):
+        """Test: auto ohne GPU bleibt bei CPU mit int8"""
+        import llm_voice
+
+        with patch.object(llm_voice, "ctranslate2") as mock_ct2:
+            mock_ct2.get_cuda_device_count.return_value = 0
+            assert llm_voice._whisper_backend("auto") == ("cpu", "int8")
+
+    def test_explicit_cpu_skips_detection(self):
+        """Test: cpu erzwingt CPU ohne GPU-Abfrage"""
+        import llm_voice
+
+        with patch.object(llm_voice, "ctranslate2") as mock_ct2:
+            assert llm_voice._whisper_backend("cpu") == ("cpu", "int8")
+            mock_ct2.get_cuda_device_count.assert_not_called()
+
+
+class TestSpeechToTextGroq:
+    """Tests für die Transkription über Groq Whisper"""
+
+    @pytest.mark.asyncio
+    async def test_uploads_file_handle(self, voice, tmp_path):
+        """Test: Audio wird als Datei-Handle statt als Bytes übergeben"""
+        audio = tmp_path / "aufnahme.wav"
+        audio.write_bytes(b"RIFF")
+        voice.groq_client = MagicMock()
+        voice.groq_client.audio.transcriptions.create.return_value = " Hallo Welt \n"
+
+        text = await voice._speech_to_text_groq(str(audio))
+
+        assert text == "Hallo Welt"
+        name, handle = voice.groq_client.audio.transcriptions.create.call_args.kwargs["file"]
+        assert name == "aufnahme.wav"
+        assert hasattr(handle, "read")
+
+
+class TestSpeechToTextSpeculative:
+    """Tests für parallele Transkription im groq-fallback Modus"""
+
+    @pytest.fixture
+    def speculative(self, voice, tmp_path):
+        audio = tmp_path / "aufnahme.wav"
+        audio.write_bytes(b"RIFF")
+        voice.speech_provider = "groq-fallback"
+        voice.config.speculative_stt = True
+        voice.faster_whisper_model = MagicMock()
+        return voice, str(audio)
+
+    @pytest.mark.asyncio
+    async def test_local_result_when_groq_fails(self, speculative):
+        """Test: Groq-Fehler liefert das lokale Ergebnis ohne erneuten Versuch"""
+        voice, audio = speculative
+        with patch.object(voice, "_transcribe_groq", side_effect=TimeoutError("Timeout")), \
+                patch.object(voice, "_transcribe_faster_whisper", return_value="Lokal") as local:
+            assert await voice.speech_to_text(audio) == "Lokal"
+        local.assert_called_once_with(audio)
+
+    @pytest.mark.asyncio
+    async def test_fastest_result_wins(self, speculative):
+        """Test: Das zuerst fertige Ergebnis wird zurückgegeben"""
+        import threading
+
+        voice, audio = speculative
+        release = threading.Event()
+
+        def slow_local(path):
+            release.wait(timeout=5)
+            return "Lokal"
+
+        with patch.object(voice, "_transcribe_groq", return_value="Groq"), \
+                patch.object(voice, "_transcribe_faster_whisper", side_effect=slow_local):
+            try:
+                assert await voice.speech_to_text(audio) == "Groq"
+            finally:
+                release.set()
+
+    @pytest.mark.asyncio
+    async def test_raises_when_both_fail(self, speculative):
+        """Test: Schlagen beide fehl, wird ein Fehler ausgelöst"""
+        voice, audio = speculative
+        with patch.object(voice, "_transcribe_groq", side_effect=TimeoutError("Timeout")), \
+                patch.object(voice, "_transcribe_faster_whisper", side_effect=RuntimeError("Kaputt")):
+            with pytest.raises(Exception, match="fehlgeschlagen"):
+                await voice.speech_to_text(audio)
+
+
+class TestWhisperModelCache:
+    """Tests für das geteilte Faster Whisper Modell"""
+
+    def test_model_loaded_once_for_multiple_instances(self, mock_config):
+        """Test: Zwei Interfaces teilen sich dasselbe geladene Modell"""
+        import llm_voice
+
+        mock_config.speech_provider = "faster-whisper"
+        llm_voice._get_whisper_model.cache_clear()
+        try:
+            with patch.object(llm_voice, "FASTER_WHISPER_AVAILABLE", True), \
+                    patch.object(llm_voice, "WhisperModel") as mock_model_cls, \
+                    patch.object(llm_voice, "LLMClient"):
+                first = llm_voice.LLMVoiceInterface(mock_config)
+                second = llm_voice.LLMVoiceInterface(mock_config)
+
+            assert mock_model_cls.call_count == 1
+            assert first.faster_whisper_model is second.faster_whisper_model
+        finally:
+            llm_voice._get_whisper_model.cache_clear()
+
+
+class TestSummarizeTextStream:
+    """Tests für die gestreamte Zusammenfassung"""
+
+    @pytest.mark.asyncio
+    async def test_yields_parts_in_order(self, voice):
+        """Test: Stücke des LLM-Streams werden der Reihe nach weitergegeben"""
+        voice.llm_client.chat_completion_stream.return_value = (p for p in ["Kurz ", "und ", "knapp."])
+
+        parts = [part async for part in voice.summarize_text_stream("Fasse zusammen")]
+
+        assert parts == ["Kurz ", "und ", "knapp."]
+        voice.llm_client.chat_completion_stream.assert_called_once_with(
+            [{"role": "user", "content": "Fasse zusammen"}]
+        )
+
+    @pytest.mark.asyncio
+    async def test_early_exit_closes_stream(self, voice):
+        """Test: Abbruch durch den Aufrufer schließt den LLM-Stream"""
+        closed = threading.Event()
+
+        def stream(messages):
+            try:
+                while True:
+                    yield "Satz."
+            finally:
+                closed.set()
+
+        voice.llm_client.chat_completion_stream.side_effect = stream
+
+        agen = voice.summarize_text_stream("Fasse zusammen")
+        assert await agen.__anext__() == "Satz."
+        await agen.aclose()
+
+        assert await asyncio.to_thread(closed.wait, 5)
+
+    @pytest.mark.asyncio
+    async def test_cancel_during_pending_part(self, voice):
+        """Test: Abbruch während ein Stück noch generiert wird schließt den Stream danach"""
+        release = threading.Event()
+        closed = threading.Event()
+
+        def stream(messages):
+            try:
+                yield "Erster Satz."
+                release.wait(5)
+                yield "Zweiter Satz."
+            finally:
+                closed.set()
+
+        voice.llm_client.chat_completion_stream.side_effect = stream
+
+        agen = voice.summarize_text_stream("Fasse zusammen")
+        assert await agen.__anext__() == "Erster Satz."
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(agen.__anext__(), timeout=0.05)
+        await agen.aclose()
+
+        assert not closed.is_set()
+        release.set()
+        assert await asyncio.to_thread(closed.wait, 5)
+
+    @pytest.mark.asyncio
+    async def test_stream_error_is_raised(self, voice):
+        """Test: Fehler im LLM-Stream kommen beim Aufrufer an"""
+        def stream(messages):
+            yield "Erster Satz."
+            raise RuntimeError("Verbindung verloren")
+
+        voice.llm_client.chat_completion_stream.side_effect = stream
+
+        agen = voice.summarize_text_stream("Fasse zusammen")
+        assert await agen.__anext__() == "Erster Satz."
+        with pytest.raises(RuntimeError, match="Verbindung verloren"):
+            await agen.__anext__()
+
+
+class TestSummarizeText:
+    """Tests für summarize_text (sammelt den Stream ein)"""
+
+    @pytest.mark.asyncio
+    async def test_joins_stream_parts(self, voice):
+        """Test: Die Zusammenfassung wird aus den Stream-Stücken zusammengesetzt"""
+        voice.llm_client.chat_completion_stream.return_value = (p for p in [" Kurz ", "und knapp. "])
+
+        result = await voice.summarize_text("Fasse zusammen")
+
+        assert result == "Kurz und knapp."
+        voice.llm_client.chat_completion.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_empty_stream_returns_fallback(self, voice):
+        """Test: Ohne Antwort kommt der Hinweistext"""
+        voice.llm_client.chat_completion_stream.return_value = iter(())
+
+        result = await voice.summarize_text("Fasse zusammen")
+
+        assert result == "Konnte keine Zusammenfassung erstellen."
+
+
+class TestCheckSpellingWordlist:
+    """Tests für die lokale Vorprüfung mit Wortliste"""
+
+    @pytest.fixture
+    def wordlist(self, tmp_path):
+        import llm_voice
+
+        path = tmp_path / "deutsch.txt"
+        path.write_text("heute\nist\nein\nschöner\nTag\nwir\ngehen\nnach\nHause\n", encoding="utf-8")
+        llm_voice._load_wordlist.cache_clear()
+        yield str(path)
+        llm_voice._load_wordlist.cache_clear()
+
+    @pytest.mark.asyncio
+    async def test_known_text_skips_llm(self, voice, wordlist):
+        """Test: Bekannte Wörter mit Satzende brauchen keine LLM-Anfrage"""
+        voice.config.spellcheck_wordlist = wordlist
+
+        result = await voice.check_spelling("Heute ist ein schöner Tag. Wir gehen nach Hause!")
+
+        assert result["has_errors"] is False
+        assert result["corrected"] == "Heute ist ein schöner Tag. Wir gehen nach Hause!"
+        voice.spell_check_client.chat_completion.assert_not_called()
+
+    @pytest.mark.parametrize("text", [
+        "Heute ist ein schöner Tag",      # Satzzeichen fehlt
+        "Heute ist ein schöner tag.",     # Nomen klein
+        "Heute ist ein schöhner Tag.",    # Tippfehler
+    ])
+    def test_suspicious_text_not_known(self, wordlist, text):
+        """Test: Fehlendes Satzzeichen oder unbekannte Schreibweise geht ans LLM"""
+        from llm_voice import _is_known_text, _load_wordlist
+
+        assert _is_known_text(text, _load_wordlist(wordlist)) is False
+
+    @pytest.mark.asyncio
+    async def test_missing_wordlist_falls_back_to_llm(self, voice, tmp_path):
+        """Test: Fehlende Wortliste wird einmal gewarnt, die Prüfung läuft per LLM"""
+        import llm_voice
+
+        llm_voice._load_wordlist.cache_clear()
+        voice.config.spellcheck_wordlist = str(tmp_path / "fehlt.txt")
+        voice.spell_check_client.chat_completion.return_value = '{"corrected": "Heute ist ein schöner Tag."}'
+
+        with patch.object(llm_voice.logger, "warning") as mock_warning:
+            await voice.check_spelling("Heute ist ein schöner Tag.")
+            await voice.check_spelling("Wir gehen nach Hause.")
+        llm_voice._load_wordlist.cache_clear()
+
+        assert mock_warning.call_count == 1
+        assert voice.spell_check_client.chat_completion.call_count == 2
+
+
+class TestCheckSpellingPrompt:
+    """Tests für Prompt und Antwort-Parsing der Rechtschreibprüfung"""
+
+    @pytest.mark.asyncio
+    async def test_instruction_sent_as_stable_system_message(self, voice):
+        """Test: Anweisung ist System-Nachricht, nur der Text steht in der User-Nachricht"""
+        from llm_voice import SPELLING_SYSTEM_PROMPT
+
+        voice.spell_check_client.chat_completion.return_value = '{"corrected": "Guten Morgen zusammen."}'
+
+        await voice.check_spelling("guten morgen zusammen")
+
+        messages = voice.spell_check_client.chat_completion.call_args.args[0]
+        assert messages[0] == {"role": "system", "content": SPELLING_SYSTEM_PROMPT}
+        assert messages[1] == {"role": "user", "content": "Text: guten morgen zusammen"}
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("answer", [
+        '```json\n{"corrected": "Guten Morgen zusammen."}\n```',
+        '```\n{"corrected": "Guten Morgen zusammen."}```',
+    ])
+    async def test_code_fence_is_stripped(self, voice, answer):
+        """Test: Antworten im Markdown-Codeblock werden geparst"""
+        voice.spell_check_client.chat_completion.return_value = answer
+
+        result = await voice.check_spelling("guten morgen zusammen")
+
+        assert result["corrected"] == "Guten Morgen zusammen."
+        assert result["has_errors"] is True
+
+    @pytest.mark.asyncio
+    async def test_invalid_json_returns_original(self, voice):
+        """Test: Nicht parsebare Antwort liefert den Originaltext"""
+        voice.spell_check_client.chat_completion.return_value = "Das ist kein JSON"
+
+        result = await voice.check_spelling("guten morgen zusammen")
+
+        assert result["corrected"] == "guten morgen zusammen"
+        assert result["has_errors"] is False
+
+
+class TestProcessWithContextErrors:
+    """Tests für die Fehler-Antwort von process_with_context"""
+
+    @pytest.mark.asyncio
+    async def test_error_returns_json_message(self, voice):
+        """Test: Fehler liefern eine parsebare JSON-Antwort ohne Aktionen"""
+        voice.llm_client.chat_completion.side_effect = RuntimeError("Überlastet")
+
+        result = await voice.process_with_context("Hallo", "Assistent.")
+
+        parsed = json.loads(result)
+        assert parsed["actions"] == []
+        assert "Überlastet" in parsed["message"]
+        assert "Überlastet" in result  # Umlaute unverändert, nicht escaped
+
+    @pytest.mark.asyncio
+    async def test_error_serialized_via_json_dumps(self, voice):
+        """Test: Die Fehler-Antwort läuft über _json_dumps (orjson oder stdlib)"""
+        import llm_voice
+
+        voice.llm_client.chat_completion.side_effect = RuntimeError("Überlastet")
+        fallback = lambda obj: json.dumps(obj, ensure_ascii=False)
+
+        with patch.object(llm_voice, "_json_dumps", side_effect=fallback) as mock_dumps:
+            result = await voice.process_with_context("Hallo", "Assistent.")
+
+        mock_dumps.assert_called_once()
+        assert json.loads(result)["actions"] == []
+
+
+class TestSafeLog:
+    """Tests für _safe_log"""
+
+    def test_ascii_text_truncated(self):
+        """Test: ASCII-Text wird nur gekürzt"""
+        from llm_voice import _safe_log
+
+        assert _safe_log("a" * 300) == "a" * 200
+        assert _safe_log("kurz", max_len=10) == "kurz"
+
+    def test_non_ascii_removed_before_truncation(self):
+        """Test: Emojis und Umlaute werden entfernt, dann wird gekürzt"""
+        from llm_voice import _safe_log
+
+        assert _safe_log("Grüße 👋 an alle", max_len=10) == "Gre  an al"
+        assert _safe_log("") == ""
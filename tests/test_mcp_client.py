@@ -177,6 +177,22 @@ class TestDiscordMCPClientAPICall:
         assert "count" in result
         assert result["count"] == 2
 
+    @pytest.mark.asyncio
+    async def test_api_call_uses_structured_data(self, connected_client):
+        """Test: Bereits strukturierte Daten werden ohne JSON-Parsing zurückgegeben"""
+        mock_content = MagicMock()
+        mock_content.text = "kein json"
+
+        mock_result = MagicMock()
+        mock_result.data = {"id": "123"}
+        mock_result.content = [mock_content]
+
+        connected_client.client.call_tool = AsyncMock(return_value=mock_result)
+
+        result = await connected_client.call_discord_api("GET", "/guilds/123")
+
+        assert result == {"id": "123"}
+
 
 class TestDiscordMCPClientCreateEvent:
     """Tests für create_discord_event Helper-Methode"""
@@ -251,6 +267,24 @@ class TestDiscordMCPClientCreateEvent:
 
         assert "Location" in str(exc_info.value)
 
+    @pytest.mark.asyncio
+    async def test_create_stage_event_uses_channel(self, connected_client):
+        """Test: Stage Event setzt channel_id statt entity_metadata"""
+        await connected_client.create_discord_event(
+            guild_id="123",
+            name="Stage Event",
+            description="Test",
+            start_time="2025-12-01T15:00:00",
+            end_time="2025-12-01T17:00:00",
+            channel_id="555",
+            entity_type=1  # STAGE
+        )
+
+        event_data = connected_client.call_discord_api.call_args[0][2]
+        assert event_data["channel_id"] == "555"
+        assert event_data["scheduled_end_time"] == "2025-12-01T17:00:00"
+        assert "entity_metadata" not in event_data
+
 
 class TestDiscordMCPClientListTools:
     """Tests für list_tools Methode"""
@@ -292,6 +326,39 @@ class TestDiscordMCPClientListTools:
 
         assert tools == []
 
+    @pytest.mark.asyncio
+    async def test_list_tools_cached(self, connected_client):
+        """Test: Wiederholte Aufrufe fragen den Server nur einmal"""
+        connected_client.client.list_tools = AsyncMock(return_value=[MagicMock()])
+
+        await connected_client.list_tools()
+        await connected_client.list_tools()
+
+        connected_client.client.list_tools.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_list_tools_cache_expires(self, connected_client):
+        """Test: Nach Ablauf der TTL wird neu abgefragt"""
+        connected_client.client.list_tools = AsyncMock(return_value=[MagicMock()])
+
+        await connected_client.list_tools()
+        connected_client._tools_cache_ts -= 61
+        await connected_client.list_tools()
+
+        assert connected_client.client.list_tools.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_disconnect_clears_tools_cache(self, connected_client):
+        """Test: Nach disconnect wird die Tool-Liste neu geladen"""
+        connected_client.client.list_tools = AsyncMock(return_value=[MagicMock()])
+
+        await connected_client.list_tools()
+        await connected_client.disconnect()
+        connected_client.connected = True
+        await connected_client.list_tools()
+
+        assert connected_client.client.list_tools.call_count == 2
+
 
 class TestDiscordMCPClientDisconnect:
     """Tests für disconnect Methode"""
@@ -326,3 +393,149 @@ class TestDiscordMCPClientDisconnect:
         await client.disconnect()
 
         assert client.connected == False
+
+
+class TestDiscordMCPClientHttpSession:
+    """Tests für die persistente HTTP-Session der Discord API Calls"""
+
+    @pytest.mark.asyncio
+    async def test_session_is_reused(self):
+        """Test: Mehrere Calls teilen sich eine Session mit Auth-Header"""
+        from mcp_client import DiscordMCPClient
+
+        mock_config = MagicMock()
+        mock_config.discord_token = "test_token"
+        client = DiscordMCPClient(mock_config)
+
+        first = await client._get_http_session()
+        second = await client._get_http_session()
+        try:
+            assert first is second
+            assert first.headers["Authorization"] == "Bot test_token"
+        finally:
+            await client.disconnect()
+
+    @pytest.mark.asyncio
+    async def test_disconnect_closes_session(self):
+        """Test: disconnect schließt die Session"""
+        from mcp_client import DiscordMCPClient
+
+        client = DiscordMCPClient(MagicMock())
+        session = await client._get_http_session()
+
+        await client.disconnect()
+
+        assert session.closed
+        assert client._http_session is None
+
+
+class TestDiscordApiTool:
+    """Tests für das discord_api MCP Tool (In-Process Server)"""
+
+    @pytest.fixture
+    async def started_client(self):
+        from mcp_client import DiscordMCPClient
+
+        mock_config = MagicMock()
+        mock_config.discord_token = "test_token"
+        client = DiscordMCPClient(mock_config)
+        await client._start_server_subprocess()
+        client.connected = True
+        yield client
+        await client.disconnect()
+
+    @staticmethod
+    def _mock_session(status, payload=None):
+        response = MagicMock()
+        response.status = status
+        response.json = AsyncMock(return_value=payload)
+        request_cm = MagicMock()
+        request_cm.__aenter__ = AsyncMock(return_value=response)
+        request_cm.__aexit__ = AsyncMock(return_value=False)
+        session = MagicMock()
+        session.request.return_value = request_cm
+        return session
+
+    @pytest.mark.asyncio
+    async def test_get_sends_no_body(self, started_client):
+        """Test: GET wird ohne Body gesendet, Listen werden gewrappt"""
+        session = self._mock_session(200, [{"id": "1"}])
+        with patch.object(started_client, "_get_http_session", AsyncMock(return_value=session)):
+            result = await started_client.call_discord_api("get", "/guilds/1/channels", {"x": 1})
+
+        session.request.assert_called_once_with(
+            "GET", "https://discord.com/api/v10/guilds/1/channels", json=None
+        )
+        assert result == {"items": [{"id": "1"}], "count": 1}
+
+    @pytest.mark.asyncio
+    async def test_delete_no_content(self, started_client):
+        """Test: 204 bei DELETE liefert deleted=True ohne JSON zu lesen"""
+        session = self._mock_session(204)
+        with patch.object(started_client, "_get_http_session", AsyncMock(return_value=session)):
+            result = await started_client.call_discord_api("DELETE", "/channels/1/messages/2")
+
+        assert result == {"success": True, "deleted": True}
+        session.request.return_value.__aenter__.return_value.json.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_unsupported_method_rejected(self, started_client):
+        """Test: Unbekannte HTTP-Methode wird abgelehnt"""
+        session = self._mock_session(200, {})
+        with patch.object(started_client, "_get_http_session", AsyncMock(return_value=session)):
+            with pytest.raises(Exception, match="Unsupported HTTP method"):
+                await started_client.call_discord_api("TRACE", "/gateway")
+
+        session.request.assert_not_called()
+
+
+class TestDiscordMCPClientBatch:
+    """Tests für call_discord_api_batch"""
+
+    @pytest.mark.asyncio
+    async def test_batch_keeps_order_and_errors(self):
+        """Test: Ergebnisse in Aufruf-Reihenfolge, Fehler als Exception"""
+        from mcp_client import DiscordMCPClient
+
+        client = DiscordMCPClient(MagicMock())
+
+        async def fake_call(method, endpoint, data=None):
+            if endpoint == "/kaputt":
+                raise Exception("Discord API Error 404")
+            return {"endpoint": endpoint}
+
+        with patch.object(client, "call_discord_api", side_effect=fake_call):
+            results = await client.call_discord_api_batch([
+                {"method": "GET", "endpoint": "/a"},
+                {"method": "GET", "endpoint": "/kaputt"},
+                {"method": "POST", "endpoint": "/b", "data": {"x": 1}},
+            ])
+
+        assert results[0] == {"endpoint": "/a"}
+        assert isinstance(results[1], Exception)
+        assert results[2] == {"endpoint": "/b"}
+
+    @pytest.mark.asyncio
+    async def test_batch_limits_concurrency(self):
+        """Test: Nicht mehr als _API_CONCURRENCY Calls gleichzeitig"""
+        import asyncio
+        import mcp_client
+
+        client = mcp_client.DiscordMCPClient(MagicMock())
+        running = 0
+        peak = 0
+
+        async def fake_call(method, endpoint, data=None):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return {}
+
+        with patch.object(client, "call_discord_api", side_effect=fake_call):
+            await client.call_discord_api_batch(
+                [{"method": "GET", "endpoint": f"/{i}"} for i in range(25)]
+            )
+
+        assert peak == mcp_client._API_CONCURRENCY
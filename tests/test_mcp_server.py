@@ -0,0 +1,235 @@
+"""
+Unit Tests für mcp_server.py
+Testet die SecurityMiddleware (Permissions, Rate-Limits, Audit)
+"""
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+
+@pytest.fixture(scope="module")
+def mcp_server():
+    """mcp_server importieren ohne Audit-DB im Arbeitsverzeichnis anzulegen"""
+    with patch("audit_log.init_db"):
+        import mcp_server
+    return mcp_server
+
+
+@pytest.fixture
+def middleware(mcp_server):
+    return mcp_server.SecurityMiddleware()
+
+
+class TestRateLimit:
+    """Tests für _check_rate_limit"""
+
+    def test_allows_up_to_limit_then_blocks(self, middleware):
+        """Test: Genau max_calls Writes pro Fenster sind erlaubt"""
+        max_calls, _ = middleware.WRITE_RATE_LIMIT
+        with patch("time.monotonic", return_value=1000.0):
+            results = [middleware._check_rate_limit("alice", True) for _ in range(max_calls + 1)]
+
+        assert results == [True] * max_calls + [False]
+
+    def test_refills_over_time(self, middleware):
+        """Test: Nach Ablauf eines Anteils vom Fenster gibt es wieder Tokens"""
+        max_calls, window = middleware.WRITE_RATE_LIMIT
+        with patch("time.monotonic", return_value=1000.0):
+            for _ in range(max_calls):
+                middleware._check_rate_limit("alice", True)
+            assert middleware._check_rate_limit("alice", True) is False
+
+        with patch("time.monotonic", return_value=1000.0 + window / max_calls):
+            assert middleware._check_rate_limit("alice", True) is True
+            assert middleware._check_rate_limit("alice", True) is False
+
+    def test_limits_are_per_client_and_type(self, middleware):
+        """Test: Reads, Writes und Clients haben getrennte Limits"""
+        max_calls, _ = middleware.WRITE_RATE_LIMIT
+        with patch("time.monotonic", return_value=1000.0):
+            for _ in range(max_calls):
+                middleware._check_rate_limit("alice", True)
+
+            assert middleware._check_rate_limit("alice", True) is False
+            assert middleware._check_rate_limit("alice", False) is True
+            assert middleware._check_rate_limit("bob", True) is True
+
+    def test_least_recently_used_client_evicted(self, middleware):
+        """Test: Über MAX_CLIENTS wird der am längsten inaktive Client vergessen"""
+        middleware.MAX_CLIENTS = 2
+        with patch("time.monotonic", return_value=1000.0):
+            middleware._check_rate_limit("alice", False)
+            middleware._check_rate_limit("bob", False)
+            middleware._check_rate_limit("alice", False)  # alice wieder aktiv
+            middleware._check_rate_limit("carol", False)  # verdrängt bob
+
+        assert list(middleware._buckets) == [("alice", False), ("carol", False)]
+
+
+class TestSlidingWindowRateLimit:
+    """Tests für die Sliding-Window-Strategie des Rate-Limits"""
+
+    @pytest.fixture
+    def sliding(self, middleware):
+        middleware.RATE_LIMIT_STRATEGY = "sliding_window"
+        return middleware
+
+    def test_allows_up_to_limit_then_blocks(self, sliding):
+        """Test: Genau max_calls Writes im Fenster"""
+        max_calls, window = sliding.WRITE_RATE_LIMIT
+        with patch("time.monotonic", return_value=10 * window):
+            results = [sliding._check_rate_limit("alice", True) for _ in range(max_calls + 1)]
+
+        assert results == [True] * max_calls + [False]
+
+    def test_previous_window_weighted(self, sliding):
+        """Test: Das Vorfenster zählt anteilig zur verbleibenden Zeit"""
+        max_calls, window = sliding.WRITE_RATE_LIMIT
+        with patch("time.monotonic", return_value=10 * window):
+            for _ in range(max_calls):
+                sliding._check_rate_limit("alice", True)
+
+        # Halb ins nächste Fenster: Vorfenster zählt noch zur Hälfte
+        with patch("time.monotonic", return_value=11.5 * window):
+            allowed = sum(sliding._check_rate_limit("alice", True) for _ in range(max_calls))
+        assert allowed == max_calls // 2
+
+        # Zwei Fenster später ist alles vergessen
+        with patch("time.monotonic", return_value=13 * window):
+            assert all(sliding._check_rate_limit("alice", True) for _ in range(max_calls))
+
+
+class TestTriggeredBy:
+    """Tests für die Weitergabe des Aufrufers an die Tools"""
+
+    @pytest.mark.asyncio
+    async def test_middleware_stores_client_id(self, mcp_server, middleware):
+        """Test: on_call_tool legt den Client im Request-Context ab"""
+        token = MagicMock(client_id="alice", scopes=["tools:read"])
+        context = MagicMock()
+        context.message.name = "list_channels"
+        context.message.arguments = {}
+
+        with patch.object(mcp_server, "get_access_token", return_value=token), \
+                patch.object(mcp_server, "log_action"):
+            await middleware.on_call_tool(context, AsyncMock(return_value={"ok": True}))
+
+        context.fastmcp_context.set_state.assert_called_once_with("triggered_by", "alice")
+
+    def test_triggered_by_reads_context_state(self, mcp_server):
+        """Test: Vorbelegter Aufrufer wird ohne Token-Lookup verwendet"""
+        ctx = MagicMock()
+        ctx.get_state.return_value = "alice"
+        with patch.object(mcp_server, "get_context", return_value=ctx), \
+                patch.object(mcp_server, "get_access_token") as mock_token:
+            assert mcp_server._get_triggered_by() == "alice"
+        mock_token.assert_not_called()
+
+    def test_triggered_by_falls_back_to_token(self, mcp_server):
+        """Test: Ohne Request-Context wird das Token gelesen"""
+        with patch.object(mcp_server, "get_context", side_effect=RuntimeError("No active context")), \
+                patch.object(mcp_server, "get_access_token", return_value=MagicMock(client_id="bob")):
+            assert mcp_server._get_triggered_by() == "bob"
+
+
+class TestShortRepr:
+    """Tests für die Audit-Zusammenfassung von Tool-Ergebnissen"""
+
+    def test_large_result_is_abbreviated(self, mcp_server):
+        """Test: Große Ergebnisse werden gekürzt statt komplett dargestellt"""
+        events = [{"name": f"Event {i}", "description": "x" * 500} for i in range(50)]
+
+        summary = mcp_server._short_repr({"success": True, "events": events, "count": 50})
+
+        assert len(summary) <= 200
+        assert "'count': 50" in summary
+        assert "..." in summary
+
+    def test_tool_result_uses_structured_content(self, mcp_server):
+        """Test: Bei ToolResult werden die strukturierten Daten zusammengefasst"""
+        from fastmcp.tools.tool import ToolResult
+
+        result = ToolResult(structured_content={"success": True})
+
+        assert mcp_server._short_repr(result) == "{'success': True}"
+
+
+class TestPermissions:
+    """Tests für den Scope-Check in on_call_tool"""
+
+    @staticmethod
+    def _context(tool_name):
+        context = MagicMock()
+        context.message.name = tool_name
+        context.message.arguments = {}
+        return context
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("tool_name, scopes, allowed", [
+        ("list_channels", ["tools:read"], True),
+        ("send_message", ["tools:read"], False),
+        ("send_message", ["tools:read", "tools:write"], True),
+        ("delete_message", ["tools:read", "tools:write"], False),
+        ("delete_message", ["tools:read", "tools:write", "tools:admin"], True),
+    ])
+    async def test_scope_required_for_tool(self, mcp_server, middleware, tool_name, scopes, allowed):
+        """Test: Write- und Admin-Tools brauchen den passenden Scope"""
+        token = MagicMock(client_id="alice", scopes=scopes)
+        call_next = AsyncMock(return_value={"ok": True})
+
+        with patch.object(mcp_server, "get_access_token", return_value=token), \
+                patch.object(mcp_server, "log_action"):
+            if allowed:
+                await middleware.on_call_tool(self._context(tool_name), call_next)
+            else:
+                with pytest.raises(PermissionError):
+                    await middleware.on_call_tool(self._context(tool_name), call_next)
+
+        assert call_next.called == allowed
+
+    @pytest.mark.asyncio
+    async def test_write_tools_use_write_limit(self, mcp_server, middleware):
+        """Test: Write-Tools werden mit dem Write-Limit gezählt"""
+        token = MagicMock(client_id="alice", scopes=["tools:read", "tools:write"])
+
+        with patch.object(mcp_server, "get_access_token", return_value=token), \
+                patch.object(mcp_server, "log_action"), \
+                patch.object(middleware, "_check_rate_limit", return_value=True) as mock_limit:
+            await middleware.on_call_tool(self._context("send_message"), AsyncMock())
+            await middleware.on_call_tool(self._context("list_channels"), AsyncMock())
+
+        assert [c.args for c in mock_limit.call_args_list] == [("alice", True), ("alice", False)]
+
+
+class TestEnsureInitialized:
+    """Tests für die Lazy-Initialisierung der Server-Komponenten"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_first_calls_initialize_once(self, mcp_server, monkeypatch):
+        """Test: Gleichzeitige erste Tool-Calls verbinden nur einmal"""
+        import asyncio
+
+        monkeypatch.setattr(mcp_server, "_init_event", asyncio.Event())
+        monkeypatch.setattr(mcp_server, "_init_lock", asyncio.Lock())
+        monkeypatch.setattr(mcp_server, "_helper", None)
+        monkeypatch.setattr(mcp_server, "_mcp_client", None)
+        monkeypatch.setattr(mcp_server, "_llm_voice", None)
+
+        async def slow_connect():
+            await asyncio.sleep(0.01)
+
+        mock_client = MagicMock()
+        mock_client.connect = AsyncMock(side_effect=slow_connect)
+        mock_helper = MagicMock()
+        mock_helper.initialize = AsyncMock()
+        mock_config = MagicMock(llm_provider=None)
+
+        with patch("config.Config", return_value=mock_config), \
+                patch("mcp_client.DiscordMCPClient", return_value=mock_client) as mock_client_cls, \
+                patch("discord_helpers.DiscordEventHelper", return_value=mock_helper):
+            helpers = await asyncio.gather(*(mcp_server._ensure_initialized() for _ in range(5)))
+
+        assert helpers == [mock_helper] * 5
+        mock_client_cls.assert_called_once()
+        mock_client.connect.assert_awaited_once()
+        assert mock_config.mcp_mode == "subprocess"